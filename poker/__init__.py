@@ -8,6 +8,7 @@ del pkg_resources
 
 from poker._common import PokerEnum
 from poker.card import Suit, Rank, Card, FACE_RANKS, BROADWAY_RANKS
-from poker.hand import Shape, Hand, Combo, Range, PAIR_HANDS, OFFSUIT_HANDS, SUITED_HANDS
+from poker.hand import (Shape, Hand, Combo, Range, WeightedRange,
+                        PAIR_HANDS, OFFSUIT_HANDS, SUITED_HANDS)
 from poker.constants import PokerRoom, Currency, Game, GameType, Limit, MoneyType, Action, Position
 from poker.strategy import Strategy
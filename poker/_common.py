@@ -2,7 +2,6 @@
 from __future__ import unicode_literals, absolute_import, division, print_function
 
 import random
-import functools
 from collections import Iterable
 import enum
 
@@ -20,6 +19,10 @@ class _PokerEnumMeta(enum.EnumMeta):
                     alias = alias.upper()
                 self._value2member_map_.setdefault(alias, member)
 
+        # position in definition order, used for fast comparisons and hashing
+        for ordinal, name in enumerate(self._member_names_):
+            self._member_map_[name]._ordinal = ordinal
+
     def __call__(cls, value):
         """Return the appropriate instance with any of the values listed. If values contains
         text types, those will be looked up in a case insensitive manner."""
@@ -31,26 +34,45 @@ class _PokerEnumMeta(enum.EnumMeta):
         return random.choice(list(cls))
 
 
-@functools.total_ordering
 class _OrderableMixin(object):
     # I couldn't inline this to PokerEnum because Enum do some magic which don't like it.
+    # Every comparison is defined, because functools.total_ordering would make them slower.
 
     # From Python manual:
     # If a class that overrides __eq__() needs to retain
     # the implementation of __hash__() from a parent class,
     # the interpreter must be told this explicitly
     def __hash__(self):
-        return super(_OrderableMixin, self).__hash__()
+        return self._ordinal
 
     def __eq__(self, other):
         if self.__class__ is other.__class__:
-            return self._value_ == other._value_
+            return self._ordinal == other._ordinal
+        return NotImplemented
+
+    def __ne__(self, other):
+        if self.__class__ is other.__class__:
+            return self._ordinal != other._ordinal
         return NotImplemented
 
     def __lt__(self, other):
         if self.__class__ is other.__class__:
-            names = self.__class__._member_names_
-            return names.index(self._name_) < names.index(other._name_)
+            return self._ordinal < other._ordinal
+        return NotImplemented
+
+    def __le__(self, other):
+        if self.__class__ is other.__class__:
+            return self._ordinal <= other._ordinal
+        return NotImplemented
+
+    def __gt__(self, other):
+        if self.__class__ is other.__class__:
+            return self._ordinal > other._ordinal
+        return NotImplemented
+
+    def __ge__(self, other):
+        if self.__class__ is other.__class__:
+            return self._ordinal >= other._ordinal
         return NotImplemented
 
     def __reduce_ex__(self, proto):
@@ -83,6 +105,15 @@ class PokerEnum(_OrderableMixin, enum.Enum):
         """The value of the Enum member at index."""
         return self._value_[index]
 
+
+def _copy_slots(source, target):
+    """Fill every slot of an instance made by unpickling an old pickle from the interned instance,
+    old pickles store the state, so they can't give back the interned instance itself.
+    """
+    for name in source.__slots__:
+        setattr(target, name, getattr(source, name))
+
+
 class _ReprMixin(object):
     def __str__(self):
         return unicode(self).encode('utf-8')
@@ -0,0 +1,365 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, absolute_import, division, print_function
+
+"""
+    Boards and precomputed flop textures.
+
+    Every one of the 22100 flops has a flop id, calculated from the sorted card indexes like
+    :attr:`poker.hand.Combo.index`: ``high * (high - 1) * (high - 2) // 6 +
+    middle * (middle - 1) // 2 + low``. The texture of every flop is calculated once into a table
+    indexed by the flop id, so looking up a texture is one array access.
+
+    Boards which are the same after renaming the suits are in the same suit isomorphism class,
+    e.g. there are only 1755 different flops. The canonical board of a class is the one with the
+    smallest card indexes from the highest flop card, then the turn, then the river. The order of
+    the flop cards doesn't matter, but the turn and the river stay the cards dealt after the flop,
+    so the flop properties of a canonical board are the ones of the board itself.
+"""
+
+import itertools
+import numpy as np
+from ._common import _ReprMixin
+from .card import Rank, Card
+from .hand import Combo, Range, WeightedRange, _get_mask_array, _get_array_mask
+
+
+__all__ = ['Board', 'get_flop_id', 'get_canonical_boards', 'get_class_weights', 'FLOP_TEXTURES']
+
+
+_RANKS = tuple(Rank)
+
+# (22100, 3) card indexes of every flop, higher card first, ordered by flop id
+_FLOP_CARDS = np.array([(high, middle, low) for high in range(52)
+                        for middle in range(high) for low in range(middle)], dtype=np.int8)
+
+
+def _make_flop_textures():
+    ranks, suits = _FLOP_CARDS >> 2, _FLOP_CARDS & 3
+    card_pairs = [(0, 1), (0, 2), (1, 2)]
+    same_suits = np.column_stack([suits[:, first] == suits[:, second]
+                                  for first, second in card_pairs])
+    same_ranks = np.column_stack([ranks[:, first] == ranks[:, second]
+                                  for first, second in card_pairs])
+    differences = np.column_stack([abs(ranks[:, first] - ranks[:, second])
+                                   for first, second in card_pairs])
+
+    # three different ranks in a 5 rank window, the Ace can be low too
+    high, low = ranks.max(axis=1), ranks.min(axis=1)
+    wheel_ranks = np.where(ranks == 12, -1, ranks)
+    straight_possible = ~same_ranks.any(axis=1) & \
+        ((high - low <= 4) | (wheel_ranks.max(axis=1) - wheel_ranks.min(axis=1) <= 4))
+
+    textures = np.zeros(len(_FLOP_CARDS), dtype=[
+        ('is_rainbow', bool), ('is_monotone', bool), ('is_triplet', bool), ('has_pair', bool),
+        ('has_straightdraw', bool), ('has_gutshot', bool), ('has_flushdraw', bool),
+        ('is_straight_possible', bool), ('high_rank', np.int8), ('rank_span', np.int8),
+    ])
+    textures['is_rainbow'] = ~same_suits.any(axis=1)
+    textures['is_monotone'] = same_suits.all(axis=1)
+    textures['is_triplet'] = same_ranks.all(axis=1)
+    textures['has_pair'] = same_ranks.any(axis=1)
+    textures['has_straightdraw'] = ((differences >= 1) & (differences <= 3)).any(axis=1)
+    textures['has_gutshot'] = ((differences >= 1) & (differences <= 4)).any(axis=1)
+    textures['has_flushdraw'] = same_suits.any(axis=1)
+    textures['is_straight_possible'] = straight_possible
+    textures['high_rank'] = high
+    textures['rank_span'] = high - low
+    textures.flags.writeable = False
+    return textures
+
+
+FLOP_TEXTURES = _make_flop_textures()
+"""Read-only structured array of the texture of every flop, indexed by flop id.
+The fields are the texture properties of :class:`Board`, ``high_rank`` is the position of
+the Rank in ``list(Rank)``.
+"""
+
+
+def _get_combo_indexes(card_pairs):
+    high, low = card_pairs.max(axis=1), card_pairs.min(axis=1)
+    return high * (high - 1) // 2 + low
+
+
+# every permutation of the 4 suits as Card.index -> Card.index and Combo.index -> Combo.index
+_CARD_PERMUTATIONS = np.array([[index & ~3 | suits[index & 3] for index in range(52)]
+                               for suits in itertools.permutations(range(4))])
+_COMBO_CARDS = np.array([(combo.first.index, combo.second.index) for combo in Combo])
+_COMBO_PERMUTATIONS = np.array([_get_combo_indexes(permutation[_COMBO_CARDS])
+                                for permutation in _CARD_PERMUTATIONS])
+# position of the inverse of every permutation
+_INVERSE_PERMUTATIONS = tuple(_CARD_PERMUTATIONS.tolist().index(np.argsort(permutation).tolist())
+                              for permutation in _CARD_PERMUTATIONS)
+
+
+def _get_keys(cards):
+    """Board keys from an (..., 3-5) array of card indexes, the flop in any order followed by
+    the turn and the river, 6 bits per card from the highest flop card.
+    """
+    cards = np.asarray(cards, dtype=np.int64)
+    flop = -np.sort(-cards[..., :3], axis=-1)
+    cards = np.concatenate((flop, cards[..., 3:]), axis=-1)
+    return (cards << 6 * np.arange(cards.shape[-1] - 1, -1, -1)).sum(axis=-1)
+
+
+def _get_key_cards(keys, card_num):
+    """(N, card_num) array of card indexes of board keys."""
+    return keys[:, np.newaxis] >> 6 * np.arange(card_num - 1, -1, -1) & 63
+
+
+def _make_flop_classes():
+    permuted_keys = _get_keys(_CARD_PERMUTATIONS[:, _FLOP_CARDS])
+    canonical_keys = permuted_keys.min(axis=0)
+    class_keys, class_ids = np.unique(canonical_keys, return_inverse=True)
+    weights = np.bincount(class_ids)
+    weights.flags.writeable = False
+    return class_keys, weights, class_ids, permuted_keys.argmin(axis=0)
+
+
+def _make_classes(card_num):
+    """Keys and weights of the turn or river board classes. The smallest key starts with the
+    smallest key of the board one card shorter, so every class is a canonical shorter board and
+    the smallest dealt card any permutation leaving the shorter board the same can make.
+    """
+    smaller_keys = _get_board_classes(card_num - 1)[0]
+    smaller_cards = _get_key_cards(smaller_keys, card_num - 1)
+    stabilizers = [_get_keys(permutation[smaller_cards]) == smaller_keys
+                   for permutation in _CARD_PERMUTATIONS]
+    used = (np.left_shift(1, smaller_cards).sum(axis=1)[:, np.newaxis] >> np.arange(52)) & 1
+    rows, cards = np.nonzero(used == 0)
+
+    dealt = cards
+    for permutation, stabilizer in zip(_CARD_PERMUTATIONS, stabilizers):
+        dealt = np.where(stabilizer[rows], np.minimum(dealt, permutation[cards]), dealt)
+    class_keys, first = np.unique(smaller_keys[rows] << 6 | dealt, return_index=True)
+
+    # the number of boards in a class is the number of permutations which make different boards
+    class_rows, class_cards = rows[first], class_keys & 63
+    symmetries = sum(stabilizer[class_rows] & (permutation[class_cards] == class_cards)
+                     for permutation, stabilizer in zip(_CARD_PERMUTATIONS, stabilizers))
+    weights = len(_CARD_PERMUTATIONS) // symmetries
+    weights.flags.writeable = False
+    return class_keys, weights
+
+
+_FLOP_CLASS_KEYS, _FLOP_CLASS_WEIGHTS, _FLOP_CLASS_IDS, _FLOP_PERMUTATIONS = _make_flop_classes()
+
+# number of cards -> (keys, weights) of the board classes, turns and rivers are made when needed
+_BOARD_CLASSES = {3: (_FLOP_CLASS_KEYS, _FLOP_CLASS_WEIGHTS)}
+
+
+def _get_board_classes(card_num):
+    if card_num not in (3, 4, 5):
+        raise ValueError('Board should have 3-5 cards, not %r' % (card_num,))
+    try:
+        return _BOARD_CLASSES[card_num]
+    except KeyError:
+        classes = _BOARD_CLASSES[card_num] = _make_classes(card_num)
+        return classes
+
+
+def get_canonical_boards(card_num=3):
+    """Tuple of the canonical boards of every suit isomorphism class of boards with
+    ``card_num`` cards, in class id order. 1755 flops, 63193 turns or 2554656 rivers.
+    """
+    class_keys = _get_board_classes(card_num)[0]
+    return tuple(Board([Card.from_int(index) for index in cards])
+                 for cards in _get_key_cards(class_keys, card_num).tolist())
+
+
+def get_class_weights(card_num=3):
+    """Read-only array of the number of boards in every suit isomorphism class of boards with
+    ``card_num`` cards, in class id order.
+    """
+    return _get_board_classes(card_num)[1]
+
+
+def get_flop_id(cards):
+    """Flop id of 3 cards in any order, the row of the flop in :data:`FLOP_TEXTURES`."""
+    low, middle, high = sorted(Card(card).index for card in cards)
+    if not low < middle < high:
+        raise ValueError('Duplicate cards in %r' % (tuple(cards),))
+    return high * (high - 1) * (high - 2) // 6 + middle * (middle - 1) // 2 + low
+
+
+class Board(_ReprMixin):
+    """Community cards: a flop and optionally the turn and the river.
+
+    The texture properties describe the flop and are looked up from :data:`FLOP_TEXTURES`.
+
+    :param cards:  3-5 :class:`poker.card.Card` instances or card strings, or one string like
+                   ``'AsKd7h'``
+    """
+    __slots__ = ('cards', 'flop_id', '_canonical')
+
+    def __init__(self, cards):
+        if isinstance(cards, unicode):
+            cards = cards.replace(' ', '')
+            cards = [cards[start:start + 2] for start in range(0, len(cards), 2)]
+        cards = tuple(Card(card) for card in cards)
+        if not 3 <= len(cards) <= 5:
+            raise ValueError('Board should have 3-5 cards, not %d' % len(cards))
+        elif len(set(cards)) != len(cards):
+            raise ValueError('Duplicate cards in %s' % ' '.join(unicode(card) for card in cards))
+        self.cards = cards
+        self.flop_id = get_flop_id(cards[:3])
+        self._canonical = None
+
+    @classmethod
+    def from_flop_id(cls, flop_id):
+        """Makes the flop with the given id (0-22099), higher cards first."""
+        if not 0 <= flop_id < len(_FLOP_CARDS):
+            raise ValueError('Flop id should be between 0 and 22099, not %r' % (flop_id,))
+        return cls([Card.from_int(index) for index in _FLOP_CARDS[flop_id].tolist()])
+
+    def __unicode__(self):
+        return ''.join(unicode(card) for card in self.cards)
+
+    def __eq__(self, other):
+        if self.__class__ is other.__class__:
+            return self.cards == other.cards
+        return NotImplemented
+
+    def __ne__(self, other):
+        if self.__class__ is other.__class__:
+            return self.cards != other.cards
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.cards)
+
+    def __len__(self):
+        return len(self.cards)
+
+    def __iter__(self):
+        return iter(self.cards)
+
+    def _get_canonical(self):
+        """Key of the canonical board and the permutation which makes it."""
+        if self._canonical is None:
+            if len(self.cards) == 3:
+                self._canonical = (_FLOP_CLASS_KEYS[_FLOP_CLASS_IDS[self.flop_id]],
+                                   _FLOP_PERMUTATIONS[self.flop_id])
+            else:
+                keys = _get_keys(_CARD_PERMUTATIONS[:, [card.index for card in self.cards]])
+                self._canonical = keys.min(), keys.argmin()
+        return self._canonical
+
+    @property
+    def canonical_board(self):
+        """The canonical Board of the suit isomorphism class of the board, the turn and the river
+        stay after the flop.
+        """
+        key = self._get_canonical()[0]
+        indexes = _get_key_cards(np.array([key]), len(self.cards))[0]
+        return Board([Card.from_int(index) for index in indexes.tolist()])
+
+    @property
+    def class_id(self):
+        """Position of the suit isomorphism class of the board in the classes of boards with the
+        same number of cards, see :func:`get_canonical_boards`.
+        """
+        if len(self.cards) == 3:
+            return int(_FLOP_CLASS_IDS[self.flop_id])
+        class_keys = _get_board_classes(len(self.cards))[0]
+        return int(np.searchsorted(class_keys, self._get_canonical()[0]))
+
+    @property
+    def class_weight(self):
+        """Number of boards in the suit isomorphism class of the board."""
+        return int(get_class_weights(len(self.cards))[self.class_id])
+
+    def to_canonical(self, item):
+        """Renames the suits of a Card, Combo, Range, WeightedRange or Board the same way
+        as the suits of this board are renamed in :attr:`canonical_board`.
+        """
+        return _permute(item, self._get_canonical()[1])
+
+    def from_canonical(self, item):
+        """The inverse of :meth:`to_canonical`, renames the suits of an item from the canonical
+        board to this one.
+        """
+        return _permute(item, _INVERSE_PERMUTATIONS[self._get_canonical()[1]])
+
+    @property
+    def flop(self):
+        return self.cards[:3]
+
+    @property
+    def turn(self):
+        return self.cards[3] if len(self.cards) > 3 else None
+
+    @property
+    def river(self):
+        return self.cards[4] if len(self.cards) > 4 else None
+
+    @property
+    def texture(self):
+        """The row of the flop in :data:`FLOP_TEXTURES`."""
+        return FLOP_TEXTURES[self.flop_id]
+
+    @property
+    def is_rainbow(self):
+        return bool(FLOP_TEXTURES['is_rainbow'][self.flop_id])
+
+    @property
+    def is_monotone(self):
+        return bool(FLOP_TEXTURES['is_monotone'][self.flop_id])
+
+    @property
+    def is_triplet(self):
+        return bool(FLOP_TEXTURES['is_triplet'][self.flop_id])
+
+    @property
+    def has_pair(self):
+        return bool(FLOP_TEXTURES['has_pair'][self.flop_id])
+
+    @property
+    def has_straightdraw(self):
+        """Two flop cards are at most 3 ranks apart."""
+        return bool(FLOP_TEXTURES['has_straightdraw'][self.flop_id])
+
+    @property
+    def has_gutshot(self):
+        """Two flop cards are at most 4 ranks apart."""
+        return bool(FLOP_TEXTURES['has_gutshot'][self.flop_id])
+
+    @property
+    def has_flushdraw(self):
+        return bool(FLOP_TEXTURES['has_flushdraw'][self.flop_id])
+
+    @property
+    def is_straight_possible(self):
+        """A straight can be made with two hole cards."""
+        return bool(FLOP_TEXTURES['is_straight_possible'][self.flop_id])
+
+    @property
+    def high_rank(self):
+        """The highest Rank on the flop."""
+        return _RANKS[FLOP_TEXTURES['high_rank'][self.flop_id]]
+
+    @property
+    def rank_span(self):
+        """The difference between the highest and the lowest Rank on the flop."""
+        return int(FLOP_TEXTURES['rank_span'][self.flop_id])
+
+
+def _permute(item, permutation):
+    if isinstance(item, unicode):
+        item = Card(item) if len(item) == 2 else Combo(item)
+
+    if isinstance(item, Card):
+        return Card.from_int(_CARD_PERMUTATIONS[permutation, item.index])
+    elif isinstance(item, Combo):
+        return Combo.from_index(_COMBO_PERMUTATIONS[permutation, item.index])
+    elif isinstance(item, Range):
+        selected = np.zeros(len(Combo._all_combos), dtype=bool)
+        selected[_COMBO_PERMUTATIONS[permutation]] = _get_mask_array(item._mask)
+        return Range._from_mask(_get_array_mask(selected))
+    elif isinstance(item, WeightedRange):
+        weights = np.zeros(len(Combo._all_combos))
+        weights[_COMBO_PERMUTATIONS[permutation]] = item.weights
+        return WeightedRange.from_weights(weights)
+    elif isinstance(item, Board):
+        return Board([Card.from_int(_CARD_PERMUTATIONS[permutation, card.index])
+                      for card in item.cards])
+    raise TypeError('Should be a Card, Combo, Range, WeightedRange or Board, not %r' % (item,))
@@ -1,9 +1,10 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals, absolute_import, division, print_function
 
+import random
 import itertools
 from functools import total_ordering
-from ._common import PokerEnum, _ReprMixin
+from ._common import PokerEnum, _ReprMixin, _copy_slots
 
 
 __all__ = ['Suit', 'Rank', 'Card', 'FACE_RANKS', 'BROADWAY_RANKS']
@@ -43,9 +44,9 @@ class Rank(PokerEnum):
         """Tells the numerical difference between two ranks."""
 
         # so we always get a Rank instance even if string were passed in
-        first, second = cls(first), cls(second)
-        rank_list = list(cls)
-        return abs(rank_list.index(first) - rank_list.index(second))
+        first = first if first.__class__ is cls else cls(first)
+        second = second if second.__class__ is cls else cls(second)
+        return abs(first._ordinal - second._ordinal)
 
 
 FACE_RANKS = Rank('J'), Rank('Q'), Rank('K')
@@ -57,16 +58,26 @@ class _CardMeta(type):
     def __new__(metacls, clsname, bases, classdict):
         """Cache all possible Card instances on the class itself."""
         cls = super(_CardMeta, metacls).__new__(metacls, clsname, bases, classdict)
-        cls._all_cards = list(cls('{}{}'.format(rank, suit))
-                              for rank, suit in itertools.product(Rank, Suit))
+        cls._all_cards = tuple(cls._make_card(index, rank, suit) for index, (rank, suit)
+                               in enumerate(itertools.product(Rank, Suit)))
+        cls._card_table = metacls._make_card_table(cls._all_cards)
         return cls
 
+    @staticmethod
+    def _make_card_table(cards):
+        """Map every two character spelling (any case, letter or symbol suit) to the instance."""
+        table = {}
+        for card in cards:
+            ranks = {card.rank.val, card.rank.val.lower()}
+            suits = {alias for alias in card.suit._value_ if len(alias) == 1}
+            suits |= {suit.upper() for suit in suits}
+            for rank, suit in itertools.product(ranks, suits):
+                table[rank + suit] = card
+        return table
+
     def make_random(cls):
         """Returns a random Card instance."""
-        self = object.__new__(cls)
-        self.rank = Rank.make_random()
-        self.suit = Suit.make_random()
-        return self
+        return random.choice(cls._all_cards)
 
     def __iter__(cls):
         return iter(cls._all_cards)
@@ -77,42 +88,64 @@ class Card(_ReprMixin):
     """Represents a Card, which consists a Rank and a Suit."""
 
     __metaclass__ = _CardMeta
-    __slots__ = ('rank', 'suit')
+    __slots__ = ('rank', 'suit', 'index')
 
-    def __new__(cls, card):
+    def __new__(cls, card=None):
         if isinstance(card, cls):
             return card
+        elif card is None:
+            # protocol 2 pickles of version 0.22 and earlier, __setstate__ fills it
+            return object.__new__(cls)
+
+        try:
+            return cls._card_table[card]
+        except (KeyError, TypeError):
+            pass
 
         if len(card) != 2:
             raise ValueError('length should be two in %r' % card)
 
+        # Rank and Suit raise ValueError for invalid values, the rest is only another spelling
+        rank, suit = Rank(card[0]), Suit(card[1])
+        return cls._card_table[rank.val + suit.val]
+
+    @classmethod
+    def _make_card(cls, index, rank, suit):
         self = object.__new__(cls)
-        self.rank = Rank(card[0])
-        self.suit = Suit(card[1])
+        self.rank = rank
+        self.suit = suit
+        self.index = index
         return self
 
+    @classmethod
+    def from_int(cls, index):
+        """Returns the Card instance with the given index (0-51)."""
+        if not 0 <= index < 52:
+            raise ValueError('Card index should be between 0 and 51, not %r' % index)
+        return cls._all_cards[index]
+
     def __hash__(self):
-        return hash(self.rank) + hash(self.suit)
+        return self.index
 
-    def __getstate__(self):
-        return {'rank': self.rank, 'suit': self.suit}
+    def __reduce__(self):
+        # every Card is a singleton, so unpickling should give back the very same instance
+        return self.__class__, (unicode(self),)
 
     def __setstate__(self, state):
-        self.rank, self.suit = state['rank'], state['suit']
+        # state of pickles of version 0.22 and earlier
+        _copy_slots(Card(state['rank'].val + state['suit'].val), self)
 
     def __eq__(self, other):
         if self.__class__ is other.__class__:
-            return self.rank == other.rank and self.suit == other.suit
+            return self.index == other.index
         return NotImplemented
 
     def __lt__(self, other):
         if self.__class__ is not other.__class__:
             return NotImplemented
 
-        # with same ranks, suit counts
-        if self.rank == other.rank:
-            return self.suit < other.suit
-        return self.rank < other.rank
+        # index is ordered by rank first, with same ranks, suit counts
+        return self.index < other.index
 
     def __unicode__(self):
         return '{}{}'.format(self.rank, self.suit)
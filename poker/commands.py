@@ -54,6 +54,22 @@ def range_(range, no_border, html):
     click.echo(result)
 
 
+@poker.command('preflop-table', short_help="Generates the preflop all-in equity table.")
+@click.argument('filename', required=False)
+@click.option('--samples', default=20000, show_default=True,
+              help="Number of random boards per suit isomorphic combo pair.")
+@click.option('--workers', type=int, help="Number of worker processes. [default: CPU count]")
+def preflop_table(filename, samples, workers):
+    """Calculates the all-in preflop equity of every combo against every other combo and
+    saves the table used by poker.preflop.PreflopEquity. Without FILENAME, the table is saved
+    into the user's cache directory (~/.cache/poker by default), where it's found by default.
+    """
+    from .preflop import generate_table, DEFAULT_TABLE
+
+    generate_table(filename, samples, workers)
+    click.echo('Preflop equity table saved to %s' % (filename or DEFAULT_TABLE))
+
+
 @poker.command('2p2player', short_help="Get profile information about a Two plus Two member.")
 @click.argument('username')
 def twoplustwo_player(username):
@@ -0,0 +1,395 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, absolute_import, division, print_function
+
+"""
+    Range vs. Range equity calculations.
+"""
+
+import random
+import itertools
+import attr
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from .card import Card
+from .hand import Combo, Range, _COMBO_HANDS, _GRID_INDEXES, _get_mask_array
+from .evaluator import evaluate_many
+
+
+__all__ = ['monte_carlo_equity', 'exact_equity', 'hero_equities', 'hero_equity_grid']
+
+
+# Every chunk of simulations has it's own seed, so the results don't depend on how the chunks
+# are distributed between the worker processes.
+_CHUNK_SIZE = 10000
+
+# maximum number of rounds trying to deal non-colliding hole cards
+_MAX_DEALS = 1000
+
+# maximum number of (runout, combination of combos) pairs scored at once by exact_equity
+_BLOCK_SIZE = 2 ** 21
+
+# maximum number of (runout, combo or colliding combo pair) values handled at once
+# by hero_equities
+_HERO_BLOCK_SIZE = 2 ** 22
+
+# (1326, 2) card indexes of every combo, higher card first, ordered by combo index
+_COMBO_CARDS = np.array([(combo.first.index, combo.second.index) for combo in Combo],
+                        dtype=np.int8)
+
+# every permutation of the 4 suits as Card.index -> Card.index arrays
+_SUIT_PERMUTATIONS = tuple(np.array([index & ~3 | suits[index & 3] for index in range(52)])
+                           for suits in itertools.permutations(range(4)))
+
+
+@attr.s(slots=True)
+class _Equity(object):
+    """Equity of one range. All values are ratios between 0 and 1."""
+    win = attr.ib()
+    tie = attr.ib()
+    equity = attr.ib()
+
+
+def _get_cards(cards):
+    cards = tuple(Card(card) for card in cards)
+    if len(set(cards)) != len(cards):
+        raise ValueError('Duplicate cards: %s' % ' '.join(unicode(card) for card in cards))
+    return cards
+
+
+def _get_combo_indexes(range, known_cards):
+    """Combos of the range as an (N, 2) array of card indexes without combos containing a known
+    card (card removal).
+    """
+    range = range if isinstance(range, Range) else Range(range)
+    combo_indexes = [(combo.first.index, combo.second.index)
+                     for combo in range.without_cards(known_cards).combos]
+    if not combo_indexes:
+        raise ValueError('No combos left in %r with the known cards' % range)
+    return np.array(combo_indexes, dtype=np.int8).reshape(-1, 2)
+
+
+def _prepare(ranges, board, dead):
+    if len(ranges) < 2:
+        raise ValueError('At least two ranges are needed')
+    board = _get_cards(board)
+    if len(board) > 5:
+        raise ValueError('Board can have maximum 5 cards')
+    known_cards = _get_cards(board + tuple(dead))
+    combos = [_get_combo_indexes(range, known_cards) for range in ranges]
+    known_indexes = np.array([card.index for card in known_cards], dtype=np.int8)
+    board_indexes = known_indexes[:len(board)]
+    return combos, board_indexes, known_indexes
+
+
+def _score_showdowns(hole_indexes, board_indexes):
+    """Wins, ties and equity per player summed from showdowns.
+
+    hole_indexes: (P, N, 2) array of hole cards of every player
+    board_indexes: (N, 5) array of board cards
+    """
+    strengths = np.array([evaluate_many(np.hstack((board_indexes, holes)))[0]
+                          for holes in hole_indexes])
+    winners = strengths == strengths.max(axis=0)
+    winner_counts = winners.sum(axis=0)
+    wins = (winners & (winner_counts == 1)).sum(axis=1)
+    ties = (winners & (winner_counts > 1)).sum(axis=1)
+    equities = (winners / winner_counts).sum(axis=1)
+    return wins, ties, equities
+
+
+def _simulate_chunk(combos, board_indexes, known_indexes, size, seed):
+    """Simulate ``size`` random showdowns with a RandomState seeded by ``seed``."""
+    rng = np.random.RandomState(seed)
+    player_num = len(combos)
+    hole_indexes = np.empty((player_num, size, 2), dtype=np.int8)
+
+    # Draw hole cards for every player independently and reject the whole deal when the cards
+    # collide, so every valid combination of combos has the same probability.
+    pending = np.arange(size)
+    for __ in range(_MAX_DEALS):
+        for player, player_combos in enumerate(combos):
+            picks = rng.randint(len(player_combos), size=pending.size)
+            hole_indexes[player, pending] = player_combos[picks]
+        holes = hole_indexes[:, pending].transpose(1, 0, 2).reshape(pending.size, -1)
+        dealt = np.hstack((holes, np.tile(known_indexes, (pending.size, 1))))
+        dealt.sort(axis=1)
+        pending = pending[(dealt[:, 1:] == dealt[:, :-1]).any(axis=1)]
+        if not pending.size:
+            break
+    else:
+        raise ValueError('Could not deal hole cards, the ranges are (almost) always colliding')
+
+    missing = 5 - len(board_indexes)
+    if missing:
+        # random permutation of the remaining deck per row: used cards are sorted at the end
+        deck_keys = rng.random_sample((size, 52))
+        deck_keys[:, known_indexes] = 2
+        rows = np.arange(size)[:, np.newaxis]
+        deck_keys[rows, hole_indexes.transpose(1, 0, 2).reshape(size, -1)] = 2
+        runouts = np.argpartition(deck_keys, missing - 1, axis=1)[:, :missing]
+        board_indexes = np.hstack((np.tile(board_indexes, (size, 1)), runouts))
+    else:
+        board_indexes = np.tile(board_indexes, (size, 1))
+
+    return _score_showdowns(hole_indexes, board_indexes)
+
+
+def monte_carlo_equity(ranges, board=(), dead=(), iterations=100000, workers=None, seed=None):
+    """Calculates the equity of every range by simulating random showdowns.
+
+    Hole cards are drawn for every range from combos which don't collide with each other,
+    the board or the dead cards, then the board is completed from the remaining deck.
+    The simulations are split into fixed sized chunks, each seeded from ``seed`` and the chunk
+    number, so the same seed gives the same result with any number of workers.
+    """
+    if iterations < 1:
+        raise ValueError('Iterations should be at least 1, not %d' % iterations)
+    combos, board_indexes, known_indexes = _prepare(ranges, board, dead)
+
+    if seed is None:
+        seed = random.SystemRandom().randint(0, 2 ** 31 - 1)
+    sizes = [_CHUNK_SIZE] * (iterations // _CHUNK_SIZE)
+    if iterations % _CHUNK_SIZE:
+        sizes.append(iterations % _CHUNK_SIZE)
+    seeds = [[seed, chunk] for chunk in range(len(sizes))]
+    args = ([combos] * len(sizes), [board_indexes] * len(sizes), [known_indexes] * len(sizes),
+            sizes, seeds)
+
+    if workers == 1 or len(sizes) == 1:
+        results = list(map(_simulate_chunk, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_simulate_chunk, *args))
+
+    wins, ties, equities = (sum(values) for values in zip(*results))
+    return tuple(_Equity(win / iterations, tie / iterations, equity / iterations)
+                 for win, tie, equity in zip(wins, ties, equities))
+
+
+def _get_masks(indexes):
+    """52 bit card masks from an array of card indexes, summed on the last axis."""
+    return np.left_shift(1, indexes.astype(np.int64)).sum(axis=-1)
+
+
+def _get_combo_tuples(combos):
+    """Every combination of one combo from each range without colliding cards as an (M, P)
+    array of indexes into ``combos`` and the (M,) array of card masks of the dealt hole cards.
+    """
+    combo_tuples = np.zeros((1, 0), dtype=np.int32)
+    dealt_masks = np.zeros(1, dtype=np.int64)
+    for player_combos in combos:
+        combo_masks = _get_masks(player_combos)
+        rows, picks = np.nonzero((dealt_masks[:, np.newaxis] & combo_masks) == 0)
+        combo_tuples = np.hstack((combo_tuples[rows], picks[:, np.newaxis]))
+        dealt_masks = dealt_masks[rows] | combo_masks[picks]
+    return combo_tuples, dealt_masks
+
+
+def _get_symmetries(board_indexes, dead_indexes):
+    """Suit permutations which map the board and the dead cards onto themselves."""
+    def permutes_onto_itself(permutation, indexes):
+        return _get_masks(permutation[indexes]) == _get_masks(indexes)
+
+    return [permutation for permutation in _SUIT_PERMUTATIONS
+            if permutes_onto_itself(permutation, board_indexes) and
+            permutes_onto_itself(permutation, dead_indexes)]
+
+
+def _get_combo_numbers(cards):
+    """Combo indexes of an (..., 2) array of card indexes in any order."""
+    high, low = cards.max(axis=-1).astype(np.int32), cards.min(axis=-1).astype(np.int32)
+    return high * (high - 1) // 2 + low
+
+
+def _get_matchup_classes(combos, combo_tuples, symmetries):
+    """Representative rows of ``combo_tuples`` for every suit isomorphism class of the dealt
+    combos and the number of rows in the classes.
+    """
+    dealt = [player_combos[combo_tuples[:, player]] for player, player_combos in enumerate(combos)]
+
+    def get_numbers(permutation):
+        return np.column_stack([_get_combo_numbers(permutation[cards]) for cards in dealt])
+
+    # the lexicographically smallest row of combo indexes in a class identifies it
+    class_keys = get_numbers(symmetries[0])
+    for permutation in symmetries[1:]:
+        numbers = get_numbers(permutation)
+        different = numbers != class_keys
+        first = different.argmax(axis=1)
+        rows = np.arange(len(numbers))
+        smaller = different.any(axis=1) & (numbers[rows, first] < class_keys[rows, first])
+        class_keys[smaller] = numbers[smaller]
+    _, representatives, weights = np.unique(class_keys, return_index=True, return_counts=True,
+                                            axis=0)
+    return combo_tuples[representatives], weights
+
+
+def _get_runouts(known_indexes, missing):
+    deck = np.setdiff1d(np.arange(52), known_indexes)
+    runouts = list(itertools.combinations(deck, missing))
+    return np.array(runouts, dtype=np.int8).reshape(len(runouts), missing)
+
+
+def exact_equity(ranges, board=(), dead=()):
+    """Calculates the exact equity of every range by enumerating every runout for every
+    combination of combos which doesn't collide with each other, the board or the dead cards.
+
+    With two ranges, at least a flop and many combinations, every combo is evaluated once per
+    runout and the combos of the first range are compared against the sorted strengths of the
+    second range, like :func:`hero_equities`. Otherwise suit permutations which leave the board
+    and the dead cards the same don't change the result of a combination of combos, so only one
+    combination is evaluated from every class of combinations which are the same after such a
+    permutation, and it's weighted with the number of combinations in its class.
+    Best for flop, turn and river spots, with fewer board cards the number of runouts explodes.
+    """
+    combos, board_indexes, known_indexes = _prepare(ranges, board, dead)
+    combo_tuples, __ = _get_combo_tuples(combos)
+    if not len(combo_tuples):
+        raise ValueError('The ranges are always colliding')
+    # counting evaluates every possible combo, it's only worth it for many combinations
+    if len(combos) == 2 and len(board_indexes) >= 3 and len(combo_tuples) > len(_COMBO_CARDS):
+        return _get_heads_up_equity(combos, board_indexes, known_indexes)
+
+    dead_indexes = known_indexes[len(board_indexes):]
+    symmetries = _get_symmetries(board_indexes, dead_indexes)
+    combo_tuples, tuple_weights = _get_matchup_classes(combos, combo_tuples, symmetries)
+    dealt_masks = sum(_get_masks(player_combos[combo_tuples[:, player]])
+                      for player, player_combos in enumerate(combos))
+    runouts = _get_runouts(known_indexes, 5 - len(board_indexes))
+    runout_masks = _get_masks(runouts)
+
+    wins, ties, equities = (np.zeros(len(combos)) for __ in range(3))
+    total = 0
+    block = max(1, _BLOCK_SIZE // max(len(combo_tuples), max(map(len, combos))))
+    for start in range(0, len(runouts), block):
+        block_runouts = runouts[start:start + block]
+        boards = np.hstack((np.tile(board_indexes, (len(block_runouts), 1)), block_runouts))
+        strengths = []
+        for player, player_combos in enumerate(combos):
+            hands = np.concatenate((np.repeat(boards[:, np.newaxis], len(player_combos), axis=1),
+                                    np.tile(player_combos, (len(boards), 1, 1))), axis=2)
+            player_strengths = evaluate_many(hands.reshape(-1, 7))[0].reshape(len(boards), -1)
+            strengths.append(player_strengths[:, combo_tuples[:, player]])
+        strengths = np.array(strengths)
+
+        block_weights = tuple_weights * \
+            ((runout_masks[start:start + block, np.newaxis] & dealt_masks) == 0)
+        winners = strengths == strengths.max(axis=0)
+        winner_counts = winners.sum(axis=0)
+        wins += ((winners & (winner_counts == 1)) * block_weights).sum(axis=(1, 2))
+        ties += ((winners & (winner_counts > 1)) * block_weights).sum(axis=(1, 2))
+        equities += (winners / winner_counts * block_weights).sum(axis=(1, 2))
+        total += block_weights.sum()
+
+    if not total:
+        raise ValueError('The ranges are always colliding')
+
+    return tuple(_Equity(win / total, tie / total, equity / total)
+                 for win, tie, equity in zip(wins, ties, equities))
+
+
+def _get_heads_up_equity(combos, board_indexes, known_indexes):
+    hero, villain = (_get_combo_numbers(player_combos) for player_combos in combos)
+    wins, ties, totals = _count_hero_showdowns(villain, board_indexes, known_indexes)
+    win, tie, total = wins[hero].sum(), ties[hero].sum(), totals[hero].sum()
+    if not total:
+        raise ValueError('The ranges are always colliding')
+    lose = total - win - tie
+    return (_Equity(win / total, tie / total, (win + tie / 2) / total),
+            _Equity(lose / total, tie / total, (lose + tie / 2) / total))
+
+
+def _get_hero_counts(villain, board, dead):
+    """Wins, ties and number of showdowns of every hero combo against the villain range summed
+    over every runout, the (1326,) arrays are zero for the combos colliding with the known cards.
+    """
+    board = _get_cards(board)
+    if not 3 <= len(board) <= 5:
+        raise ValueError('Board should have 3-5 cards, not %d' % len(board))
+    known_cards = _get_cards(board + tuple(dead))
+    villain = villain if isinstance(villain, Range) else Range.from_cache(villain)
+    villain_indexes = np.flatnonzero(_get_mask_array(villain.without_cards(known_cards)._mask))
+    if not villain_indexes.size:
+        raise ValueError('No combos left in %r with the known cards' % villain)
+
+    known_indexes = np.array([card.index for card in known_cards], dtype=np.int8)
+    return _count_hero_showdowns(villain_indexes, known_indexes[:len(board)], known_indexes)
+
+
+def _count_hero_showdowns(villain_indexes, board_indexes, known_indexes):
+    """Counts of :func:`_get_hero_counts` from the combo indexes of the villain range without
+    the known cards.
+    """
+    combo_masks = _get_masks(_COMBO_CARDS)
+    hero_valid = (combo_masks & _get_masks(known_indexes)) == 0
+    runouts = _get_runouts(known_indexes, 5 - len(board_indexes))
+
+    # hero and villain combo pairs with a common card, they are taken out of the counts after
+    # counting every hero combo against every villain combo
+    pair_heroes, pair_positions = np.nonzero(
+        (combo_masks[:, np.newaxis] & combo_masks[villain_indexes]) != 0)
+    pair_villains = villain_indexes[pair_positions]
+
+    wins, ties, totals = (np.zeros(len(_COMBO_CARDS)) for __ in range(3))
+    block = max(1, _HERO_BLOCK_SIZE // max(len(pair_heroes), len(_COMBO_CARDS)))
+    for start in range(0, len(runouts), block):
+        block_runouts = runouts[start:start + block]
+        boards = np.hstack((np.tile(board_indexes, (len(block_runouts), 1)), block_runouts))
+        # every combo is evaluated only once per runout, the combos colliding with the runout or
+        # the known cards are invalid
+        hands = np.concatenate((np.repeat(boards[:, np.newaxis], len(_COMBO_CARDS), axis=1),
+                                np.tile(_COMBO_CARDS, (len(boards), 1, 1))), axis=2)
+        strengths = evaluate_many(hands.reshape(-1, 7))[0].reshape(len(boards), -1)
+        valid = hero_valid & ((_get_masks(block_runouts)[:, np.newaxis] & combo_masks) == 0)
+
+        # counting with binary search in the sorted villain strengths of every runout, the
+        # rows are offset so one search does every runout
+        offsets = np.arange(len(boards))[:, np.newaxis] * 2 ** 13
+        villain_valid = valid[:, villain_indexes]
+        villain_strengths = np.where(villain_valid, strengths[:, villain_indexes], 2 ** 13 - 1)
+        sorted_strengths = (np.sort(villain_strengths, axis=1) + offsets).ravel()
+        row_starts = offsets // 2 ** 13 * len(villain_indexes)
+        hero_strengths = strengths + offsets
+        lower = np.searchsorted(sorted_strengths, hero_strengths, 'left') - row_starts
+        equal = np.searchsorted(sorted_strengths, hero_strengths, 'right') - row_starts - lower
+        wins += np.where(valid, lower, 0).sum(axis=0)
+        ties += np.where(valid, equal, 0).sum(axis=0)
+        totals += np.where(valid, villain_valid.sum(axis=1)[:, np.newaxis], 0).sum(axis=0)
+
+        pair_valid = valid[:, pair_heroes] & valid[:, pair_villains]
+        hero_pair_strengths = strengths[:, pair_heroes]
+        villain_pair_strengths = strengths[:, pair_villains]
+        wins -= np.bincount(pair_heroes, ((hero_pair_strengths > villain_pair_strengths) &
+                                          pair_valid).sum(axis=0), len(_COMBO_CARDS))
+        ties -= np.bincount(pair_heroes, ((hero_pair_strengths == villain_pair_strengths) &
+                                          pair_valid).sum(axis=0), len(_COMBO_CARDS))
+        totals -= np.bincount(pair_heroes, pair_valid.sum(axis=0), len(_COMBO_CARDS))
+
+    return wins, ties, totals
+
+
+def hero_equities(villain, board, dead=()):
+    """Calculates the exact equity of every possible hero combo against the villain range by
+    enumerating every runout. Every combo is evaluated once per runout and the hero combos are
+    compared against the sorted villain strengths, so it costs about the same as one range.
+
+    Returns a (1326,) array, the nth value is the equity of the Combo with index n. It's NaN for
+    the combos which can't be dealt: colliding with the board or the dead cards, or with every
+    villain combo.
+    """
+    wins, ties, totals = _get_hero_counts(villain, board, dead)
+    with np.errstate(invalid='ignore'):
+        return (wins + ties / 2) / totals
+
+
+def hero_equity_grid(villain, board, dead=()):
+    """Calculates the equity of every hand like :func:`hero_equities` as a 13x13 array in the
+    layout of :meth:`poker.hand.Range.to_grid`. The equity of a hand is the average over every
+    showdown of its combos, NaN for the hands which can't be dealt.
+    """
+    wins, ties, totals = _get_hero_counts(villain, board, dead)
+    hand_number = len(_GRID_INDEXES) ** 2
+    points = np.bincount(_COMBO_HANDS, wins + ties / 2, hand_number)
+    showdowns = np.bincount(_COMBO_HANDS, totals, hand_number)
+    with np.errstate(invalid='ignore'):
+        return (points / showdowns)[_GRID_INDEXES]
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, absolute_import, division, print_function
+
+"""
+    Hold'em hand evaluator backed by precomputed lookup tables.
+
+    Every possible 5 card poker hand falls into one of 7462 equivalence classes. The tables
+    map any 5, 6 or 7 cards to the strength of the best 5 card hand which can be made from them,
+    which is the ordinal of its equivalence class, so hands can be compared as plain integers.
+    Flushes are looked up by the 13 bit rank mask of the flush suit, everything else by a perfect
+    hash of the rank counts (sum of ``5 ** rank`` for every card).
+"""
+
+import itertools
+import numpy as np
+from .card import Rank
+from .combination import CombinationGroup, Combination
+
+
+__all__ = ['evaluate', 'evaluate_many', 'to_combination', 'WORST_STRENGTH', 'BEST_STRENGTH']
+
+
+_RANKS = tuple(Rank)
+_GROUPS = tuple(CombinationGroup)
+(_HIGH_CARD, _PAIR, _TWO_PAIR, _THREE_OF_A_KIND, _STRAIGHT,
+ _FLUSH, _FULL_HOUSE, _FOUR_OF_A_KIND, _STRAIGHT_FLUSH) = range(len(_GROUPS))
+
+# rank bit masks of all the straights from the best (Ace high) to the worst (Five high, wheel)
+_STRAIGHTS = tuple((0b11111 << (high - 4), high) for high in range(12, 3, -1)) + \
+             ((0b1000000001111, 3),)
+
+
+def _get_straight_ranks(high):
+    return (12, 3, 2, 1, 0) if high == 3 else tuple(range(high, high - 5, -1))
+
+
+def _iter_classes():
+    """Generates every 5 card hand class as ((group index, significant ranks), ranks) where
+    the second item is the ranks of the 5 cards. Ranks are indexes in Rank order.
+    """
+    straight_masks = {straight_mask for straight_mask, _ in _STRAIGHTS}
+    for ranks in itertools.combinations(range(12, -1, -1), 5):
+        if sum(1 << rank for rank in ranks) not in straight_masks:
+            yield (_HIGH_CARD, ranks), ranks
+            yield (_FLUSH, ranks), ranks
+
+    for _, high in _STRAIGHTS:
+        yield (_STRAIGHT, (high,)), _get_straight_ranks(high)
+        yield (_STRAIGHT_FLUSH, (high,)), _get_straight_ranks(high)
+
+    for pair in range(13):
+        kickers = (rank for rank in range(12, -1, -1) if rank != pair)
+        for kicker_ranks in itertools.combinations(kickers, 3):
+            yield (_PAIR, (pair,) + kicker_ranks), (pair, pair) + kicker_ranks
+
+    for high, low in itertools.combinations(range(12, -1, -1), 2):
+        for kicker in (rank for rank in range(13) if rank not in (high, low)):
+            yield (_TWO_PAIR, (high, low, kicker)), (high, high, low, low, kicker)
+
+    for trips in range(13):
+        kickers = (rank for rank in range(12, -1, -1) if rank != trips)
+        for kicker_ranks in itertools.combinations(kickers, 2):
+            yield (_THREE_OF_A_KIND, (trips,) + kicker_ranks), (trips,) * 3 + kicker_ranks
+
+    for first, second in itertools.permutations(range(13), 2):
+        yield (_FULL_HOUSE, (first, second)), (first,) * 3 + (second,) * 2
+        yield (_FOUR_OF_A_KIND, (first, second)), (first,) * 4 + (second,)
+
+
+def _make_combination(group_index, ranks):
+    group = _GROUPS[group_index]
+    second_rank = _RANKS[ranks[1]] if group_index in (_TWO_PAIR, _FULL_HOUSE) else None
+    return Combination(group, _RANKS[ranks[0]], second_rank)
+
+
+def _build_tables():
+    """Makes the strength tables for 5 card hands directly from the hand classes.
+    Every 5 card subset of a bigger hand can be made by removing a card, so the strength of 6 and
+    7 card hands is the maximum of the strengths of the hands one card less.
+    """
+    classes = sorted(_iter_classes())
+
+    flush_strengths = [None] * (1 << 13)
+    rank_strengths = {}
+    for strength, ((group_index, _), ranks) in enumerate(classes):
+        if group_index in (_FLUSH, _STRAIGHT_FLUSH):
+            flush_strengths[sum(1 << rank for rank in ranks)] = strength
+        else:
+            rank_strengths[sum(5 ** rank for rank in ranks)] = strength
+
+    for rank_mask in range(1 << 13):
+        if flush_strengths[rank_mask] is None and bin(rank_mask).count('1') > 5:
+            flush_strengths[rank_mask] = max(flush_strengths[rank_mask & ~(1 << rank)]
+                                             for rank in range(13) if rank_mask & (1 << rank))
+
+    rank_keys = tuple(5 ** rank for rank in range(13))
+    smaller_strengths = rank_strengths
+    for __ in (6, 7):
+        bigger_strengths = {}
+        for smaller_key, strength in smaller_strengths.items():
+            for rank_key in rank_keys:
+                # maximum 4 cards from the same rank
+                if smaller_key // rank_key % 5 < 4:
+                    key = smaller_key + rank_key
+                    if bigger_strengths.get(key, -1) < strength:
+                        bigger_strengths[key] = strength
+        rank_strengths.update(bigger_strengths)
+        smaller_strengths = bigger_strengths
+
+    combinations = tuple(_make_combination(*hand_class) for hand_class, _ in classes)
+    return flush_strengths, rank_strengths, combinations
+
+
+_FLUSH_STRENGTHS, _RANK_STRENGTHS, _STRENGTH_COMBINATIONS = _build_tables()
+
+WORST_STRENGTH = 0
+"""Strength of the worst possible hand (7-5-4-3-2 offsuit)."""
+
+BEST_STRENGTH = len(_STRENGTH_COMBINATIONS) - 1
+"""Strength of the best possible hand (Royal flush)."""
+
+# per Card.index lookups: rank hash key, rank bit and suit counter
+_CARD_RANK_KEYS = tuple(5 ** (index >> 2) for index in range(52))
+_CARD_RANK_BITS = tuple(1 << (index >> 2) for index in range(52))
+# 3 bits per suit is enough for counting 7 cards
+_CARD_SUIT_KEYS = tuple(1 << (3 * (index & 3)) for index in range(52))
+# suit key -> index of the suit with at least 5 cards or -1
+_FLUSH_SUITS = tuple(next((suit for suit in range(4) if (suit_key >> (3 * suit)) & 0b111 >= 5), -1)
+                     for suit_key in range(1 << 12))
+
+# the same tables as NumPy arrays for batch evaluation, rank keys sorted for binary search
+_CARD_RANK_KEY_ARRAY = np.array(_CARD_RANK_KEYS, dtype=np.int64)
+_CARD_RANK_BIT_ARRAY = np.array(_CARD_RANK_BITS, dtype=np.int16)
+_CARD_SUIT_KEY_ARRAY = np.array(_CARD_SUIT_KEYS, dtype=np.int16)
+_FLUSH_SUIT_ARRAY = np.array(_FLUSH_SUITS, dtype=np.int8)
+_FLUSH_STRENGTH_ARRAY = np.array([-1 if strength is None else strength
+                                  for strength in _FLUSH_STRENGTHS], dtype=np.int16)
+_RANK_KEY_ARRAY = np.array(sorted(_RANK_STRENGTHS), dtype=np.int64)
+_RANK_STRENGTH_ARRAY = np.array([_RANK_STRENGTHS[key] for key in _RANK_KEY_ARRAY.tolist()],
+                                dtype=np.int16)
+_STRENGTH_GROUP_ARRAY = np.array([_GROUPS.index(combination.group)
+                                  for combination in _STRENGTH_COMBINATIONS], dtype=np.int8)
+
+
+def evaluate(cards):
+    """Strength of the best 5 card hand which can be made from 5, 6 or 7 cards.
+    The bigger the better, equal values are ties.
+    """
+    indexes = [card.index for card in cards]
+
+    if not 5 <= len(indexes) <= 7:
+        raise ValueError('Can evaluate 5, 6 or 7 cards, not %d' % len(indexes))
+    elif len(set(indexes)) != len(indexes):
+        raise ValueError('Duplicate cards in %r' % (tuple(cards),))
+
+    rank_key = suit_key = 0
+    for index in indexes:
+        rank_key += _CARD_RANK_KEYS[index]
+        suit_key += _CARD_SUIT_KEYS[index]
+
+    flush_suit = _FLUSH_SUITS[suit_key]
+    if flush_suit == -1:
+        return _RANK_STRENGTHS[rank_key]
+
+    rank_mask = 0
+    for index in indexes:
+        if index & 3 == flush_suit:
+            rank_mask |= _CARD_RANK_BITS[index]
+    return _FLUSH_STRENGTHS[rank_mask]
+
+
+def _evaluate_keys(rank_keys, suit_keys, suit_masks):
+    """Evaluates hands from their summed :data:`_CARD_RANK_KEYS` and :data:`_CARD_SUIT_KEYS`
+    values and the (..., 4) rank masks of every suit, so cards can be added to a hand without
+    evaluating it again from the cards. Returns an array of strengths in the shape of the keys.
+    """
+    key_positions = np.searchsorted(_RANK_KEY_ARRAY, rank_keys).clip(0, len(_RANK_KEY_ARRAY) - 1)
+    strengths = _RANK_STRENGTH_ARRAY[key_positions]
+
+    flush_suits = _FLUSH_SUIT_ARRAY[np.minimum(suit_keys, len(_FLUSH_SUIT_ARRAY) - 1)]
+    is_flush = flush_suits != -1
+    if is_flush.any():
+        flush_masks = suit_masks[is_flush]
+        rank_masks = flush_masks[np.arange(len(flush_masks)), flush_suits[is_flush]]
+        strengths[is_flush] = _FLUSH_STRENGTH_ARRAY[rank_masks]
+    return strengths
+
+
+def to_combination(strength):
+    """Converts an evaluated strength to :class:`poker.combination.Combination`."""
+    return _STRENGTH_COMBINATIONS[strength]
+
+
+def evaluate_many(indexes):
+    """Evaluates many hands at once. Takes an (N, 5-7) shaped array of :attr:`Card.index` values
+    and returns an (N,) array of strengths and an (N,) array of :class:`CombinationGroup` codes,
+    which are positions in ``list(CombinationGroup)``.
+    Duplicate cards are not checked for speed, hands with duplicates give meaningless values.
+    """
+    indexes = np.asarray(indexes)
+
+    if indexes.ndim != 2 or not 5 <= indexes.shape[1] <= 7:
+        raise ValueError('Should be an (N, 5-7) shaped array, not %r' % (indexes.shape,))
+    elif indexes.size and (indexes.min() < 0 or indexes.max() > 51):
+        raise ValueError('Card indexes should be between 0 and 51')
+
+    rank_keys = _CARD_RANK_KEY_ARRAY[indexes].sum(axis=1)
+    # clipping only matters for invalid keys (more than 4 cards of a rank)
+    key_positions = np.searchsorted(_RANK_KEY_ARRAY, rank_keys).clip(0, len(_RANK_KEY_ARRAY) - 1)
+    strengths = _RANK_STRENGTH_ARRAY[key_positions]
+
+    flush_suits = _FLUSH_SUIT_ARRAY[_CARD_SUIT_KEY_ARRAY[indexes].sum(axis=1)]
+    is_flush = flush_suits != -1
+    if is_flush.any():
+        flush_indexes = indexes[is_flush]
+        in_flush_suit = (flush_indexes & 3) == flush_suits[is_flush, np.newaxis]
+        rank_bits = np.where(in_flush_suit, _CARD_RANK_BIT_ARRAY[flush_indexes], 0)
+        rank_masks = np.bitwise_or.reduce(rank_bits, axis=1)
+        strengths[is_flush] = _FLUSH_STRENGTH_ARRAY[rank_masks]
+
+    return strengths, _STRENGTH_GROUP_ARRAY[strengths]
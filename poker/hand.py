@@ -2,17 +2,23 @@
 from __future__ import unicode_literals, absolute_import, division, print_function
 
 import re
+import struct
 import random
+import binascii
 import itertools
 import functools
+import threading
+from collections import OrderedDict, namedtuple
 from decimal import Decimal
 from pathlib import Path
+import numpy as np
 from cached_property import cached_property
-from ._common import PokerEnum, _ReprMixin
+from ._common import PokerEnum, _ReprMixin, _copy_slots
 from .card import Rank, Card, BROADWAY_RANKS
 
 
-__all__ = ['Shape', 'Hand', 'Combo', 'Range', 'PAIR_HANDS', 'OFFSUIT_HANDS', 'SUITED_HANDS']
+__all__ = ['Shape', 'Hand', 'Combo', 'Range', 'WeightedRange',
+           'PAIR_HANDS', 'OFFSUIT_HANDS', 'SUITED_HANDS']
 
 
 # pregenerated all the possible suit combinations, so we don't have to count them all the time
@@ -33,153 +39,175 @@ class _HandMeta(type):
     def __new__(metacls, clsname, bases, classdict):
         """Cache all possible Hand instances on the class itself."""
         cls = super(_HandMeta, metacls).__new__(metacls, clsname, bases, classdict)
-        cls._all_hands = tuple(cls._get_non_pairs()) + tuple(cls._get_pairs())
+        hands = tuple(metacls._get_non_pairs()) + tuple(metacls._get_pairs())
+        cls._all_hands = tuple(cls._make_hand(index, first, second, shape)
+                               for index, (first, second, shape) in enumerate(hands))
+        cls._hand_table = metacls._make_hand_table(cls._all_hands)
         return cls
 
-    def _get_non_pairs(cls):
+    @staticmethod
+    def _get_non_pairs():
         for rank1 in Rank:
             for rank2 in (r for r in Rank if r < rank1):
-                yield cls('{}{}o'.format(rank1, rank2))
-                yield cls('{}{}s'.format(rank1, rank2))
+                yield rank1, rank2, Shape.OFFSUIT
+                yield rank1, rank2, Shape.SUITED
 
-    def _get_pairs(cls):
+    @staticmethod
+    def _get_pairs():
         for rank in Rank:
-            yield cls(rank.val * 2)
+            yield rank, rank, Shape.PAIR
+
+    @staticmethod
+    def _make_hand_table(hands):
+        """Map every spelling (any case, ranks in any order) to the instance."""
+        table = {}
+        for hand in hands:
+            firsts = {hand.first.val, hand.first.val.lower()}
+            seconds = {hand.second.val, hand.second.val.lower()}
+            shapes = {hand._shape.val, hand._shape.val.upper()}
+            for first, second, shape in itertools.product(firsts, seconds, shapes):
+                table[first + second + shape] = table[second + first + shape] = hand
+        return table
 
     def __iter__(cls):
         return iter(cls._all_hands)
 
     def make_random(cls):
-        obj = object.__new__(cls)
-        first = Rank.make_random()
-        second = Rank.make_random()
-        obj._set_ranks_in_order(first, second)
-        if first == second:
-            obj._shape = ''
-        else:
-            obj._shape = random.choice(['s', 'o'])
-        return obj
+        """Returns a random Hand instance."""
+        return random.choice(cls._all_hands)
 
 
-@functools.total_ordering
 class Hand(_ReprMixin):
     """General hand without a precise suit. Only knows about two ranks and shape."""
     __metaclass__ = _HandMeta
-    __slots__ = ('first', 'second', '_shape')
+    __slots__ = ('first', 'second', 'index', '_shape', '_rank_difference')
 
-    def __new__(cls, hand):
+    def __new__(cls, hand=None):
         if isinstance(hand, cls):
             return hand
+        elif hand is None:
+            # protocol 2 pickles of version 0.22 and earlier, __setstate__ fills it
+            return object.__new__(cls)
+
+        try:
+            return cls._hand_table[hand]
+        except (KeyError, TypeError):
+            pass
 
         if len(hand) not in (2, 3):
             raise ValueError('Length should be 2 (pair) or 3 (hand)')
 
         first, second = hand[:2]
 
-        self = object.__new__(cls)
-
         if len(hand) == 2:
             if first != second:
                 raise ValueError('%r, Not a pair! Maybe you need to specify a suit?' % hand)
-            self._shape = ''
+            shape = ''
         elif len(hand) == 3:
             shape = hand[2].lower()
             if first == second:
                 raise ValueError("{!r}; pairs can't have a suit: {!r}".format(hand, shape))
             if shape not in ('s', 'o'):
                 raise ValueError('{!r}; Invalid shape: {!r}'.format(hand, shape))
-            self._shape = shape
 
-        self._set_ranks_in_order(first, second)
+        # Rank raises ValueError for invalid values, the rest is only another spelling
+        first, second = Rank(first), Rank(second)
+        return cls._hand_table[first.val + second.val + shape]
 
+    @classmethod
+    def _make_hand(cls, index, first, second, shape):
+        self = object.__new__(cls)
+        self.first = first
+        self.second = second
+        self.index = index
+        self._shape = shape
+        self._rank_difference = Rank.difference(first, second)
         return self
 
+    @classmethod
+    def from_index(cls, index):
+        """Returns the Hand instance with the given index (0-168)."""
+        if not 0 <= index < 169:
+            raise ValueError('Hand index should be between 0 and 168, not %r' % index)
+        return cls._all_hands[index]
+
     def __unicode__(self):
-        return '{}{}{}'.format(self.first, self.second, self.shape)
+        return '{}{}{}'.format(self.first, self.second, self._shape)
 
     def __hash__(self):
-        return hash(self.first) + hash(self.second) + hash(self.shape)
+        return self.index
 
-    def __getstate__(self):
-        return {'first': self.first, 'second': self.second, '_shape': self._shape}
+    def __reduce__(self):
+        # every Hand is a singleton, so unpickling should give back the very same instance
+        return self.__class__, (unicode(self),)
 
     def __setstate__(self, state):
-        self.first, self.second, self._shape = state['first'], state['second'], state['_shape']
+        # state of pickles of version 0.22 and earlier, the shape is '', 's' or 'o'
+        _copy_slots(Hand(state['first'].val + state['second'].val + state['_shape']), self)
 
     def __eq__(self, other):
-        if self.__class__ is not other.__class__:
-            return NotImplemented
-
         # AKs != AKo, because AKs is better
-        return (self.first == other.first and
-                self.second == other.second and
-                self.shape.val == other.shape.val)
+        if self.__class__ is other.__class__:
+            return self.index == other.index
+        return NotImplemented
 
+    def __ne__(self, other):
+        if self.__class__ is other.__class__:
+            return self.index != other.index
+        return NotImplemented
+
+    # index is in ascending order: non-pairs by ranks, offsuit before suited, then the pairs
     def __lt__(self, other):
-        if self.__class__ is not other.__class__:
-            return NotImplemented
-
-        # pairs are better than non-pairs
-        if not self.is_pair and other.is_pair:
-            return True
-        elif self.is_pair and not other.is_pair:
-            return False
-        elif (not self.is_pair and not other.is_pair and
-                self.first == other.first and self.second == other.second and
-                self._shape != other._shape):
-            # when Rank match, only suit is the deciding factor
-            # so, offsuit hand is 'less' than suited
-            return self._shape == 'o'
-        elif self.first == other.first:
-            return self.second < other.second
-        else:
-            return self.first < other.first
+        if self.__class__ is other.__class__:
+            return self.index < other.index
+        return NotImplemented
+
+    def __le__(self, other):
+        if self.__class__ is other.__class__:
+            return self.index <= other.index
+        return NotImplemented
+
+    def __gt__(self, other):
+        if self.__class__ is other.__class__:
+            return self.index > other.index
+        return NotImplemented
 
-    def _set_ranks_in_order(self, first, second):
-        # set as Rank objects.
-        self.first, self.second = Rank(first), Rank(second)
-        if self.first < self.second:
-            self.first, self.second = self.second, self.first
+    def __ge__(self, other):
+        if self.__class__ is other.__class__:
+            return self.index >= other.index
+        return NotImplemented
 
     def to_combos(self):
-        first, second = self.first.val, self.second.val
-        if self.is_pair:
-            return tuple(Combo(first + s1 + first + s2) for s1, s2 in _PAIR_SUIT_COMBINATIONS)
-        elif self.is_offsuit:
-            return tuple(Combo(first + s1 + second + s2) for s1, s2 in _OFFSUIT_SUIT_COMBINATIONS)
-        else:
-            return tuple(Combo(first + s1 + second + s2) for s1, s2 in _SUITED_SUIT_COMBINATIONS)
+        return Combo._hand_combos[self.index]
 
     @property
     def is_suited_connector(self):
-        return self.is_suited and self.is_connector
+        return self._shape is Shape.SUITED and self._rank_difference == 1
 
     @property
     def is_suited(self):
-        return self._shape == 's'
+        return self._shape is Shape.SUITED
 
     @property
     def is_offsuit(self):
-        return self._shape == 'o'
+        return self._shape is Shape.OFFSUIT
 
     @property
     def is_connector(self):
-        return self.rank_difference == 1
+        return self._rank_difference == 1
 
     @property
     def is_one_gapper(self):
-        return self.rank_difference == 2
+        return self._rank_difference == 2
 
     @property
     def is_two_gapper(self):
-        return self.rank_difference == 3
+        return self._rank_difference == 3
 
     @property
     def rank_difference(self):
         """The difference between the first and second rank of the Hand."""
-
-        # self.first >= self.second
-        return Rank.difference(self.first, self.second)
+        return self._rank_difference
 
     @property
     def is_broadway(self):
@@ -187,15 +215,11 @@ class Hand(_ReprMixin):
 
     @property
     def is_pair(self):
-        return self.first == self.second
+        return self._shape is Shape.PAIR
 
     @property
     def shape(self):
-        return Shape(self._shape)
-
-    @shape.setter
-    def shape(self, value):
-        self._shape = Shape(value).val
+        return self._shape
 
 
 PAIR_HANDS = tuple(hand for hand in Hand if hand.is_pair)
@@ -208,120 +232,198 @@ SUITED_HANDS = tuple(hand for hand in Hand if hand.is_suited)
 """Tuple of suited hands in ascending order."""
 
 
-@functools.total_ordering
+class _ComboMeta(type):
+    def __new__(metacls, clsname, bases, classdict):
+        """Cache all possible Combo instances on the class itself."""
+        cls = super(_ComboMeta, metacls).__new__(metacls, clsname, bases, classdict)
+        cls._all_combos = tuple(cls._make_combo(high * (high - 1) // 2 + low,
+                                                Card.from_int(high), Card.from_int(low))
+                                for high in range(52) for low in range(high))
+        cls._combo_table = metacls._make_combo_table(cls._all_combos)
+        cls._hand_combos = metacls._make_hand_combos(cls._combo_table)
+        for order, combo in enumerate(sorted(cls._all_combos, key=metacls._get_order_key)):
+            combo._order = order
+        return cls
+
+    @staticmethod
+    def _make_combo_table(combos):
+        """Map the card strings in both order to the instance."""
+        table = {}
+        for combo in combos:
+            first, second = unicode(combo.first), unicode(combo.second)
+            table[first + second] = table[second + first] = combo
+        return table
+
+    @staticmethod
+    def _make_hand_combos(combo_table):
+        """Tuple of Combos of every Hand in Hand.index order."""
+        hand_combos = []
+        for hand in Hand:
+            first, second = hand.first.val, hand.second.val
+            if hand.is_pair:
+                suit_combinations = _PAIR_SUIT_COMBINATIONS
+            elif hand.is_offsuit:
+                suit_combinations = _OFFSUIT_SUIT_COMBINATIONS
+            else:
+                suit_combinations = _SUITED_SUIT_COMBINATIONS
+            hand_combos.append(tuple(combo_table[first + s1 + second + s2]
+                                     for s1, s2 in suit_combinations))
+        return tuple(hand_combos)
+
+    @staticmethod
+    def _get_order_key(combo):
+        first, second = combo.first, combo.second
+        # pairs are better than non-pairs, pairs are ordered by their cards
+        if combo.is_pair:
+            return 1, first.index, second.index
+        # same ranks: suited combos are better, then the suit of the first and second card counts
+        return 0, first.rank, second.rank, combo.is_suited, first.suit, second.suit
+
+    def make_random(cls):
+        """Returns a random Combo instance."""
+        return random.choice(cls._all_combos)
+
+    def __iter__(cls):
+        return iter(cls._all_combos)
+
+
 class Combo(_ReprMixin):
     """Hand combination."""
 
-    __slots__ = ('first', 'second')
+    __metaclass__ = _ComboMeta
+    __slots__ = ('first', 'second', 'index', '_hand', '_shape', '_rank_difference', '_order')
 
-    def __new__(cls, combo):
+    def __new__(cls, combo=None):
         if isinstance(combo, Combo):
             return combo
+        elif combo is None:
+            # protocol 2 pickles of version 0.22 and earlier, __setstate__ fills it
+            return object.__new__(cls)
+
+        try:
+            return cls._combo_table[combo]
+        except (KeyError, TypeError):
+            pass
 
         if len(combo) != 4:
             raise ValueError('%r, should have a length of 4' % combo)
         elif (combo[0] == combo[2] and combo[1] == combo[3]):
             raise ValueError("{!r}, Pair can't have the same suit: {!r}".format(combo, combo[1]))
 
-        self = super(Combo, cls).__new__(cls)
-        self._set_cards_in_order(combo[:2], combo[2:])
+        return cls.from_cards(combo[:2], combo[2:])
+
+    @classmethod
+    def _make_combo(cls, index, first, second):
+        self = object.__new__(cls)
+        self.first = first
+        self.second = second
+        self.index = index
+        if first.rank == second.rank:
+            self._shape = Shape.PAIR
+        elif first.suit == second.suit:
+            self._shape = Shape.SUITED
+        else:
+            self._shape = Shape.OFFSUIT
+        self._hand = Hand._hand_table[first.rank.val + second.rank.val + self._shape.val]
+        self._rank_difference = Rank.difference(first.rank, second.rank)
         return self
 
     @classmethod
     def from_cards(cls, first, second):
-        self = super(Combo, cls).__new__(cls)
-        first = first.rank.val + first.suit.val
-        second = second.rank.val + second.suit.val
-        self._set_cards_in_order(first, second)
-        return self
+        """Returns the Combo instance of two Cards (or card strings) in any order."""
+        first, second = Card(first), Card(second)
+        if first == second:
+            raise ValueError("Combo can't have the same card twice: %s" % first)
+        high, low = max(first.index, second.index), min(first.index, second.index)
+        return cls._all_combos[high * (high - 1) // 2 + low]
+
+    @classmethod
+    def from_index(cls, index):
+        """Returns the Combo instance with the given index (0-1325)."""
+        if not 0 <= index < 1326:
+            raise ValueError('Combo index should be between 0 and 1325, not %r' % index)
+        return cls._all_combos[index]
 
     def __unicode__(self):
         return '{}{}'.format(self.first, self.second)
 
     def __hash__(self):
-        return hash(self.first) + hash(self.second)
+        return self.index
 
-    def __getstate__(self):
-        return {'first': self.first, 'second': self.second}
+    def __reduce__(self):
+        # every Combo is a singleton, so unpickling should give back the very same instance
+        return self.__class__, (unicode(self),)
 
     def __setstate__(self, state):
-        self.first, self.second = state['first'], state['second']
+        # state of pickles of version 0.22 and earlier
+        _copy_slots(Combo.from_cards(state['first'], state['second']), self)
 
     def __eq__(self, other):
         if self.__class__ is other.__class__:
-            return self.first == other.first and self.second == other.second
+            return self.index == other.index
         return NotImplemented
 
-    def __lt__(self, other):
-        if self.__class__ is not other.__class__:
-            return NotImplemented
+    def __ne__(self, other):
+        if self.__class__ is other.__class__:
+            return self.index != other.index
+        return NotImplemented
 
-        # lookup optimization
-        self_is_pair, other_is_pair = self.is_pair, other.is_pair
-        self_first, other_first = self.first, other.first
+    def __lt__(self, other):
+        if self.__class__ is other.__class__:
+            return self._order < other._order
+        return NotImplemented
 
-        if self_is_pair and other_is_pair:
-            if self_first == other_first:
-                return self.second < other.second
-            return self_first < other_first
+    def __le__(self, other):
+        if self.__class__ is other.__class__:
+            return self._order <= other._order
+        return NotImplemented
 
-        elif self_is_pair or other_is_pair:
-            # Pairs are better than non-pairs
-            return self_is_pair < other_is_pair
+    def __gt__(self, other):
+        if self.__class__ is other.__class__:
+            return self._order > other._order
+        return NotImplemented
 
-        else:
-            if self_first.rank == other_first.rank:
-                if self.second.rank == other.second.rank:
-                    # same ranks, suited go first in order by Suit rank
-                    if self.is_suited or other.is_suited:
-                        return self.is_suited < other.is_suited
-                    # both are suited
-                    return self_first.suit < other_first.suit
-                return self.second < other.second
-            return self_first < other_first
-
-    def _set_cards_in_order(self, first, second):
-        self.first, self.second = Card(first), Card(second)
-        if self.first < self.second:
-            self.first, self.second = self.second, self.first
+    def __ge__(self, other):
+        if self.__class__ is other.__class__:
+            return self._order >= other._order
+        return NotImplemented
 
     def to_hand(self):
         """Convert combo to :class:`Hand` object, losing suit information."""
-        return Hand('{}{}{}'.format(self.first.rank, self.second.rank, self.shape))
+        return self._hand
 
     @property
     def is_suited_connector(self):
-        return self.is_suited and self.is_connector
+        return self._shape is Shape.SUITED and self._rank_difference == 1
 
     @property
     def is_suited(self):
-        return self.first.suit == self.second.suit
+        return self._shape is Shape.SUITED
 
     @property
     def is_offsuit(self):
-        return not self.is_suited and not self.is_pair
+        return self._shape is Shape.OFFSUIT
 
     @property
     def is_connector(self):
-        return self.rank_difference == 1
+        return self._rank_difference == 1
 
     @property
     def is_one_gapper(self):
-        return self.rank_difference == 2
+        return self._rank_difference == 2
 
     @property
     def is_two_gapper(self):
-        return self.rank_difference == 3
+        return self._rank_difference == 3
 
     @property
     def rank_difference(self):
         """The difference between the first and second rank of the Combo."""
-        # self.first >= self.second
-        return Rank.difference(self.first.rank, self.second.rank)
+        return self._rank_difference
 
     @property
     def is_pair(self):
-        return self.first.rank == self.second.rank
+        return self._shape is Shape.PAIR
 
     @property
     def is_broadway(self):
@@ -329,79 +431,346 @@ class Combo(_ReprMixin):
 
     @property
     def shape(self):
-        if self.is_pair:
-            return Shape.PAIR
-        elif self.is_suited:
-            return Shape.SUITED
-        else:
-            return Shape.OFFSUIT
+        return self._shape
+
+
+# Ranges are stored as a 1326 bit integer, bit n is set when the Combo with index n is in it
+_FULL_MASK = (1 << len(Combo._all_combos)) - 1
+_HAND_MASKS = tuple(sum(1 << combo.index for combo in hand.to_combos()) for hand in Hand)
+_SORTED_COMBOS = tuple(sorted(Combo))
+
+
+def _make_card_masks():
+    """Masks of the combos containing the card for every Card in Card index order."""
+    card_masks = [0] * len(Card._all_cards)
+    for combo in Combo:
+        card_masks[combo.first.index] |= 1 << combo.index
+        card_masks[combo.second.index] |= 1 << combo.index
+    return tuple(card_masks)
+
+
+_CARD_MASKS = _make_card_masks()
+
+
+def _get_cards_mask(cards):
+    """Mask of the combos blocked by any of the cards."""
+    mask = 0
+    for card in cards:
+        mask |= _CARD_MASKS[Card(card).index]
+    return mask
+
+
+# rank ordinal of every rank character in range tokens, in both letter cases
+_RANK_ORDINALS = {char: rank._ordinal for rank in Rank for char in (rank.val, rank.val.lower())}
+
+
+def _get_spans(masks):
+    """13x13 table of the unions of the 13 masks, [low][high] is the union from the mask with
+    ordinal low to high, 0 when low > high.
+    """
+    spans = []
+    for low in range(len(masks)):
+        row = [0] * len(masks)
+        for high in range(low, len(masks)):
+            row[high] = row[high - 1] | masks[high] if high > low else masks[high]
+        spans.append(tuple(row))
+    return tuple(spans)
+
+
+def _get_shape_spans(shape):
+    """Spans of the suited or offsuit hands for every first (bigger) rank ordinal,
+    [first][low][high] is the union of the hands with second rank from low to high.
+    """
+    masks = [[0] * len(Rank) for _ in Rank]
+    for hand in Hand:
+        if hand.shape == shape:
+            masks[hand.first._ordinal][hand.second._ordinal] = _HAND_MASKS[hand.index]
+    return tuple(_get_spans(first_masks) for first_masks in masks)
+
+
+# the hands of a range token are unions of these spans, so parsing a token is a few lookups
+_PAIR_SPANS = _get_spans([_HAND_MASKS[Hand(rank.val * 2).index] for rank in Rank])
+_SUITED_SPANS = _get_shape_spans(Shape.SUITED)
+_OFFSUIT_SPANS = _get_shape_spans(Shape.OFFSUIT)
+# [low][high] is every suited or offsuit hand with first rank from low to high
+_X_SUITED_SPANS = _get_spans([spans[0][-1] for spans in _SUITED_SPANS])
+_X_OFFSUIT_SPANS = _get_spans([spans[0][-1] for spans in _OFFSUIT_SPANS])
+
+_BOTH_SPANS = _SUITED_SPANS, _OFFSUIT_SPANS
+_X_BOTH_SPANS = _X_SUITED_SPANS, _X_OFFSUIT_SPANS
+
+# rule name -> (span tables of the hands of the rule, which span of ranks is in the range)
+_RULE_SPANS = {
+    'PAIR': ((_PAIR_SPANS,), ''),
+    'PAIR_PLUS': ((_PAIR_SPANS,), '+'),
+    'PAIR_MINUS': ((_PAIR_SPANS,), '-'),
+    'PAIR_DASH': ((_PAIR_SPANS,), 'DASH'),
+    'BOTH': (_BOTH_SPANS, ''),
+    'BOTH_PLUS': (_BOTH_SPANS, '+'),
+    'BOTH_MINUS': (_BOTH_SPANS, '-'),
+    'BOTH_DASH': (_BOTH_SPANS, 'DASH'),
+    'SUITED': ((_SUITED_SPANS,), ''),
+    'SUITED_PLUS': ((_SUITED_SPANS,), '+'),
+    'SUITED_MINUS': ((_SUITED_SPANS,), '-'),
+    'SUITED_DASH': ((_SUITED_SPANS,), 'DASH'),
+    'OFFSUIT': ((_OFFSUIT_SPANS,), ''),
+    'OFFSUIT_PLUS': ((_OFFSUIT_SPANS,), '+'),
+    'OFFSUIT_MINUS': ((_OFFSUIT_SPANS,), '-'),
+    'OFFSUIT_DASH': ((_OFFSUIT_SPANS,), 'DASH'),
+    'X_SUITED': ((_X_SUITED_SPANS,), ''),
+    'X_SUITED_PLUS': ((_X_SUITED_SPANS,), '+'),
+    'X_SUITED_MINUS': ((_X_SUITED_SPANS,), '-'),
+    'X_OFFSUIT': ((_X_OFFSUIT_SPANS,), ''),
+    'X_OFFSUIT_PLUS': ((_X_OFFSUIT_SPANS,), '+'),
+    'X_OFFSUIT_MINUS': ((_X_OFFSUIT_SPANS,), '-'),
+    'X_PLUS': (_X_BOTH_SPANS, '+'),
+    'X_MINUS': (_X_BOTH_SPANS, '-'),
+    'X_BOTH': (_X_BOTH_SPANS, ''),
+}
+
+
+def _get_rule_mask(name, value):
+    """Combo mask of a range token from its rule name and value made by the lexer."""
+    if name == 'ALL':
+        return _FULL_MASK
+    elif name == 'COMBO':
+        return 1 << Combo(value).index
+
+    tables, span = _RULE_SPANS[name]
+    ranks = [_RANK_ORDINALS[rank] for rank in value]
+    if span == 'DASH':
+        # (bigger rank,) smallest, biggest
+        first, low, high = ranks[:-2], ranks[-2], ranks[-1]
+    else:
+        # smaller (, bigger) rank, the suited and offsuit spans are empty from the bigger rank up
+        first = ranks[1:]
+        low = 0 if span == '-' else ranks[0]
+        high = len(Rank) - 1 if span == '+' else ranks[0]
+
+    mask = 0
+    for spans in tables:
+        if first:
+            spans = spans[first[0]]
+        mask |= spans[low][high]
+    return mask
+
+
+# Hands in the order of the range representation: pairs, suited then offsuit hands, descending
+_REP_HAND_GROUPS = tuple(tuple(reversed(hands))
+                         for hands in (PAIR_HANDS, SUITED_HANDS, OFFSUIT_HANDS))
+# combos of every Hand in descending order
+_REP_HAND_COMBOS = tuple(tuple(sorted(hand.to_combos(), reverse=True)) for hand in Hand)
+
+
+def _get_run_next_hand(hand):
+    """The Hand after this in a shortened range piece (e.g. 'QQ' after 'KK', 'A4s' after 'A5s')
+    or None.
+    """
+    ranks = tuple(Rank)
+    if hand.is_pair:
+        ordinal = hand.first._ordinal
+        return Hand(ranks[ordinal - 1].val * 2) if ordinal else None
+    ordinal = hand.second._ordinal
+    return Hand(hand.first.val + ranks[ordinal - 1].val + hand.shape.val) if ordinal else None
+
+
+_RUN_NEXT_HANDS = tuple(_get_run_next_hand(hand) for hand in Hand)
+
+# Hand index of every Combo in Combo index order
+_COMBO_HANDS = np.array([combo.to_hand().index for combo in Combo])
+
+
+def _get_mask_bits(mask):
+    """String of '0' and '1' characters, the nth is the bit of the Combo with index n."""
+    return '{:b}'.format(mask)[::-1].ljust(len(Combo._all_combos), '0')
+
+
+def _get_mask_array(mask):
+    """Boolean array of the bits of a Range mask in Combo index order."""
+    return np.frombuffer(_get_mask_bits(mask).encode('ascii'), dtype=np.uint8) == ord('1')
+
+
+def _get_array_mask(selected):
+    """Range mask from a boolean array in Combo index order."""
+    return int(np.where(selected[::-1], b'1', b'0').tobytes() or b'0', 2)
+
+
+# Serialized format: kind, version, then the mask as 166 little endian bytes (the nth bit is the
+# Combo with index n). WeightedRange appends the float64 weights of the combos in the mask.
+_BYTES_HEADER = struct.Struct(b'<cB')
+_BYTES_VERSION = 1
+_MASK_BYTES = (len(Combo._all_combos) + 7) // 8
+
+
+def _mask_to_bytes(mask):
+    return binascii.unhexlify('{:0{}x}'.format(mask, _MASK_BYTES * 2))[::-1]
+
+
+def _bytes_to_mask(data):
+    return int(binascii.hexlify(data[::-1]), 16)
+
+
+def _unpack_bytes(kind, data, cls):
+    """Mask and the remaining data after the header, checks the kind and version."""
+    data = bytes(data)
+    if len(data) < _BYTES_HEADER.size + _MASK_BYTES or \
+            _BYTES_HEADER.unpack_from(data) != (kind, _BYTES_VERSION):
+        raise ValueError('Not a version %d serialized %s' % (_BYTES_VERSION, cls.__name__))
+    mask_end = _BYTES_HEADER.size + _MASK_BYTES
+    mask = _bytes_to_mask(data[_BYTES_HEADER.size:mask_end])
+    if mask > _FULL_MASK:
+        raise ValueError('Invalid combo mask')
+    return mask, data[mask_end:]
+
+
+# Hands of the 13x13 range chart: Aces in the top left corner, pairs on the diagonal,
+# suited hands above and offsuit hands below it.
+_HAND_GRID = tuple(tuple(Hand(row.val + col.val + ('s' if row > col else 'o' if row < col else ''))
+                         for col in reversed(Rank)) for row in reversed(Rank))
+_GRID_CSS_CLASSES = {Shape.PAIR: 'pair', Shape.SUITED: 'suited', Shape.OFFSUIT: 'offsuit'}
+# Hand index and name of every cell of the range chart
+_GRID_INDEXES = np.array([[hand.index for hand in row] for row in _HAND_GRID])
+_GRID_NAMES = tuple(unicode(hand) for row in _HAND_GRID for hand in row)
+
+# The chart markup never changes, only the cell texts are formatted into these templates.
+_HTML_TEMPLATE = '<table class="range">' + ''.join(
+    '<tr>' + ''.join('<td class="%s">{}</td>' % _GRID_CSS_CLASSES[hand.shape] for hand in row) +
+    '</tr>' for row in _HAND_GRID) + '</table>'
+
+# (cell width, border) -> ASCII template
+_ASCII_TEMPLATES = {}
+
+
+def _get_grid_texts(grid, get_text):
+    """Cell texts of the range chart, ``get_text`` is called with the name and the value
+    of the cell in ``grid`` for the cells with a non-zero value.
+    """
+    return [get_text(name, value) if value else ''
+            for name, value in zip(_GRID_NAMES, grid.ravel().tolist())]
+
+
+def _get_hand_text(name, count):
+    return name
+
+
+def _get_weighted_hand_text(name, weight):
+    return name if weight == 1 else '{}:{:.2f}'.format(name, weight)
+
+
+def _render_html(texts):
+    """13x13 HTML table from the 169 cell texts in row order."""
+    return _HTML_TEMPLATE.format(*texts)
+
+
+def _get_ascii_template(width, border):
+    try:
+        return _ASCII_TEMPLATES[width, border]
+    except KeyError:
+        pass
 
-    @shape.setter
-    def shape(self, value):
-        self._shape = Shape(value).val
+    cell = '{:<%d}' % width
+    if border:
+        cell_line = '─' * (width + 1)
+        first_line = '┌' + (cell_line + '┬') * 12 + cell_line + '┐\n'
+        line = '├' + (cell_line + '┼') * 12 + cell_line + '┤\n'
+        separator = '│ '
+        last_line = '\n└' + (cell_line + '┴') * 12 + cell_line + '┘'
+    else:
+        first_line = line = separator = last_line = ''
+
+    row = (separator + cell) * 13 + separator
+    template = first_line + ('\n' + line).join([row] * 13) + last_line
+    _ASCII_TEMPLATES[width, border] = template
+    return template
+
+
+def _render_ascii(texts, width, border):
+    """13x13 text table with ``width`` wide cells from the 169 cell texts in row order."""
+    return _get_ascii_template(width, border).format(*texts)
+
+
+def _compile_rules(rules):
+    """One regex from the rules: named groups in the same order, so the first matching
+    alternative is the rule which would match first when trying them one by one.
+    The rank groups get unique names, so backreferences can be used in every rule.
+    """
+    alternatives = []
+    for name, regex, _ in rules:
+        groups = {}
+        for number in range(1, 5):
+            groups['rank%d' % number] = '(?P<{}_{}>[2-9TJQKA])'.format(name, number)
+            groups['same%d' % number] = '(?P={}_{})'.format(name, number)
+        alternatives.append('(?P<{}>{})'.format(name, regex.format(**groups)))
+    return re.compile('|'.join(alternatives), re.IGNORECASE)
 
 
 class _RegexRangeLexer(object):
     _separator_re = re.compile(r"[,;\s]*")
-    _rank = r"([2-9TJQKA])"
     _suit = r"[cdhs♣♦♥♠]"
+    # {rankN} is a rank, {sameN} is the same rank as {rankN}
     # the second card is not the same as the first
-    # (negative lookahead for the first matching group)
+    # (negative lookahead for the first rank)
     # this will not match pairs, but will match e.g. 86 or AK
-    _nonpair1 = r"{0}(?!\1){0}".format(_rank)
-    _nonpair2 = r"{0}(?!\2){0}".format(_rank)
+    _nonpair1 = r"{rank1}(?!{same1}){rank2}"
+    # NOTE: the lookahead checks the second rank of the first part, e.g. A5-A5 doesn't match
+    _nonpair2 = r"{rank3}(?!{same2}){rank4}"
 
     rules = (
         # NAME, REGEX, value extractor METHOD NAME
         ('ALL', r"XX", '_get_value'),
-        ('PAIR', r"{}\1$".format(_rank), '_get_first'),
-        ('PAIR_PLUS', r"{}\1\+$".format(_rank), '_get_first'),
-        ('PAIR_MINUS', r"{}\1-$".format(_rank), '_get_first'),
-        ('PAIR_DASH', r"{0}\1-{0}\2$".format(_rank), '_get_for_pair_dash'),
+        ('PAIR', r"{rank1}{same1}$", '_get_first'),
+        ('PAIR_PLUS', r"{rank1}{same1}\+$", '_get_first'),
+        ('PAIR_MINUS', r"{rank1}{same1}-$", '_get_first'),
+        ('PAIR_DASH', r"{rank1}{same1}-{rank2}{same2}$", '_get_for_pair_dash'),
         ('BOTH', _nonpair1 + r"$", '_get_first_two'),
-        ('BOTH_PLUS', r"{}\+$".format(_nonpair1), '_get_first_two'),
-        ('BOTH_MINUS', r"{}-$".format(_nonpair1), '_get_first_two'),
-        ('BOTH_DASH', r"{}-{}$".format(_nonpair1, _nonpair2), '_get_for_both_dash'),
-        ('SUITED', r"{}s$".format(_nonpair1), '_get_first_two'),
-        ('SUITED_PLUS', r"{}s\+$".format(_nonpair1), '_get_first_two'),
-        ('SUITED_MINUS', r"{}s-$".format(_nonpair1), '_get_first_two'),
-        ('SUITED_DASH', r"{}s-{}s$".format(_nonpair1, _nonpair2), '_get_for_shaped_dash'),
-        ('OFFSUIT', r"{}o$".format(_nonpair1), '_get_first_two'),
-        ('OFFSUIT_PLUS', r"{}o\+$".format(_nonpair1), '_get_first_two'),
-        ('OFFSUIT_MINUS', r"{}o-$".format(_nonpair1), '_get_first_two'),
-        ('OFFSUIT_DASH', r"{}o-{}o$".format(_nonpair1, _nonpair2), '_get_for_shaped_dash'),
-        ('X_SUITED', r"{0}Xs$|X{0}s$".format(_rank), '_get_rank'),
-        ('X_SUITED_PLUS', r"{0}Xs\+$|X{0}s\+$".format(_rank), '_get_rank'),
-        ('X_SUITED_MINUS', r"{0}Xs-$|X{0}s-$".format(_rank), '_get_rank'),
-        ('X_OFFSUIT', r"{0}Xo$|X{0}o$".format(_rank), '_get_rank'),
-        ('X_OFFSUIT_PLUS', r"{0}Xo\+$|X{0}o\+$".format(_rank), '_get_rank'),
-        ('X_OFFSUIT_MINUS', r"{0}Xo-$|X{0}o-$".format(_rank), '_get_rank'),
-        ('X_PLUS', r"{0}X\+$|X{0}\+$".format(_rank), '_get_rank'),
-        ('X_MINUS', r"{0}X-$|X{0}-$".format(_rank), '_get_rank'),
-        ('X_BOTH', r"{0}X$|X{0}$".format(_rank), '_get_rank'),
+        ('BOTH_PLUS', _nonpair1 + r"\+$", '_get_first_two'),
+        ('BOTH_MINUS', _nonpair1 + r"-$", '_get_first_two'),
+        ('BOTH_DASH', _nonpair1 + r"-" + _nonpair2 + r"$", '_get_for_both_dash'),
+        ('SUITED', _nonpair1 + r"s$", '_get_first_two'),
+        ('SUITED_PLUS', _nonpair1 + r"s\+$", '_get_first_two'),
+        ('SUITED_MINUS', _nonpair1 + r"s-$", '_get_first_two'),
+        ('SUITED_DASH', _nonpair1 + r"s-" + _nonpair2 + r"s$", '_get_for_shaped_dash'),
+        ('OFFSUIT', _nonpair1 + r"o$", '_get_first_two'),
+        ('OFFSUIT_PLUS', _nonpair1 + r"o\+$", '_get_first_two'),
+        ('OFFSUIT_MINUS', _nonpair1 + r"o-$", '_get_first_two'),
+        ('OFFSUIT_DASH', _nonpair1 + r"o-" + _nonpair2 + r"o$", '_get_for_shaped_dash'),
+        ('X_SUITED', r"{rank1}Xs$|X{rank2}s$", '_get_rank'),
+        ('X_SUITED_PLUS', r"{rank1}Xs\+$|X{rank2}s\+$", '_get_rank'),
+        ('X_SUITED_MINUS', r"{rank1}Xs-$|X{rank2}s-$", '_get_rank'),
+        ('X_OFFSUIT', r"{rank1}Xo$|X{rank2}o$", '_get_rank'),
+        ('X_OFFSUIT_PLUS', r"{rank1}Xo\+$|X{rank2}o\+$", '_get_rank'),
+        ('X_OFFSUIT_MINUS', r"{rank1}Xo-$|X{rank2}o-$", '_get_rank'),
+        ('X_PLUS', r"{rank1}X\+$|X{rank2}\+$", '_get_rank'),
+        ('X_MINUS', r"{rank1}X-$|X{rank2}-$", '_get_rank'),
+        ('X_BOTH', r"{rank1}X$|X{rank2}$", '_get_rank'),
         # might be anything, even pair
         # FIXME: 5s5s accepted
-        ('COMBO', r"{0}{1}{0}{1}$".format(_rank, _suit), '_get_value'),
+        ('COMBO', r"{{rank1}}{0}{{rank2}}{0}$".format(_suit), '_get_value'),
     )
-    # compile regexes when initializing class, so every instance will have them precompiled
-    rules = [(name, re.compile(regex, re.IGNORECASE), method) for (name, regex, method) in rules]
+    # compile the rules when initializing class, so every instance will have them precompiled
+    _token_re = _compile_rules(rules)
+    _methods = {name: method for name, _, method in rules}
+    _ranks = {char: rank for rank in Rank for char in (rank.val, rank.val.lower())}
 
     def __init__(self, range=''):
         # filter out empty matches
         self.tokens = [token for token in self._separator_re.split(range) if token]
 
     def __iter__(self):
-        """Goes through all the tokens and compare them with the regex rules. If it finds a match,
-        makes an appropriate value for the token and yields them.
+        """Goes through all the tokens and matches them with the rules in one pass. If it finds a
+        match, makes an appropriate value for the token and yields them.
         """
         for token in self.tokens:
-            for name, regex, method_name in self.rules:
-                if regex.match(token):
-                    val_method = getattr(self, method_name)
-                    yield name, val_method(token)
-                    break
-            else:
-                raise ValueError('Invalid token: %s' % token)
+            yield self._match(token)
+
+    @classmethod
+    def _match(cls, token):
+        match = cls._token_re.match(token)
+        if match is None:
+            raise ValueError('Invalid token: %s' % token)
+        # the outer group of the rule closes last
+        name = match.lastgroup
+        return name, getattr(cls, cls._methods[name])(token)
 
     @staticmethod
     def _get_value(token):
@@ -433,18 +802,18 @@ class _RegexRangeLexer(object):
         smaller1, bigger1 = cls._get_rank_in_order(token[first_part], 0, 1)
         smaller2, bigger2 = cls._get_rank_in_order(token[second_part], 0, 1)
 
-        if bigger1 != bigger2:
+        # the second part can't be a pair, e.g. K6-KK
+        if bigger1 != bigger2 or smaller2 == bigger2:
             raise ValueError('Invalid token: %s' % token)
 
         smaller, bigger = min(smaller1, smaller2), max(smaller1, smaller2)
 
         return bigger1.val, smaller.val, bigger.val
 
-    @staticmethod
-    def _get_rank_in_order(token, first_part, second_part):
-        first, second = Rank(token[first_part]), Rank(token[second_part])
-        smaller, bigger = min(first, second), max(first, second)
-        return smaller, bigger
+    @classmethod
+    def _get_rank_in_order(cls, token, first_part, second_part):
+        first, second = cls._ranks[token[first_part]], cls._ranks[token[second_part]]
+        return (first, second) if first < second else (second, first)
 
     @classmethod
     # for 'A5-AT'
@@ -457,144 +826,134 @@ class _RegexRangeLexer(object):
         return cls._get_first_smaller_bigger(slice(0, 2), slice(4, 6), token)
 
 
+class _WeightedRangeLexer(_RegexRangeLexer):
+    """Lexer for ranges with weights (frequencies) in the PioSOLVER (``AKs:0.5, QQ:0.25``) and
+    in the GTO+ / Flopzilla (``[50]AKs, QQ[/50]``) syntax. Tokens without a weight are full weight.
+    Iterating yields (name, value, weight) tuples, weight is between 0 and 1.
+    """
+    # weight in percent, the closing tag repeats the same text
+    _group_re = re.compile(r"\[(\d+(?:\.\d*)?)\](.*?)\[/\1\]", re.DOTALL)
+    _weight_re = re.compile(r"(.+):(\d+(?:\.\d*)?|\.\d+)$")
+
+    def __init__(self, range=''):
+        self.tokens = []
+        position = 0
+        for group in self._group_re.finditer(range):
+            self._add_tokens(range[position:group.start()], 1.0)
+            self._add_tokens(group.group(2), float(group.group(1)) / 100)
+            position = group.end()
+        self._add_tokens(range[position:], 1.0)
+
+    def _add_tokens(self, range, weight):
+        for token in self._separator_re.split(range):
+            # filter out empty matches
+            if not token:
+                continue
+            match = self._weight_re.match(token)
+            token_weight = float(match.group(2)) if match else weight
+            if not 0 <= token_weight <= 1:
+                raise ValueError('Invalid weight: %s' % token)
+            self.tokens.append((match.group(1) if match else token, token_weight))
+
+    def __iter__(self):
+        for token, weight in self.tokens:
+            yield self._match(token) + (weight,)
+
+
+CacheInfo = namedtuple('CacheInfo', 'hits misses maxsize currsize')
+
+
+class _LRUCache(object):
+    """Thread safe, size bounded mapping which drops the least recently used item when full
+    and counts the hits and misses like ``functools.lru_cache``.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = self._misses = 0
+
+    def get(self, key, make_value):
+        """Returns the value of the key, calls ``make_value()`` and stores its result if missing.
+        """
+        with self._lock:
+            try:
+                value = self._items.pop(key)
+            except KeyError:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._items[key] = value
+                return value
+
+        # errors are raised without storing anything
+        value = make_value()
+
+        with self._lock:
+            self._items[key] = value
+            if len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return value
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, len(self._items))
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._hits = self._misses = 0
+
+
 @functools.total_ordering
 class Range(object):
-    """Parses a str range into tuple of Combos (or Hands)."""
-    slots = ('_hands', '_combos')
+    """Parses a str range into tuple of Combos (or Hands).
+
+    Ranges can be combined with the ``|`` (union), ``&`` (intersection), ``-`` (difference) and
+    ``^`` (symmetric difference) operators, which make new Range instances.
+    """
+    slots = ('_mask',)
+
+    _cache = _LRUCache(maxsize=4096)
+
+    # token -> (rule name, combo mask) of the tokens already parsed
+    _token_masks = {}
 
     def __init__(self, range=''):
-        self._hands = set()
-        self._combos = set()
+        range_mask = 0
 
-        for name, value in _RegexRangeLexer(range):
+        for token in _RegexRangeLexer(range).tokens:
+            name, mask = self._get_token_mask(token)
+            range_mask |= mask
             if name == 'ALL':
-                for card in itertools.combinations('AKQJT98765432', 2):
-                    self._add_offsuit(card)
-                    self._add_suited(card)
-                for rank in 'AKQJT98765432':
-                    self._add_pair(rank)
-
                 # full range, no need to parse any more name
                 break
 
-            elif name == 'PAIR':
-                self._add_pair(value)
-
-            elif name == 'PAIR_PLUS':
-                smallest = Rank(value)
-                for rank in (rank.val for rank in Rank if rank >= smallest):
-                    self._add_pair(rank)
-
-            elif name == 'PAIR_MINUS':
-                biggest = Rank(value)
-                for rank in (rank.val for rank in Rank if rank <= biggest):
-                    self._add_pair(rank)
-
-            elif name == 'PAIR_DASH':
-                first, second = Rank(value[0]), Rank(value[1])
-                ranks = (rank.val for rank in Rank if first <= rank <= second)
-                for rank in ranks:
-                    self._add_pair(rank)
-
-            elif name == 'BOTH':
-                self._add_offsuit(value[0] + value[1])
-                self._add_suited(value[0] + value[1])
-
-            elif name == 'X_BOTH':
-                for rank in (r.val for r in Rank if r < Rank(value)):
-                    self._add_suited(value + rank)
-                    self._add_offsuit(value + rank)
-
-            elif name == 'OFFSUIT':
-                self._add_offsuit(value[0] + value[1])
-
-            elif name == 'SUITED':
-                self._add_suited(value[0] + value[1])
-
-            elif name == 'X_OFFSUIT':
-                biggest = Rank(value)
-                for rank in (rank.val for rank in Rank if rank < biggest):
-                    self._add_offsuit(value + rank)
-
-            elif name == 'X_SUITED':
-                biggest = Rank(value)
-                for rank in (rank.val for rank in Rank if rank < biggest):
-                    self._add_suited(value + rank)
-
-            elif name == 'BOTH_PLUS':
-                smaller, bigger = Rank(value[0]), Rank(value[1])
-                for rank in (rank.val for rank in Rank if smaller <= rank < bigger):
-                    self._add_suited(value[1] + rank)
-                    self._add_offsuit(value[1] + rank)
-
-            elif name == 'BOTH_MINUS':
-                smaller, bigger = Rank(value[0]), Rank(value[1])
-                for rank in (rank.val for rank in Rank if rank <= smaller):
-                    self._add_suited(value[1] + rank)
-                    self._add_offsuit(value[1] + rank)
-
-            elif name in ('X_PLUS', 'X_SUITED_PLUS', 'X_OFFSUIT_PLUS'):
-                smallest = Rank(value)
-                first_ranks = (rank for rank in Rank if rank >= smallest)
-
-                for rank1 in first_ranks:
-                    second_ranks = (rank for rank in Rank if rank < rank1)
-                    for rank2 in second_ranks:
-                        if name != 'X_OFFSUIT_PLUS':
-                            self._add_suited(rank1.val + rank2.val)
-                        if name != 'X_SUITED_PLUS':
-                            self._add_offsuit(rank1.val + rank2.val)
-
-            elif name in ('X_MINUS', 'X_SUITED_MINUS', 'X_OFFSUIT_MINUS'):
-                biggest = Rank(value)
-                first_ranks = (rank for rank in Rank if rank <= biggest)
-
-                for rank1 in first_ranks:
-                    second_ranks = (rank for rank in Rank if rank < rank1)
-                    for rank2 in second_ranks:
-                        if name != 'X_OFFSUIT_MINUS':
-                            self._add_suited(rank1.val + rank2.val)
-                        if name != 'X_SUITED_MINUS':
-                            self._add_offsuit(rank1.val + rank2.val)
-
-            elif name == 'COMBO':
-                self._combos.add(Combo(value))
-
-            elif name == 'OFFSUIT_PLUS':
-                smaller, bigger = Rank(value[0]), Rank(value[1])
-                for rank in (rank.val for rank in Rank if smaller <= rank < bigger):
-                    self._add_offsuit(value[1] + rank)
-
-            elif name == 'OFFSUIT_MINUS':
-                smaller, bigger = Rank(value[0]), Rank(value[1])
-                for rank in (rank.val for rank in Rank if rank <= smaller):
-                    self._add_offsuit(value[1] + rank)
-
-            elif name == 'SUITED_PLUS':
-                smaller, bigger = Rank(value[0]), Rank(value[1])
-                for rank in (rank.val for rank in Rank if smaller <= rank < bigger):
-                    self._add_suited(value[1] + rank)
-
-            elif name == 'SUITED_MINUS':
-                smaller, bigger = Rank(value[0]), Rank(value[1])
-                for rank in (rank.val for rank in Rank if rank <= smaller):
-                    self._add_suited(value[1] + rank)
-
-            elif name == 'BOTH_DASH':
-                smaller, bigger = Rank(value[1]), Rank(value[2])
-                for rank in (rank.val for rank in Rank if smaller <= rank <= bigger):
-                    self._add_offsuit(value[0] + rank)
-                    self._add_suited(value[0] + rank)
-
-            elif name == 'OFFSUIT_DASH':
-                smaller, bigger = Rank(value[1]), Rank(value[2])
-                for rank in (rank.val for rank in Rank if smaller <= rank <= bigger):
-                    self._add_offsuit(value[0] + rank)
-
-            elif name == 'SUITED_DASH':
-                smaller, bigger = Rank(value[1]), Rank(value[2])
-                for rank in (rank.val for rank in Rank if smaller <= rank <= bigger):
-                    self._add_suited(value[0] + rank)
+        self._mask = range_mask
+
+    def __setattr__(self, name, value):
+        # instances are shared by from_cache, the mask can be set only once, when making them
+        if name != '_mask' or hasattr(self, '_mask'):
+            raise AttributeError('Range instances are immutable')
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name):
+        raise AttributeError('Range instances are immutable')
+
+    @classmethod
+    def _get_token_mask(cls, token):
+        """Rule name and combo mask of a token, calculated only once for every token."""
+        name_mask = cls._token_masks.get(token)
+        if name_mask is not None:
+            return name_mask
+
+        name, value = _RegexRangeLexer._match(token)
+        mask = _get_rule_mask(name, value)
+        # anything starting with XX and every spelling of every combo would grow it too much
+        if name not in ('ALL', 'COMBO'):
+            cls._token_masks[token] = name, mask
+        return name, mask
 
     @classmethod
     def from_file(cls, filename):
@@ -604,55 +963,149 @@ class Range(object):
         range_string = Path(filename).open().read()
         return cls(range_string)
 
+    @classmethod
+    def from_cache(cls, range=''):
+        """Returns a shared instance from a process-wide LRU cache of parsed ranges, parses the
+        range only when it's not in the cache. Ranges differing only in separators or letter case
+        are the same cache entry. Range instances can't be changed, setting an attribute raises
+        AttributeError, so a shared instance is the same for every user.
+        """
+        tokens = _RegexRangeLexer._separator_re.split(range)
+        key = ' '.join(token.upper() for token in tokens if token)
+        return cls._cache.get((cls, key), lambda: cls(key))
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Makes an instance from the output of :meth:`to_bytes`."""
+        mask, rest = _unpack_bytes(b'R', data, cls)
+        if rest:
+            raise ValueError('Unexpected data after the combo mask')
+        return cls._from_mask(mask)
+
+    def to_bytes(self):
+        """Compact binary representation: a 2 byte header with a version tag and the combos
+        as a 166 byte bitmask. Pickling uses it too.
+        """
+        return _BYTES_HEADER.pack(b'R', _BYTES_VERSION) + _mask_to_bytes(self._mask)
+
+    @classmethod
+    def cache_info(cls):
+        """Statistics of the :meth:`from_cache` cache as a
+        ``CacheInfo(hits, misses, maxsize, currsize)`` named tuple.
+        """
+        return cls._cache.info()
+
+    @classmethod
+    def cache_clear(cls):
+        """Empties the :meth:`from_cache` cache and resets the statistics."""
+        cls._cache.clear()
+
     @classmethod
     def from_objects(cls, iterable):
         """Make an instance from an iterable of Combos, Hands or both."""
         range_string = ' '.join(unicode(obj) for obj in iterable)
         return cls(range_string)
 
+    @classmethod
+    def _from_mask(cls, mask):
+        self = object.__new__(cls)
+        self._mask = mask
+        return self
+
     def __eq__(self, other):
         if self.__class__ is other.__class__:
-            return self._all_combos == other._all_combos
+            return self._mask == other._mask
+        return NotImplemented
+
+    def __ne__(self, other):
+        if self.__class__ is other.__class__:
+            return self._mask != other._mask
         return NotImplemented
 
     def __lt__(self, other):
         if self.__class__ is other.__class__:
-            return len(self._all_combos) < len(other._all_combos)
+            return self._count_combos() < other._count_combos()
+        return NotImplemented
+
+    def __or__(self, other):
+        if self.__class__ is other.__class__:
+            return self._from_mask(self._mask | other._mask)
+        return NotImplemented
+
+    def __and__(self, other):
+        if self.__class__ is other.__class__:
+            return self._from_mask(self._mask & other._mask)
+        return NotImplemented
+
+    def __sub__(self, other):
+        if self.__class__ is other.__class__:
+            return self._from_mask(self._mask & ~other._mask)
+        return NotImplemented
+
+    def __xor__(self, other):
+        if self.__class__ is other.__class__:
+            return self._from_mask(self._mask ^ other._mask)
         return NotImplemented
 
     def __contains__(self, item):
+        if isinstance(item, unicode):
+            item = Combo(item) if len(item) == 4 else Hand(item)
+
         if isinstance(item, Combo):
-            return item in self._combos or item.to_hand() in self._hands
+            return bool(self._mask >> item.index & 1)
         elif isinstance(item, Hand):
-            return item in self._all_hands
-        elif isinstance(item, unicode):
-            if len(item) == 4:
-                combo = Combo(item)
-                return combo in self._combos or combo.to_hand() in self._hands
-            else:
-                return Hand(item) in self._all_hands
+            # a Hand is in the Range if any of its combos are
+            return bool(self._mask & _HAND_MASKS[item.index])
 
     def __len__(self):
         return self._count_combos()
 
     def __unicode__(self):
-        return ', '.join(self.rep_pieces)
+        return ', '.join(self._rep_pieces)
 
     def __str__(self):
         return unicode(self).encode('utf-8')
 
     def __repr__(self):
-        range = ' '.join(self.rep_pieces)
+        range = ' '.join(self._rep_pieces)
         return "{}('{}')".format(self.__class__.__name__, range).encode('utf-8')
 
     def __getstate__(self):
-        return {'_hands': self._hands, '_combos': self._combos}
+        return self.to_bytes()
 
     def __setstate__(self, state):
-        self._hands, self._combos = state['_hands'], state['_combos']
+        # pickles of version 0.22 and earlier have the hands and the single combos in a dict
+        if isinstance(state, dict):
+            mask = 0
+            for hand in state['_hands']:
+                mask |= _HAND_MASKS[hand.index]
+            for combo in state['_combos']:
+                mask |= 1 << combo.index
+            self._mask = mask
+        else:
+            self._mask = self.from_bytes(state)._mask
 
     def __hash__(self):
-        return hash(self.combos)
+        return hash(self._mask)
+
+    def without_cards(self, cards):
+        """Makes a new Range without the combos containing any of the cards (card removal),
+        e.g. the board or dead cards.
+
+        :param cards: iterable of :class:`poker.card.Card` instances or card strings
+        """
+        return self._from_mask(self._mask & ~_get_cards_mask(cards))
+
+    def filter(self, predicate):
+        """Makes a new Range of the combos matching a :class:`poker.predicates.Predicate`,
+        e.g. ``range.filter(suited & connector & ~broadway)``. The predicate is a precomputed
+        combo mask, so this is one bit operation.
+        """
+        return self._from_mask(self._mask & predicate._mask)
+
+    def count_combos(self, dead_cards=()):
+        """Number of combos in the range which don't contain any of the dead cards."""
+        return bin(self._mask & ~_get_cards_mask(dead_cards)).count('1')
 
     def to_html(self):
         """Returns a 13x13 HTML table representing the range.
@@ -660,153 +1113,60 @@ class Range(object):
         The table's CSS class is ``range``, pair cells (td element) are ``pair``, offsuit hands are
         ``offsuit`` and suited hand cells has ``suited`` css class.
         The HTML contains no extra whitespace at all.
-        Calculating it should not take more than 30ms (which takes calculating a 100% range).
+        The markup is a precomputed template, only the hand names are filled in.
         """
-
-        # note about speed: I tried with functools.lru_cache, and the initial call was 3-4x slower
-        # than without it, and the need for calling this will usually be once, so no need to cache
-
-        html = ['<table class="range">']
-
-        for row in reversed(Rank):
-            html.append('<tr>')
-
-            for col in reversed(Rank):
-                if row > col:
-                    suit, cssclass = 's', 'suited'
-                elif row < col:
-                    suit, cssclass = 'o', 'offsuit'
-                else:
-                    suit, cssclass = '', 'pair'
-
-                html.append('<td class="%s">' % cssclass)
-                hand = Hand(row.val + col.val + suit)
-
-                if hand in self.hands:
-                    html.append(unicode(hand))
-
-                html.append('</td>')
-
-            html.append('</tr>')
-
-        html.append('</table>')
-        return ''.join(html)
+        return _render_html(_get_grid_texts(self.to_grid(), _get_hand_text))
 
     def to_ascii(self, border=False):
         """Returns a nicely formatted ASCII table with optional borders."""
+        return _render_ascii(_get_grid_texts(self.to_grid(), _get_hand_text), 4, border)
 
-        table = []
-
-        if border:
-            table.append('┌' + '─────┬' * 12 + '─────┐\n')
-            line = '├' + '─────┼' * 12 + '─────┤\n'
-            border = '│ '
-            lastline = '\n└' + '─────┴' * 12 + '─────┘'
-        else:
-            line = border = lastline = ''
-
-        for row in reversed(Rank):
-            for col in reversed(Rank):
-                if row > col:
-                    suit = 's'
-                elif row < col:
-                    suit = 'o'
-                else:
-                    suit = ''
-
-                hand = Hand(row.val + col.val + suit)
-                hand = unicode(hand) if hand in self.hands else ''
-                table.append(border)
-                table.append(hand.ljust(4))
-
-            if row.val != '2':
-                table.append(border)
-                table.append('\n')
-                table.append(line)
-
-        table.append(border)
-        table.append(lastline)
-
-        return ''.join(table)
+    def to_grid(self):
+        """13x13 array of the number of combos of every hand in the layout of :meth:`to_ascii`:
+        Aces in the top left corner, pairs on the diagonal, suited hands above and offsuit hands
+        below it.
+        """
+        combo_hands = _COMBO_HANDS[_get_mask_array(self._mask)]
+        return np.bincount(combo_hands, minlength=len(Hand._all_hands))[_GRID_INDEXES]
 
     @property
     def rep_pieces(self):
         """List of str pieces how the Range is represented."""
+        return list(self._rep_pieces)
 
-        if self._count_combos() == 1326:
-            return ['XX']
-
-        all_combos = self._all_combos
-
-        pairs = list(filter(lambda c: c.is_pair, all_combos))
-        pair_pieces = self._get_pieces(pairs, 6)
-
-        suiteds = list(filter(lambda c: c.is_suited, all_combos))
-        suited_pieces = self._get_pieces(suiteds, 4)
-
-        offsuits = list(filter(lambda c: c.is_offsuit, all_combos))
-        offsuit_pieces = self._get_pieces(offsuits, 12)
-
-        pair_strs = self._shorten_pieces(pair_pieces)
-        suited_strs = self._shorten_pieces(suited_pieces)
-        offsuit_strs = self._shorten_pieces(offsuit_pieces)
-
-        return pair_strs + suited_strs + offsuit_strs
-
-    def _get_pieces(self, combos, combos_in_hand):
-        if not combos:
-            return []
-
-        sorted_combos = sorted(combos, reverse=True)
-        hands_and_combos = []
-        current_combos = []
-        last_combo = sorted_combos[0]
-
-        for combo in sorted_combos:
-            if (last_combo.first.rank == combo.first.rank and
-                    last_combo.second.rank == combo.second.rank):
-                current_combos.append(combo)
-                length = len(current_combos)
-
-                if length == combos_in_hand:
-                    hands_and_combos.append(combo.to_hand())
-                    current_combos = []
-            else:
-                hands_and_combos.extend(current_combos)
-                current_combos = [combo]
-
-            last_combo = combo
-
-        # add the remainder if any, current_combos might be empty
-        hands_and_combos.extend(current_combos)
-
-        return hands_and_combos
-
-    def _shorten_pieces(self, pieces):
-        if not pieces:
-            return []
+    @cached_property
+    def _rep_pieces(self):
+        if self._mask == _FULL_MASK:
+            return ('XX',)
 
+        mask = self._mask
         str_pieces = []
-        first = last = pieces[0]
-        for current in pieces[1:]:
-            if isinstance(last, Combo):
-                str_pieces.append(unicode(last))
-                first = last = current
-            elif isinstance(current, Combo):
-                str_pieces.append(self._get_format(first, last))
-                first = last = current
-            elif ((current.is_pair and Rank.difference(last.first, current.first) == 1) or
-                  (last.first == current.first and
-                   Rank.difference(last.second, current.second) == 1)):
-                last = current
-            else:
+        # pairs, suited then offsuit hands in descending order, every full Hand is a piece,
+        # consecutive Hands are shortened to one piece, the combos of partial Hands are pieces
+        for hands in _REP_HAND_GROUPS:
+            first = last = None
+            for hand in hands:
+                hand_mask = _HAND_MASKS[hand.index]
+                combo_mask = mask & hand_mask
+                if not combo_mask:
+                    continue
+                elif combo_mask == hand_mask:
+                    if last is not None and _RUN_NEXT_HANDS[last.index] is hand:
+                        last = hand
+                        continue
+                    elif last is not None:
+                        str_pieces.append(self._get_format(first, last))
+                    first = last = hand
+                else:
+                    if last is not None:
+                        str_pieces.append(self._get_format(first, last))
+                        first = last = None
+                    str_pieces.extend(unicode(combo) for combo in _REP_HAND_COMBOS[hand.index]
+                                      if mask >> combo.index & 1)
+            if last is not None:
                 str_pieces.append(self._get_format(first, last))
-                first = last = current
 
-        # write out any remaining pieces
-        str_pieces.append(self._get_format(first, last))
-
-        return str_pieces
+        return tuple(str_pieces)
 
     def _get_format(self, first, last):
         if first == last:
@@ -819,25 +1179,17 @@ class Range(object):
         else:
             return '{}-{}'.format(first, last)
 
-    def _add_pair(self, rank):
-        self._hands.add(Hand(rank * 2))
-
-    def _add_offsuit(self, tok):
-        self._hands.add(Hand(tok[0] + tok[1] + 'o'))
-
-    def _add_suited(self, tok):
-        self._hands.add(Hand(tok[0] + tok[1] + 's'))
-
     @cached_property
     def hands(self):
         """Tuple of hands contained in this range. If only one combo of the same hand is present,
         it will be shown here. e.g. ``Range('2s2c').hands == (Hand('22'),)``
         """
-        return tuple(sorted(self._all_hands))
+        return tuple(hand for hand in Hand if self._mask & _HAND_MASKS[hand.index])
 
     @cached_property
     def combos(self):
-        return tuple(sorted(self._all_combos))
+        bits = _get_mask_bits(self._mask)
+        return tuple(combo for combo in _SORTED_COMBOS if bits[combo.index] == '1')
 
     @cached_property
     def percent(self):
@@ -851,28 +1203,190 @@ class Range(object):
         return float(dec_percent.quantize(Decimal('1.00')))
 
     def _count_combos(self):
-        combo_count = len(self._combos)
-        for hand in self._hands:
-            if hand.is_pair:
-                combo_count += 6
-            elif hand.is_offsuit:
-                combo_count += 12
-            elif hand.is_suited:
-                combo_count += 4
-        return combo_count
+        return bin(self._mask).count('1')
 
     @cached_property
     def _all_combos(self):
-        hand_combos = {combo for hand in self._hands for combo in hand.to_combos()}
-        return hand_combos | self._combos
+        return set(self.combos)
+
+
+class WeightedRange(object):
+    """Range where every combo has a weight (frequency) between 0 and 1, e.g. from a solver.
+
+    Parses the PioSOLVER (``AKs:0.5, QQ:0.25``) and the GTO+ / Flopzilla (``[50]AKs, QQ[/50]``)
+    weighted syntax besides everything :class:`Range` can parse; tokens without a weight are
+    full weight and later tokens override the weights of earlier ones.
+    """
+
+    def __init__(self, range=''):
+        weights = np.zeros(len(Combo._all_combos))
+        for token, weight in _WeightedRangeLexer(range).tokens:
+            name, mask = Range._get_token_mask(token)
+            weights[_get_mask_array(mask)] = weight
+        self._set_weights(weights)
+
+    @classmethod
+    def from_weights(cls, weights):
+        """Makes an instance from 1326 weights, the nth is the weight of the Combo with
+        index n.
+        """
+        weights = np.array(weights, dtype=float)
+        if weights.shape != (len(Combo._all_combos),):
+            raise ValueError('Should be 1326 weights, not %r' % (weights.shape,))
+        elif ((weights < 0) | (weights > 1)).any():
+            raise ValueError('Weights should be between 0 and 1')
+        self = object.__new__(cls)
+        self._set_weights(weights)
+        return self
+
+    @classmethod
+    def from_file(cls, filename):
+        """Creates an instance from a given file, containing a weighted range."""
+        range_string = Path(filename).open().read()
+        return cls(range_string)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Makes an instance from the output of :meth:`to_bytes`."""
+        mask, rest = _unpack_bytes(b'W', data, cls)
+        selected = _get_mask_array(mask)
+        if len(rest) != 8 * np.count_nonzero(selected):
+            raise ValueError('Should be one weight for every combo in the mask')
+        weights = np.zeros(len(Combo._all_combos))
+        weights[selected] = np.frombuffer(rest, dtype='<f8')
+        return cls.from_weights(weights)
+
+    def to_bytes(self):
+        """Compact binary representation like :meth:`Range.to_bytes`, followed by the weights
+        of the combos in the bitmask. Pickling uses it too.
+        """
+        selected = self._weights > 0
+        return (_BYTES_HEADER.pack(b'W', _BYTES_VERSION) +
+                _mask_to_bytes(_get_array_mask(selected)) +
+                self._weights[selected].astype('<f8').tobytes())
+
+    def _set_weights(self, weights):
+        weights.flags.writeable = False
+        self._weights = weights
+
+    def __eq__(self, other):
+        if self.__class__ is other.__class__:
+            return np.array_equal(self._weights, other._weights)
+        return NotImplemented
+
+    def __ne__(self, other):
+        if self.__class__ is other.__class__:
+            return not np.array_equal(self._weights, other._weights)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self._weights.tobytes())
+
+    def __contains__(self, item):
+        return self[item] > 0
+
+    def __getitem__(self, item):
+        """Weight of a Combo or the average weight of the combos of a Hand."""
+        if isinstance(item, unicode):
+            item = Combo(item) if len(item) == 4 else Hand(item)
+
+        if isinstance(item, Combo):
+            return self._weights[item.index]
+        elif isinstance(item, Hand):
+            return self.hand_weights[item.index]
+        raise TypeError('Should be a Combo, Hand or str, not %r' % (item,))
+
+    def __len__(self):
+        """Number of combos with any weight."""
+        return int(np.count_nonzero(self._weights))
+
+    def __unicode__(self):
+        return ', '.join(self.rep_pieces)
+
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+
+    def __repr__(self):
+        range = ' '.join(self.rep_pieces)
+        return "{}('{}')".format(self.__class__.__name__, range).encode('utf-8')
+
+    def __getstate__(self):
+        return self.to_bytes()
+
+    def __setstate__(self, state):
+        self._set_weights(self.from_bytes(state)._weights)
+
+    @property
+    def weights(self):
+        """Read-only array of the 1326 combo weights, the nth is the weight of the Combo with
+        index n.
+        """
+        return self._weights
+
+    @cached_property
+    def hand_weights(self):
+        """Read-only array of the 169 average hand weights in :class:`Hand` index order."""
+        hand_weights = np.bincount(_COMBO_HANDS, self._weights) / np.bincount(_COMBO_HANDS)
+        hand_weights.flags.writeable = False
+        return hand_weights
+
+    @cached_property
+    def combos(self):
+        """Tuple of combos with any weight in ascending order."""
+        return self.to_range().combos
+
+    @cached_property
+    def hands(self):
+        """Tuple of hands with any weight in ascending order."""
+        return self.to_range().hands
 
     @cached_property
-    def _all_hands(self):
-        combo_hands = {combo.to_hand() for combo in self._combos}
-        return combo_hands | self._hands
+    def combo_count(self):
+        """Weighted number of combos, the sum of the weights."""
+        return float(self._weights.sum())
+
+    @cached_property
+    def percent(self):
+        """Weighted percent of all the possible combos with 2 decimal point precision."""
+        return round(self.combo_count / len(Combo._all_combos) * 100, 2)
+
+    @cached_property
+    def rep_pieces(self):
+        """List of str pieces how the range is represented, the pieces of the same weight are
+        shortened like :attr:`Range.rep_pieces`, full weights first, then in decreasing order.
+        """
+        pieces = []
+        for weight in np.unique(self._weights[self._weights > 0])[::-1].tolist():
+            weight_range = Range._from_mask(_get_array_mask(self._weights == weight))
+            weight_text = '' if weight == 1 else ':{:g}'.format(weight)
+            pieces.extend(piece + weight_text for piece in weight_range.rep_pieces)
+        return pieces
+
+    def to_range(self):
+        """Converts to :class:`Range` of the combos with any weight."""
+        return Range._from_mask(_get_array_mask(self._weights > 0))
+
+    def to_html(self):
+        """Returns a 13x13 HTML table like :meth:`Range.to_html`, hands which are not full weight
+        are followed by their average weight, e.g. ``AKs:0.50``.
+        """
+        return _render_html(_get_grid_texts(self.to_grid(), _get_weighted_hand_text))
+
+    def to_ascii(self, border=False):
+        """Returns a nicely formatted ASCII table with optional borders, hands which are not full
+        weight are followed by their average weight, e.g. ``AKs:0.50``.
+        """
+        return _render_ascii(_get_grid_texts(self.to_grid(), _get_weighted_hand_text), 9, border)
+
+    def to_grid(self):
+        """13x13 array of the average weights of the hands in the layout of
+        :meth:`Range.to_grid`.
+        """
+        return self.hand_weights[_GRID_INDEXES]
 
 
 if __name__ == '__main__':
+    import timeit
     import cProfile
     print('_all_COMBOS')
     cProfile.run("Range('XX')._all_combos", sort='tottime')
@@ -890,3 +1404,8 @@ if __name__ == '__main__':
     cProfile.run("Range('%s').combos" % r, sort='tottime')
     print('R HANDS')
     cProfile.run("Range('%s').hands" % r, sort='tottime')
+    print('R PARSE COLD, token masks cleared (usec)')
+    print(min(timeit.repeat("Range._token_masks.clear(); Range(%r)" % r,
+                            'from poker.hand import Range', number=1000)) * 1000)
+    print('R PARSE WARM (usec)')
+    print(min(timeit.repeat("Range(%r)" % r, 'from poker.hand import Range', number=1000)) * 1000)
@@ -6,13 +6,12 @@ from __future__ import unicode_literals, absolute_import, division, print_functi
 """
 
 import io
-import itertools
 from datetime import datetime
 import attr
 import pytz
 from zope.interface import Interface, Attribute
 from cached_property import cached_property
-from .card import Rank
+from .board import Board
 from .constants import Position
 
 @attr.s(slots=True)
@@ -97,35 +96,40 @@ class _BaseStreet(object):
         self.cards = None
         self._parse_cards(unicode(flop[0]))
         self._parse_actions(flop[1:])
-        self._all_combinations = itertools.combinations(self.cards, 2)
 
     @cached_property
+    def _board(self):
+        return Board(self.cards)
+
+    # the flop textures are looked up from the precomputed table by the Board
+
+    @property
     def is_rainbow(self):
-        return all(first.suit != second.suit for first, second in self._all_combinations)
+        return self._board.is_rainbow
 
-    @cached_property
+    @property
     def is_monotone(self):
-        return all(first.suit == second.suit for first, second in self._all_combinations)
+        return self._board.is_monotone
 
-    @cached_property
+    @property
     def is_triplet(self):
-        return all(first.rank == second.rank for first, second in self._all_combinations)
+        return self._board.is_triplet
 
-    @cached_property
+    @property
     def has_pair(self):
-        return any(first.rank == second.rank for first, second in self._all_combinations)
+        return self._board.has_pair
 
-    @cached_property
+    @property
     def has_straightdraw(self):
-        return any(1 <= diff <= 3 for diff in self._get_differences())
+        return self._board.has_straightdraw
 
-    @cached_property
+    @property
     def has_gutshot(self):
-        return any(1 <= diff <= 4 for diff in self._get_differences())
+        return self._board.has_gutshot
 
-    @cached_property
+    @property
     def has_flushdraw(self):
-        return any(first.suit == second.suit for first, second in self._all_combinations)
+        return self._board.has_flushdraw
 
     @cached_property
     def players(self):
@@ -138,10 +142,6 @@ class _BaseStreet(object):
                 player_names.append(player_name)
         return tuple(player_names)
 
-    def _get_differences(self):
-        return (Rank.difference(first.rank, second.rank)
-                for first, second in self._all_combinations)
-
 
 class _BaseHandHistory(object):
     """Abstract base class for *all* kinds of parser."""
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, absolute_import, division, print_function
+
+"""
+    What a range hits on a board: the number of combos making every hand category and having
+    every kind of draw, like the Flopzilla breakdown.
+"""
+
+from collections import OrderedDict
+import numpy as np
+from ._common import PokerEnum
+from .combination import CombinationGroup
+from .hand import Range, _LRUCache, _get_mask_array
+from .board import Board, _COMBO_CARDS
+from .evaluator import evaluate_many
+
+
+__all__ = ['Draw', 'HitDistribution', 'hit_distribution']
+
+
+class Draw(PokerEnum):
+    __order__ = 'FLUSH_DRAW OESD GUTSHOT OVERCARDS'
+
+    FLUSH_DRAW = 'flush draw',
+    OESD = 'open-ended straight draw', 'oesd'
+    GUTSHOT = 'gutshot',
+    OVERCARDS = 'overcards',
+
+
+_GROUPS = tuple(CombinationGroup)
+_DRAWS = tuple(Draw)
+_STRAIGHT = _GROUPS.index(CombinationGroup.STRAIGHT)
+_FLUSH = _GROUPS.index(CombinationGroup.FLUSH)
+
+
+def _make_straight_masks():
+    """True for the 13 bit rank masks containing a straight, the Ace can be low too."""
+    masks = np.arange(1 << 13)
+    has_straight = np.zeros(1 << 13, dtype=bool)
+    for high in range(4, 13):
+        straight = 0b11111 << (high - 4)
+        has_straight |= masks & straight == straight
+    wheel = 0b1000000001111
+    return has_straight | (masks & wheel == wheel)
+
+
+_HAS_STRAIGHT = _make_straight_masks()
+
+_cache = _LRUCache(maxsize=1024)
+
+
+class HitDistribution(object):
+    """Number of combos of a range making every :class:`poker.combination.CombinationGroup`
+    and having every :class:`Draw` on a board, without the combos containing a board card.
+    A combo can have more than one draw. Index it with a CombinationGroup or a Draw.
+
+    Instances are shared between calls, they can't be modified.
+    """
+    __slots__ = ('combo_count', '_made_counts', '_draw_counts')
+
+    def __init__(self, combo_count, made_counts, draw_counts):
+        self.combo_count = combo_count
+        self._made_counts = tuple(made_counts)
+        self._draw_counts = tuple(draw_counts)
+
+    def __getitem__(self, category):
+        if isinstance(category, CombinationGroup):
+            return self._made_counts[_GROUPS.index(category)]
+        elif isinstance(category, Draw):
+            return self._draw_counts[_DRAWS.index(category)]
+        raise TypeError('Should be a CombinationGroup or Draw, not %r' % (category,))
+
+    def __repr__(self):
+        return '<{}: {} combos>'.format(self.__class__.__name__, self.combo_count).encode('utf-8')
+
+    @property
+    def made_hands(self):
+        """OrderedDict of the number of combos making every CombinationGroup, from the worst."""
+        return OrderedDict(zip(_GROUPS, self._made_counts))
+
+    @property
+    def draws(self):
+        """OrderedDict of the number of combos having every Draw."""
+        return OrderedDict(zip(_DRAWS, self._draw_counts))
+
+    def percent(self, category):
+        """Percent of the combos in a category with 2 decimal point precision."""
+        if not self.combo_count:
+            return 0.0
+        return round(self[category] / self.combo_count * 100, 2)
+
+
+def hit_distribution(range, board):
+    """Calculates what the range hits on the board. Every combo is evaluated in one batch.
+
+    Results are cached per suit isomorphism class of the board and the range, so the same
+    spot with the suits renamed is calculated only once.
+
+    Draws are only counted on the flop and the turn, when the hand is not already better: flush
+    draws are 4 cards of a suit with at least one hole card, straight draws need a hole card
+    for the straight. Open-ended straight draws include double gutshots. Overcards are high
+    card hands with both hole cards higher than every board card.
+
+    :param range:  :class:`poker.hand.Range` or range string
+    :param board:  :class:`poker.board.Board` or 3-5 cards
+    """
+    range = range if isinstance(range, Range) else Range.from_cache(range)
+    board = board if isinstance(board, Board) else Board(board)
+    canonical_board = board.canonical_board
+    canonical_range = board.to_canonical(range)
+    key = canonical_board.cards, canonical_range._mask
+    return _cache.get(key, lambda: _calculate(canonical_range, canonical_board))
+
+
+def _calculate(range, board):
+    board_indexes = np.array([card.index for card in board.cards], dtype=np.int64)
+    selected = _get_mask_array(range.without_cards(board.cards)._mask)
+    holes = _COMBO_CARDS[selected]
+    groups = evaluate_many(np.hstack((np.tile(board_indexes, (len(holes), 1)), holes)))[1]
+    made_counts = np.bincount(groups, minlength=len(_GROUPS)).tolist()
+
+    board_ranks = board_indexes >> 2
+    hole_ranks = holes >> 2
+    overcards = (groups == 0) & (hole_ranks.min(axis=1) > board_ranks.max())
+
+    if len(board.cards) == 5:
+        flush_draws = straight_draws = np.zeros(len(holes), dtype=int)
+    else:
+        # suit counts of the board and the hole cards, the flush suit needs a hole card
+        suits = np.arange(4)
+        hole_suits = (holes[:, :, np.newaxis] & 3) == suits
+        suit_counts = (board_indexes[:, np.newaxis] & 3 == suits).sum(axis=0) + \
+            hole_suits.sum(axis=1)
+        flush_draws = ((suit_counts == 4) & hole_suits.any(axis=1)).any(axis=1) & \
+            (groups < _FLUSH)
+
+        # ranks completing a straight which can't be made from the board alone
+        board_mask = np.bitwise_or.reduce(1 << board_ranks)
+        masks = board_mask | (1 << hole_ranks[:, 0]) | (1 << hole_ranks[:, 1])
+        rank_bits = 1 << np.arange(13)
+        outs = _HAS_STRAIGHT[masks[:, np.newaxis] | rank_bits] & \
+            ~_HAS_STRAIGHT[board_mask | rank_bits]
+        straight_draws = np.where(groups < _STRAIGHT, outs.sum(axis=1), 0)
+
+    draw_counts = [int(np.count_nonzero(flush_draws)), int(np.count_nonzero(straight_draws >= 2)),
+                   int(np.count_nonzero(straight_draws == 1)), int(np.count_nonzero(overcards))]
+    return HitDistribution(len(holes), made_counts, draw_counts)
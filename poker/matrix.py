@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, absolute_import, division, print_function
+
+"""
+    Many ranges stacked into one NumPy array for bulk operations.
+"""
+
+import numpy as np
+from .card import Card
+from .hand import (Hand, Combo, Range, _CARD_MASKS, _COMBO_HANDS, _GRID_INDEXES, _get_mask_array,
+                   _get_array_mask, _get_grid_texts, _get_hand_text, _render_html, _render_ascii)
+
+
+__all__ = ['RangeMatrix']
+
+
+_COMBO_NUM = len(Combo._all_combos)
+
+# (52, 1326) array, row n is True for the combos containing the Card with index n
+_CARD_COMBOS = np.array([_get_mask_array(mask) for mask in _CARD_MASKS])
+
+# (1326, 169) array, row n has a 1 in the column of the Hand index of the Combo with index n
+_COMBO_HAND_MATRIX = np.zeros((_COMBO_NUM, len(Hand._all_hands)), dtype=np.int32)
+_COMBO_HAND_MATRIX[np.arange(_COMBO_NUM), _COMBO_HANDS] = 1
+
+
+class RangeMatrix(object):
+    """Ranges as an (N, 1326) boolean array, row n is the nth range, column m is the Combo with
+    index m. Every operation works on all the rows at once.
+
+    The ``|``, ``&``, ``-`` and ``^`` operators work row by row with another RangeMatrix of the
+    same size or with one Range for every row, and make a new RangeMatrix.
+    """
+
+    def __init__(self, ranges=()):
+        rows = [_get_mask_array(self._get_range(range)._mask) for range in ranges]
+        self._set_array(np.array(rows, dtype=bool).reshape(len(rows), _COMBO_NUM))
+
+    @staticmethod
+    def _get_range(range):
+        # missing positions in a Strategy are None
+        if range is None:
+            return Range()
+        return range if isinstance(range, Range) else Range.from_cache(range)
+
+    @classmethod
+    def from_array(cls, array):
+        """Makes an instance from an (N, 1326) boolean array like :attr:`array`."""
+        array = np.array(array, dtype=bool)
+        if array.ndim != 2 or array.shape[1] != _COMBO_NUM:
+            raise ValueError('Should be an (N, 1326) shaped array, not %r' % (array.shape,))
+        self = object.__new__(cls)
+        self._set_array(array)
+        return self
+
+    def _set_array(self, array):
+        array.flags.writeable = False
+        self._array = array
+
+    @property
+    def array(self):
+        """Read-only (N, 1326) boolean array, True where the combo is in the range."""
+        return self._array
+
+    def __len__(self):
+        return len(self._array)
+
+    def __getitem__(self, index):
+        """Range of one row or a RangeMatrix of the selected rows for slices and index arrays."""
+        if isinstance(index, (int, long, np.integer)):
+            return Range._from_mask(_get_array_mask(self._array[index]))
+        return self.from_array(self._array[index])
+
+    def __iter__(self):
+        return iter(self.to_ranges())
+
+    def __eq__(self, other):
+        if self.__class__ is other.__class__:
+            return np.array_equal(self._array, other._array)
+        return NotImplemented
+
+    def __ne__(self, other):
+        if self.__class__ is other.__class__:
+            return not np.array_equal(self._array, other._array)
+        return NotImplemented
+
+    def __repr__(self):
+        return '<{}: {} ranges>'.format(self.__class__.__name__, len(self)).encode('utf-8')
+
+    def _get_other_array(self, other):
+        if isinstance(other, Range):
+            return _get_mask_array(other._mask)
+        elif self.__class__ is other.__class__:
+            if len(other) != len(self):
+                raise ValueError('Different number of ranges: %d and %d' % (len(self), len(other)))
+            return other._array
+        return None
+
+    def __or__(self, other):
+        other_array = self._get_other_array(other)
+        if other_array is None:
+            return NotImplemented
+        return self.from_array(self._array | other_array)
+
+    def __and__(self, other):
+        other_array = self._get_other_array(other)
+        if other_array is None:
+            return NotImplemented
+        return self.from_array(self._array & other_array)
+
+    def __sub__(self, other):
+        other_array = self._get_other_array(other)
+        if other_array is None:
+            return NotImplemented
+        return self.from_array(self._array & ~other_array)
+
+    def __xor__(self, other):
+        other_array = self._get_other_array(other)
+        if other_array is None:
+            return NotImplemented
+        return self.from_array(self._array ^ other_array)
+
+    def to_ranges(self):
+        """List of the rows as :class:`poker.hand.Range` instances."""
+        return [Range._from_mask(_get_array_mask(row)) for row in self._array]
+
+    def union(self):
+        """Range of the combos which are in any of the rows."""
+        return Range._from_mask(_get_array_mask(self._array.any(axis=0)))
+
+    def intersection(self):
+        """Range of the combos which are in every row, empty when there are no rows."""
+        if not len(self._array):
+            return Range()
+        return Range._from_mask(_get_array_mask(self._array.all(axis=0)))
+
+    def without_cards(self, cards):
+        """New RangeMatrix without the combos containing any of the cards in every row."""
+        indexes = [Card(card).index for card in cards]
+        return self.from_array(self._array & ~_CARD_COMBOS[indexes].any(axis=0))
+
+    def combo_counts(self):
+        """(N,) array of the number of combos in every row."""
+        return self._array.sum(axis=1)
+
+    def percents(self):
+        """(N,) array of the percent of all the possible combos in every row like
+        :attr:`poker.hand.Range.percent`.
+        """
+        return np.round(self.combo_counts() / _COMBO_NUM * 100, 2)
+
+    def overlap(self, other=None):
+        """(N, M) array of the number of common combos of every row with every row of the other
+        RangeMatrix, or with every other row of this one.
+        """
+        other = self if other is None else other
+        return self._array.astype(np.int32).dot(other._array.T.astype(np.int32))
+
+    def jaccard(self, other=None):
+        """(N, M) array of the Jaccard similarity (common combos / combos in any of the two)
+        of every row with every row of the other RangeMatrix, or with every other row of this one.
+        Two empty ranges are the same, their similarity is 1.
+        """
+        other = self if other is None else other
+        common = self.overlap(other)
+        union = self.combo_counts()[:, np.newaxis] + other.combo_counts() - common
+        return np.where(union == 0, 1, common / np.maximum(union, 1))
+
+    def to_grids(self):
+        """(N, 13, 13) array of the number of combos of every hand in every row in the layout
+        of :meth:`poker.hand.Range.to_grid`.
+        """
+        return self._array.astype(np.int32).dot(_COMBO_HAND_MATRIX)[:, _GRID_INDEXES]
+
+    def to_html(self):
+        """List of the HTML tables of the rows, the same as :meth:`poker.hand.Range.to_html`."""
+        return [_render_html(_get_grid_texts(grid, _get_hand_text)) for grid in self.to_grids()]
+
+    def to_ascii(self, border=False):
+        """List of the ASCII tables of the rows, the same as :meth:`poker.hand.Range.to_ascii`.
+        """
+        return [_render_ascii(_get_grid_texts(grid, _get_hand_text), 4, border)
+                for grid in self.to_grids()]
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, absolute_import, division, print_function
+
+"""
+    Outs of combos on the flop and the turn: the next cards improving the hand to a better
+    :class:`poker.combination.CombinationGroup`.
+
+    Hands are not evaluated from their cards. The rank and suit keys of the evaluator tables are
+    sums, so the keys of every combo are precomputed once, the board is added to them, then every
+    possible next card is one more addition and one table lookup.
+"""
+
+from collections import OrderedDict
+import numpy as np
+from .card import Card
+from .hand import Combo, Range, _get_mask_array
+from .combination import CombinationGroup
+from .board import Board, _COMBO_CARDS
+from .sampler import _COMBO_CARD_MASKS
+from .evaluator import (_CARD_RANK_KEY_ARRAY, _CARD_SUIT_KEY_ARRAY, _STRENGTH_GROUP_ARRAY,
+                        _evaluate_keys)
+
+
+__all__ = ['Outs', 'get_outs', 'get_range_outs']
+
+
+_GROUPS = tuple(CombinationGroup)
+(_HIGH_CARD, _PAIR, _TWO_PAIR, _THREE_OF_A_KIND) = range(4)
+_FOUR_OF_A_KIND = _GROUPS.index(CombinationGroup.FOUR_OF_A_KIND)
+
+_CARD_INDEXES = np.arange(52)
+
+# (52, 4) rank masks of every suit with only the Card with index n
+_CARD_SUIT_MASKS = np.zeros((52, 4), dtype=np.int16)
+_CARD_SUIT_MASKS[_CARD_INDEXES, _CARD_INDEXES & 3] = 1 << (_CARD_INDEXES >> 2)
+
+# rank key, suit key and (4,) suit rank masks of every combo, ordered by combo index
+_COMBO_RANK_KEYS = _CARD_RANK_KEY_ARRAY[_COMBO_CARDS].sum(axis=1)
+_COMBO_SUIT_KEYS = _CARD_SUIT_KEY_ARRAY[_COMBO_CARDS].sum(axis=1)
+_COMBO_SUIT_MASKS = _CARD_SUIT_MASKS[_COMBO_CARDS[:, 0]] | _CARD_SUIT_MASKS[_COMBO_CARDS[:, 1]]
+
+# the best opponent combo which doesn't share a card with a hero combo is always in the best
+# 102 combos, at most 101 combos contain one of two cards
+_OPPONENT_TOP = 102
+
+
+class Outs(object):
+    """Cards improving a combo on a board, grouped by the
+    :class:`poker.combination.CombinationGroup` they make. Index it with a CombinationGroup
+    for the cards making it.
+    """
+    __slots__ = ('combo', 'board', '_groups')
+
+    def __init__(self, combo, board, groups):
+        self.combo = combo
+        self.board = board
+        self._groups = groups
+
+    def __getitem__(self, group):
+        if not isinstance(group, CombinationGroup):
+            raise TypeError('Should be a CombinationGroup, not %r' % (group,))
+        return self._groups.get(group, ())
+
+    def __len__(self):
+        return sum(len(cards) for cards in self._groups.values())
+
+    def __repr__(self):
+        return '<{}: {} on {}, {} outs>'.format(
+            self.__class__.__name__, self.combo, self.board, len(self)).encode('utf-8')
+
+    @property
+    def groups(self):
+        """OrderedDict of the out cards of every CombinationGroup which can be made,
+        from the worst.
+        """
+        return OrderedDict(self._groups)
+
+    @property
+    def cards(self):
+        """Tuple of all the out cards from the worst CombinationGroup, then the lowest card."""
+        return tuple(card for cards in self._groups.values() for card in cards)
+
+    def percent(self):
+        """Percent chance of hitting an out with the next card, from the cards not on the
+        board and not in the combo, with 2 decimal point precision.
+        """
+        unseen = 52 - len(self.board) - 2
+        return round(len(self) / unseen * 100, 2)
+
+
+def get_outs(combo, board, opponents=()):
+    """Calculates the outs of one combo.
+
+    Without opponents, an out is a card which makes a better CombinationGroup than the combo has
+    now and puts it further ahead of the group the board makes with that card alone. A card
+    which improves the board as much as the hand doesn't count: with AsKd on Kc7h2d, a 2 makes
+    two pair, but the board makes a pair too. With 7s7h on the same board, a 2 or a K makes a full
+    house from a set, which counts. With opponent ranges, the improved hand also has to win or
+    tie against every opponent combo which can still be dealt with the card.
+
+    :param combo:      :class:`poker.hand.Combo` or combo string
+    :param board:      :class:`poker.board.Board` or 3-4 cards
+    :param opponents:  range or list of ranges (:class:`poker.hand.Range` or range string)
+    :rtype:            :class:`Outs`
+    """
+    combo = Combo(combo)
+    board = _get_board(board)
+    if {combo.first, combo.second} & set(board.cards):
+        raise ValueError('%s shares a card with the board' % (combo,))
+    return _calculate(np.array([combo.index]), board, opponents)[0]
+
+
+def get_range_outs(range, board, opponents=()):
+    """Calculates the outs of every combo of a range like :func:`get_outs`, all in one batch.
+    Combos containing a board card are left out.
+
+    :param range:      :class:`poker.hand.Range` or range string
+    :param board:      :class:`poker.board.Board` or 3-4 cards
+    :param opponents:  range or list of ranges (:class:`poker.hand.Range` or range string)
+    :return:           :class:`Outs` of every combo in combo order
+    :rtype:            :class:`collections.OrderedDict`
+    """
+    range = range if isinstance(range, Range) else Range.from_cache(range)
+    board = _get_board(board)
+    combos = np.flatnonzero(_get_mask_array(range.without_cards(board.cards)._mask))
+    return OrderedDict((outs.combo, outs) for outs in _calculate(combos, board, opponents))
+
+
+def _get_board(board):
+    board = board if isinstance(board, Board) else Board(board)
+    if len(board) == 5:
+        raise ValueError('There are no outs on the river')
+    return board
+
+
+def _get_opponent_mask(opponents, board):
+    if isinstance(opponents, (Range, basestring)):
+        opponents = [opponents]
+    mask = 0
+    for range in opponents:
+        mask |= (range if isinstance(range, Range) else Range.from_cache(range))._mask
+    return Range._from_mask(mask).without_cards(board.cards)._mask
+
+
+def _get_strengths(combos, board_indexes):
+    """Strengths of the combos on the board as an (N,) array and with every possible next card
+    as an (N, 52) array, where column n is the next Card with index n.
+    The values are meaningless for the cards of the combos and the board.
+    """
+    rank_keys = _COMBO_RANK_KEYS[combos] + _CARD_RANK_KEY_ARRAY[board_indexes].sum()
+    suit_keys = _COMBO_SUIT_KEYS[combos] + _CARD_SUIT_KEY_ARRAY[board_indexes].sum()
+    suit_masks = _COMBO_SUIT_MASKS[combos] | np.bitwise_or.reduce(_CARD_SUIT_MASKS[board_indexes])
+    strengths = _evaluate_keys(rank_keys, suit_keys, suit_masks)
+    next_strengths = _evaluate_keys(rank_keys[:, np.newaxis] + _CARD_RANK_KEY_ARRAY,
+                                    suit_keys[:, np.newaxis] + _CARD_SUIT_KEY_ARRAY,
+                                    suit_masks[:, np.newaxis] | _CARD_SUIT_MASKS)
+    return strengths, next_strengths
+
+
+def _get_rank_count_groups(rank_counts):
+    """CombinationGroup codes of 3 or 4 cards from their (..., 13) rank counts,
+    they can't make a straight, a flush or a full house.
+    """
+    max_counts = rank_counts.max(axis=-1)
+    pair_counts = (rank_counts == 2).sum(axis=-1)
+    return np.select([max_counts == 4, max_counts == 3, pair_counts == 2, pair_counts == 1],
+                     [_FOUR_OF_A_KIND, _THREE_OF_A_KIND, _TWO_PAIR, _PAIR], _HIGH_CARD)
+
+
+def _get_board_groups(board_indexes):
+    """CombinationGroup code of the board and (52,) array of the codes of the board with every
+    possible next card.
+    """
+    rank_counts = np.bincount(board_indexes >> 2, minlength=13)
+    group = int(_get_rank_count_groups(rank_counts))
+    if len(board_indexes) == 4:
+        rank_key = _CARD_RANK_KEY_ARRAY[board_indexes].sum()
+        suit_key = _CARD_SUIT_KEY_ARRAY[board_indexes].sum()
+        suit_mask = np.bitwise_or.reduce(_CARD_SUIT_MASKS[board_indexes])
+        strengths = _evaluate_keys(rank_key + _CARD_RANK_KEY_ARRAY,
+                                   suit_key + _CARD_SUIT_KEY_ARRAY, suit_mask | _CARD_SUIT_MASKS)
+        return group, _STRENGTH_GROUP_ARRAY[strengths]
+
+    next_rank_counts = rank_counts + (_CARD_INDEXES[:, np.newaxis] >> 2 == np.arange(13))
+    return group, _get_rank_count_groups(next_rank_counts)
+
+
+def _get_best_opponents(mask, board_indexes, combos):
+    """(N, 52) array of the strength of the best opponent combo against every combo with
+    every next card, -1 when no opponent combo can be dealt.
+    """
+    opponents = np.flatnonzero(_get_mask_array(mask))
+    if not opponents.size:
+        return np.full((len(combos), 52), -1, dtype=np.int16)
+
+    __, strengths = _get_strengths(opponents, board_indexes)
+    card_masks = _COMBO_CARD_MASKS[opponents]
+    strengths[(card_masks[:, np.newaxis] >> _CARD_INDEXES) & 1 == 1] = -1
+    best = np.argsort(-strengths, axis=0, kind='mergesort')[:_OPPONENT_TOP]
+    best_strengths = strengths[best, _CARD_INDEXES]
+    best_masks = card_masks[best]
+
+    # (N, top, 52) True where the opponent combo doesn't share a card with the combo
+    free = (best_masks & _COMBO_CARD_MASKS[combos][:, np.newaxis, np.newaxis]) == 0
+    return np.where(free, best_strengths, -1).max(axis=1)
+
+
+def _calculate(combos, board, opponents):
+    board_indexes = np.array([card.index for card in board.cards], dtype=np.int64)
+    strengths, next_strengths = _get_strengths(combos, board_indexes)
+    groups = _STRENGTH_GROUP_ARRAY[strengths]
+    next_groups = _STRENGTH_GROUP_ARRAY[next_strengths]
+
+    dead_masks = _COMBO_CARD_MASKS[combos] | np.bitwise_or.reduce(1 << board_indexes)
+    board_group, next_board_groups = _get_board_groups(board_indexes)
+    # the hand has to get further ahead of the board, a card improving the board as much as the
+    # hand (e.g. pairing it when the hand has a pair) is not an out
+    is_out = ((dead_masks[:, np.newaxis] >> _CARD_INDEXES) & 1 == 0) & \
+        (next_groups > groups[:, np.newaxis]) & \
+        (next_groups - next_board_groups > (groups - board_group)[:, np.newaxis])
+
+    opponent_mask = _get_opponent_mask(opponents, board)
+    if opponent_mask:
+        is_out &= next_strengths >= _get_best_opponents(opponent_mask, board_indexes, combos)
+
+    all_outs = []
+    for combo_index, combo_is_out, combo_groups in zip(combos.tolist(), is_out, next_groups):
+        out_groups = OrderedDict()
+        for card_index in np.flatnonzero(combo_is_out).tolist():
+            group = _GROUPS[combo_groups[card_index]]
+            out_groups.setdefault(group, []).append(Card.from_int(card_index))
+        out_groups = OrderedDict((group, tuple(out_groups[group]))
+                                 for group in _GROUPS if group in out_groups)
+        all_outs.append(Outs(Combo._all_combos[combo_index], board, out_groups))
+    return all_outs
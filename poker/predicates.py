@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, absolute_import, division, print_function
+
+"""
+    Combo properties as precomputed combo masks for filtering ranges.
+
+    Predicates are combined with the ``&`` (and), ``|`` (or), ``^`` (xor), ``-`` (and not)
+    and ``~`` (not) operators, which are bit operations on the masks, e.g.
+    ``range.filter(suited & connector & ~broadway)``.
+"""
+
+from .card import Rank, Card
+from .hand import Combo, _FULL_MASK, _CARD_MASKS
+
+
+__all__ = ['Predicate', 'pair', 'suited', 'offsuit', 'connector', 'one_gapper', 'two_gapper',
+           'suited_connector', 'broadway', 'rank_difference', 'has_rank', 'has_card']
+
+
+class Predicate(object):
+    """Set of the combos having a property, stored as a 1326 bit combo mask like
+    :class:`poker.hand.Range`. Can be called with a Combo.
+    """
+    __slots__ = ('_name', '_mask')
+
+    def __init__(self, name, function):
+        self._name = name
+        self._mask = sum(1 << combo.index for combo in Combo if function(combo))
+
+    @classmethod
+    def _from_mask(cls, name, mask):
+        self = object.__new__(cls)
+        self._name = name
+        self._mask = mask
+        return self
+
+    def __call__(self, combo):
+        return bool(self._mask >> Combo(combo).index & 1)
+
+    def __eq__(self, other):
+        if self.__class__ is other.__class__:
+            return self._mask == other._mask
+        return NotImplemented
+
+    def __ne__(self, other):
+        if self.__class__ is other.__class__:
+            return self._mask != other._mask
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self._mask)
+
+    def __repr__(self):
+        return '<{}: {}>'.format(self.__class__.__name__, self._name).encode('utf-8')
+
+    def __and__(self, other):
+        if self.__class__ is other.__class__:
+            return self._from_mask('({} & {})'.format(self._name, other._name),
+                                   self._mask & other._mask)
+        return NotImplemented
+
+    def __or__(self, other):
+        if self.__class__ is other.__class__:
+            return self._from_mask('({} | {})'.format(self._name, other._name),
+                                   self._mask | other._mask)
+        return NotImplemented
+
+    def __xor__(self, other):
+        if self.__class__ is other.__class__:
+            return self._from_mask('({} ^ {})'.format(self._name, other._name),
+                                   self._mask ^ other._mask)
+        return NotImplemented
+
+    def __sub__(self, other):
+        if self.__class__ is other.__class__:
+            return self._from_mask('({} - {})'.format(self._name, other._name),
+                                   self._mask & ~other._mask)
+        return NotImplemented
+
+    def __invert__(self):
+        return self._from_mask('~' + self._name, _FULL_MASK & ~self._mask)
+
+
+pair = Predicate('pair', lambda combo: combo.is_pair)
+suited = Predicate('suited', lambda combo: combo.is_suited)
+offsuit = Predicate('offsuit', lambda combo: combo.is_offsuit)
+connector = Predicate('connector', lambda combo: combo.is_connector)
+one_gapper = Predicate('one_gapper', lambda combo: combo.is_one_gapper)
+two_gapper = Predicate('two_gapper', lambda combo: combo.is_two_gapper)
+suited_connector = Predicate('suited_connector', lambda combo: combo.is_suited_connector)
+broadway = Predicate('broadway', lambda combo: combo.is_broadway)
+
+_RANK_DIFFERENCES = tuple(Predicate('rank_difference({})'.format(difference),
+                                    lambda combo, difference=difference:
+                                    combo.rank_difference == difference)
+                          for difference in range(len(Rank)))
+
+_RANKS = {rank: Predicate("has_rank('{}')".format(rank),
+                          lambda combo, rank=rank: rank in (combo.first.rank, combo.second.rank))
+          for rank in Rank}
+
+
+def rank_difference(difference):
+    """Combos where the difference between the two ranks is ``difference``, 0 for pairs."""
+    if not 0 <= difference < len(_RANK_DIFFERENCES):
+        raise ValueError('Rank difference should be between 0 and 12, not %r' % (difference,))
+    return _RANK_DIFFERENCES[difference]
+
+
+def has_rank(rank):
+    """Combos with at least one card of the rank."""
+    return _RANKS[Rank(rank)]
+
+
+def has_card(card):
+    """Combos containing the card."""
+    card = Card(card)
+    return Predicate._from_mask("has_card('{}')".format(card), _CARD_MASKS[card.index])
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, absolute_import, division, print_function
+
+"""
+    Precomputed preflop all-in equities.
+
+    The table file holds the equity of every combo against every other combo as a 1326x1326
+    little endian uint16 matrix after a short header. Rows and columns are :attr:`Combo.index`
+    values: ``higher_card.index * (higher_card.index - 1) // 2 + lower_card.index``.
+    The file is memory-mapped, so processes using the same table share the page cache.
+"""
+
+import os
+import struct
+import itertools
+import numpy as np
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from .hand import Hand, Combo, Range
+from .evaluator import evaluate_many
+
+
+__all__ = ['PreflopEquity', 'generate_table', 'DEFAULT_TABLE']
+
+
+DEFAULT_TABLE = (Path(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')) /
+                 'poker' / 'preflop_equity.bin')
+"""The table file used when no filename is given, in the user's cache directory:
+``$XDG_CACHE_HOME/poker/preflop_equity.bin`` or ``~/.cache/poker/preflop_equity.bin``.
+"""
+
+_HEADER = struct.Struct(b'<4sI')
+_MAGIC = b'PFEQ'
+_VERSION = 1
+
+# value for pairs of combos sharing a card, equities are stored scaled to 0-_SCALE
+_COLLIDING = 65535
+_SCALE = 65534
+
+# maximum number of simulated showdowns in one generator chunk
+_CHUNK_ROWS = 2 ** 18
+
+# (1326, 2) card indexes of every combo, higher card first, ordered by combo index
+_COMBO_CARDS = np.array([(combo.first.index, combo.second.index) for combo in Combo],
+                        dtype=np.int8)
+
+
+def _get_combo_classes():
+    """Suit isomorphism classes of every non-colliding pair of combos.
+
+    Returns the (C, 2) array of the representative combo pairs of the classes and for every
+    (row < column) combo pair: its row, column, class and whether the representative is flipped
+    (the equity of the representative is the equity of the column combo).
+    """
+    rows, columns = np.triu_indices(len(_COMBO_CARDS), 1)
+    cards = np.hstack((_COMBO_CARDS[rows], _COMBO_CARDS[columns]))
+    sorted_cards = np.sort(cards, axis=1)
+    not_colliding = (sorted_cards[:, 1:] != sorted_cards[:, :-1]).all(axis=1)
+    rows, columns, cards = rows[not_colliding], columns[not_colliding], cards[not_colliding]
+
+    best_keys = best_flipped = None
+    for suits in itertools.permutations(range(4)):
+        permuted = cards & ~3 | np.array(suits)[cards & 3]
+        first = _get_indexes(permuted[:, :2])
+        second = _get_indexes(permuted[:, 2:])
+        flipped = first > second
+        keys = np.minimum(first, second) * len(_COMBO_CARDS) + np.maximum(first, second)
+        if best_keys is None:
+            best_keys, best_flipped = keys, flipped
+        else:
+            better = keys < best_keys
+            best_keys = np.where(better, keys, best_keys)
+            best_flipped = np.where(better, flipped, best_flipped)
+
+    class_keys, classes = np.unique(best_keys, return_inverse=True)
+    representatives = np.column_stack(np.divmod(class_keys, len(_COMBO_CARDS)))
+    return representatives, rows, columns, classes, best_flipped
+
+
+def _get_indexes(card_pairs):
+    high, low = card_pairs.max(axis=1).astype(np.int64), card_pairs.min(axis=1)
+    return high * (high - 1) // 2 + low
+
+
+def _simulate_classes(representatives, samples, seed):
+    """Equity of the first combo against the second in every representative pair
+    from ``samples`` random boards."""
+    rng = np.random.RandomState(seed)
+    rows = len(representatives) * samples
+    holes = np.repeat(np.hstack((_COMBO_CARDS[representatives[:, 0]],
+                                 _COMBO_CARDS[representatives[:, 1]])), samples, axis=0)
+    deck_keys = rng.random_sample((rows, 52)).astype(np.float32)
+    deck_keys[np.arange(rows)[:, np.newaxis], holes] = 2
+    boards = np.argpartition(deck_keys, 4, axis=1)[:, :5]
+    first = evaluate_many(np.hstack((boards, holes[:, :2])))[0]
+    second = evaluate_many(np.hstack((boards, holes[:, 2:])))[0]
+    points = (first > second) + (first == second) / 2
+    return points.reshape(-1, samples).mean(axis=1)
+
+
+def generate_table(filename=None, samples=20000, workers=None, seed=0):
+    """Calculates the preflop equity of every combo against every other combo from ``samples``
+    random boards per suit isomorphism class and writes the table file, creating the missing
+    directories. The same seed gives the same table with any number of workers.
+
+    Every equity is a Monte Carlo estimate, its standard error is at most
+    ``0.5 / sqrt(samples)``: 0.0035 with the default 20000 samples, so about 1 in 20 combo pairs
+    is more than 0.007 off. Suit isomorphic combo pairs share the same estimate, so their errors
+    are the same, Hand and Range equities average many classes, so they are more precise.
+    The uint16 storage adds at most 0.00001.
+    """
+    representatives, rows, columns, classes, flipped = _get_combo_classes()
+
+    per_chunk = max(1, _CHUNK_ROWS // samples)
+    chunks = [representatives[start:start + per_chunk]
+              for start in range(0, len(representatives), per_chunk)]
+    args = chunks, [samples] * len(chunks), [[seed, chunk] for chunk in range(len(chunks))]
+    if workers == 1:
+        results = list(map(_simulate_classes, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_simulate_classes, *args))
+    class_equities = np.concatenate(results)
+
+    equities = np.where(flipped, 1 - class_equities[classes], class_equities[classes])
+    table = np.full((len(_COMBO_CARDS), len(_COMBO_CARDS)), _COLLIDING, dtype='<u2')
+    table[rows, columns] = np.round(equities * _SCALE)
+    table[columns, rows] = _SCALE - table[rows, columns]
+
+    filename = Path(filename) if filename is not None else DEFAULT_TABLE
+    if not filename.parent.exists():
+        filename.parent.mkdir(parents=True)
+    with filename.open('wb') as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION))
+        f.write(table.tobytes())
+
+
+class PreflopEquity(object):
+    """All-in preflop equities looked up from a precomputed table file."""
+
+    def __init__(self, filename=None):
+        filename = Path(filename) if filename is not None else DEFAULT_TABLE
+        if not filename.exists():
+            raise IOError('Preflop equity table %s not found, generate it with '
+                          '"poker preflop-table"' % filename)
+
+        with filename.open('rb') as f:
+            magic, version = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError('%s is not a version %d preflop equity table' % (filename, _VERSION))
+
+        self._table = np.memmap(unicode(filename), dtype='<u2', mode='r', offset=_HEADER.size,
+                                shape=(len(_COMBO_CARDS), len(_COMBO_CARDS)))
+        self._hand_table = None
+
+    def hand_table(self):
+        """169x169 matrix of Hand vs. Hand equities, rows and columns are in ``list(Hand)``
+        order. Calculated from the combo table once per instance.
+        """
+        if self._hand_table is None:
+            combo_hands = np.zeros((len(_COMBO_CARDS), len(Hand._all_hands)))
+            for hand_index, hand in enumerate(Hand):
+                combo_hands[[combo.index for combo in hand.to_combos()],
+                            hand_index] = 1
+            valid = self._table != _COLLIDING
+            equities = np.where(valid, self._table / _SCALE, 0)
+            self._hand_table = (combo_hands.T.dot(equities).dot(combo_hands) /
+                                combo_hands.T.dot(valid).dot(combo_hands))
+        return self._hand_table
+
+    def combo_equity(self, first, second):
+        """Equity of the first Combo against the second."""
+        value = self._table[Combo(first).index, Combo(second).index]
+        if value == _COLLIDING:
+            raise ValueError('{} and {} have a common card'.format(first, second))
+        return value / _SCALE
+
+    def hand_equity(self, first, second):
+        """Equity of the first Hand against the second, averaged over their non-colliding combos.
+        """
+        return self._get_equity([combo.index for combo in Hand(first).to_combos()],
+                                [combo.index for combo in Hand(second).to_combos()])
+
+    def range_equity(self, first, second):
+        """Equity of the first Range against the second, every non-colliding pair of combos
+        has the same weight.
+        """
+        first = first if isinstance(first, Range) else Range(first)
+        second = second if isinstance(second, Range) else Range(second)
+        return self._get_equity([combo.index for combo in first.combos],
+                                [combo.index for combo in second.combos])
+
+    def _get_equity(self, first_indexes, second_indexes):
+        values = self._table[np.ix_(first_indexes, second_indexes)]
+        valid = values != _COLLIDING
+        if not valid.any():
+            raise ValueError('Every combo pair has a common card')
+        return values[valid].sum(dtype=np.int64) / _SCALE / valid.sum()
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, absolute_import, division, print_function
+
+"""
+    Vectorized random combo sampling from ranges with Walker's alias method.
+"""
+
+import numpy as np
+from .card import Card
+from .hand import Combo, Range, WeightedRange, _get_mask_array
+
+
+__all__ = ['ComboSampler']
+
+
+# maximum number of rounds redrawing the combos which collide with the dead cards of their row
+_MAX_DRAWS = 1000
+
+# (1326, 2) card indexes of every combo, higher card first, ordered by combo index
+_COMBO_CARDS = np.array([(combo.first.index, combo.second.index) for combo in Combo],
+                        dtype=np.int8)
+
+# 52 bit card mask of every combo
+_COMBO_CARD_MASKS = np.left_shift(1, _COMBO_CARDS.astype(np.int64)).sum(axis=1)
+
+
+def _get_weights(range):
+    if isinstance(range, WeightedRange):
+        return range.weights
+    range = range if isinstance(range, Range) else Range.from_cache(range)
+    return _get_mask_array(range._mask).astype(float)
+
+
+def _get_dead_masks(dead, size):
+    """(size,) array of card masks from an (size, K) array of card indexes."""
+    dead = np.asarray(dead, dtype=np.int64).reshape(len(dead), -1)
+    if len(dead) != size:
+        raise ValueError('Should be dead cards for %d rows, not %d' % (size, len(dead)))
+    return np.left_shift(1, dead).sum(axis=1)
+
+
+def _make_alias_table(probabilities):
+    """Probability and alias of every column of Vose's alias table."""
+    count = len(probabilities)
+    scaled = probabilities * count
+    aliases = np.arange(count)
+    small = np.flatnonzero(scaled < 1).tolist()
+    large = np.flatnonzero(scaled >= 1).tolist()
+    while small and large:
+        less, more = small.pop(), large.pop()
+        aliases[less] = more
+        scaled[more] -= 1 - scaled[less]
+        (small if scaled[more] < 1 else large).append(more)
+    # the rest are 1 except for rounding errors
+    scaled[small + large] = 1
+    return scaled, aliases
+
+
+class ComboSampler(object):
+    """Draws random combos from a range in batches, every combo with the probability of its
+    weight. Combos containing any of the dead cards are removed and the rest renormalized.
+    The alias table is built once, then every draw is two random numbers per combo.
+
+    :param range:       :class:`poker.hand.Range`, :class:`poker.hand.WeightedRange`
+                        or range string
+    :param dead_cards:  cards which can't be drawn, e.g. the board or hero's cards
+    :param seed:        seed for reproducible draws or a :class:`numpy.random.RandomState`
+    """
+
+    def __init__(self, range, dead_cards=(), seed=None):
+        weights = _get_weights(range)
+        dead_mask = sum(1 << Card(card).index for card in dead_cards)
+        self._set_weights(np.where(_COMBO_CARD_MASKS & dead_mask, 0, weights))
+        self._random = seed if isinstance(seed, np.random.RandomState) else \
+            np.random.RandomState(seed)
+
+    def _set_weights(self, weights):
+        total = weights.sum()
+        if not total:
+            raise ValueError('No combos left to draw')
+        self._combos = np.flatnonzero(weights)
+        self._probabilities = weights / total
+        self._probabilities.flags.writeable = False
+        self._table = _make_alias_table(self._probabilities[self._combos])
+
+    @property
+    def probabilities(self):
+        """Read-only array of the 1326 combo probabilities, the nth is the probability of the
+        Combo with index n.
+        """
+        return self._probabilities
+
+    def without_cards(self, cards):
+        """New sampler without the combos containing any of the cards, the rest are
+        renormalized. The new sampler shares the random number generator.
+        """
+        weights = WeightedRange.from_weights(self._probabilities / self._probabilities.max())
+        return self.__class__(weights, cards, self._random)
+
+    def _draw(self, size):
+        columns = self._random.randint(len(self._combos), size=size)
+        probabilities, aliases = self._table
+        keep = self._random.random_sample(size) < probabilities[columns]
+        return self._combos[np.where(keep, columns, aliases[columns])]
+
+    def sample(self, size=None, dead=None):
+        """Draws combos and returns their :attr:`Combo.index` values.
+
+        :param int size:  number of combos, one int is returned when it's None
+        :param dead:      (size, K) array of :attr:`Card.index` values, a drawn combo containing
+                          any card of its row is redrawn (rejection), so the rows are independent
+                          draws from the range without their dead cards
+        :rtype:           (size,) :class:`numpy.ndarray` of ints
+        """
+        if size is None:
+            return int(self.sample(1, None if dead is None else [dead])[0])
+
+        indexes = self._draw(size)
+        if dead is None:
+            return indexes
+
+        dead_masks = _get_dead_masks(dead, size)
+        pending = np.flatnonzero(_COMBO_CARD_MASKS[indexes] & dead_masks)
+        for __ in range(_MAX_DRAWS):
+            if not pending.size:
+                return indexes
+            indexes[pending] = self._draw(pending.size)
+            pending = pending[(_COMBO_CARD_MASKS[indexes[pending]] & dead_masks[pending]) != 0]
+        raise ValueError('Could not draw combos, the range is (almost) always colliding')
+
+    def sample_cards(self, size=None, dead=None):
+        """Draws combos like :meth:`sample` and returns their cards as an (size, 2) array of
+        :attr:`Card.index` values, higher card first.
+        """
+        return _COMBO_CARDS[self.sample(size, dead)]
+
+    def sample_combos(self, size, dead=None):
+        """Draws combos like :meth:`sample` and returns them as a list of
+        :class:`poker.hand.Combo` instances.
+        """
+        return [Combo._all_combos[index] for index in self.sample(size, dead).tolist()]
@@ -50,7 +50,8 @@ class Strategy(Mapping):
                 if (not val) or (key not in _Situation.__slots__):
                     continue
                 elif key in _POSITIONS:
-                    values[key] = Range(val)
+                    # the same ranges are repeated in many situations
+                    values[key] = Range.from_cache(val)
                 else:
                     values[key] = val
             self._situations[name] = _Situation(**values)
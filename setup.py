@@ -16,6 +16,8 @@ install_requires = [
     'configparser',
     'zope.interface',
     'attrs',
+    'numpy',
+    'futures',  # backported concurrent.futures from Python3
 ]
 
 
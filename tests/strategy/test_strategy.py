@@ -87,3 +87,11 @@ def test_values():
 
 def test_get_first_position():
     assert strategy.get_first_spot().position == Position.UTG
+
+
+def test_repeated_ranges_are_shared():
+    Range.cache_clear()
+    strategy = Strategy.from_file(filedir / 'push.strategy')
+    assert strategy['11 BB'].sb is strategy['10 BB'].sb
+    assert strategy['12 BB'].utg is strategy['12 BB'].btn
+    assert Range.cache_info().hits > 0
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, absolute_import, division, print_function
+
+import itertools
+import pytest
+from poker.card import Rank, Card
+from poker.hand import Combo, Range, WeightedRange
+from poker.board import (Board, FLOP_TEXTURES, get_flop_id, get_canonical_boards,
+                         get_class_weights)
+from poker import handhistory as hh
+
+
+def test_flop_ids_are_unique_and_dense():
+    flop_ids = {get_flop_id(flop) for flop in itertools.combinations(Card, 3)}
+    assert flop_ids == set(range(22100))
+    assert len(FLOP_TEXTURES) == 22100
+
+
+def test_flop_id_does_not_depend_on_order():
+    assert get_flop_id(['As', 'Kd', '7h']) == get_flop_id(['7h', 'As', 'Kd'])
+    assert get_flop_id(['2c', '2d', '2h']) == 0
+    assert get_flop_id(['As', 'Ah', 'Ad']) == 22099
+
+
+def test_from_flop_id():
+    assert Board.from_flop_id(get_flop_id(['7h', 'As', 'Kd'])) == Board('AsKd7h')
+    with pytest.raises(ValueError):
+        Board.from_flop_id(22100)
+
+
+def test_textures_are_read_only():
+    with pytest.raises(ValueError):
+        FLOP_TEXTURES['has_pair'][0] = False
+
+
+@pytest.mark.parametrize('board, attribute, expected_value', [
+    ('7d3cJd', 'is_rainbow', False),
+    ('7d3cJh', 'is_rainbow', True),
+    ('7d3dJd', 'is_monotone', True),
+    ('7d3cJd', 'is_monotone', False),
+    ('7d7c7h', 'is_triplet', True),
+    ('7d7c8h', 'is_triplet', False),
+    ('7d7c8h', 'has_pair', True),
+    ('7d3cJd', 'has_pair', False),
+    ('7d3cJd', 'has_straightdraw', False),
+    ('7d4cJd', 'has_straightdraw', True),
+    ('7d3cJd', 'has_gutshot', True),
+    ('AdKc2h', 'has_gutshot', True),
+    ('Ad8c2h', 'has_gutshot', False),
+    ('7d3cJd', 'has_flushdraw', True),
+    ('7d3cJh', 'has_flushdraw', False),
+    ('Ad2c5h', 'is_straight_possible', True),
+    ('AdTcQh', 'is_straight_possible', True),
+    ('Ad2c6h', 'is_straight_possible', False),
+    ('AdAcKh', 'is_straight_possible', False),
+    ('7d3cJd', 'high_rank', Rank('J')),
+    ('7d3cJd', 'rank_span', 8),
+])
+def test_textures(board, attribute, expected_value):
+    assert getattr(Board(board), attribute) == expected_value
+
+
+def test_textures_are_for_the_flop():
+    board = Board('7d3cJd Qd 2c')
+    assert board.flop == (Card('7d'), Card('3c'), Card('Jd'))
+    assert board.turn == Card('Qd')
+    assert board.river == Card('2c')
+    assert board.is_monotone is False
+    assert board.flop_id == Board('7d3cJd').flop_id
+    assert board.texture == FLOP_TEXTURES[board.flop_id]
+
+
+def test_board_from_cards():
+    assert Board([Card('As'), 'Kd', '7h']) == Board('AsKd7h')
+    assert Board('AsKd7h') != Board('AsKd7h2c')
+    assert len(Board('AsKd7h2c')) == 4
+    assert Board('AsKd7h').turn is None
+    assert unicode(Board('AsKd7h')) == ''.join(unicode(Card(card)) for card in ('As', 'Kd', '7h'))
+
+
+@pytest.mark.parametrize('cards', ['AsKd', 'AsKd7h2c3c4c', 'AsKdAs'])
+def test_invalid_board_raises_ValueError(cards):
+    with pytest.raises(ValueError):
+        Board(cards)
+
+
+class _Street(hh._BaseStreet):
+    def _parse_cards(self, boardline):
+        self.cards = tuple(Card(card) for card in boardline.split())
+
+    def _parse_actions(self, actionlines):
+        self.actions = None
+
+
+def test_street_textures_can_be_read_in_any_order():
+    street = _Street(['7d 7c 3d'])
+    assert street.is_rainbow is False
+    assert street.has_pair is True
+    assert street.has_flushdraw is True
+    assert street.has_gutshot is True
+
+
+class TestCanonical:
+    def test_number_of_flop_classes(self):
+        assert len(get_canonical_boards()) == 1755
+        assert get_class_weights().sum() == 22100
+
+    def test_turn_classes(self):
+        # the turn is dealt after the flop, so it's not any of the 4 cards
+        assert len(get_class_weights(4)) == 63193
+        assert get_class_weights(4).sum() == 22100 * 49
+
+    def test_invalid_card_number_raises_ValueError(self):
+        with pytest.raises(ValueError):
+            get_class_weights(6)
+
+    def test_suit_isomorphic_boards_are_in_the_same_class(self):
+        first, second = Board('7h8h2d'), Board('7s8s2h')
+        assert first.class_id == second.class_id
+        assert first.canonical_board == second.canonical_board == Board('8c7c2d')
+        assert first.class_weight == 12
+
+    def test_canonical_board_is_in_the_canonical_boards(self):
+        board = Board('Ks9s4d2h')
+        assert get_canonical_boards(4)[board.class_id] == board.canonical_board
+
+    def test_order_of_the_flop_cards_does_not_matter(self):
+        assert Board('Ks9s4d2h').class_id == Board('4dKs9s2h').class_id
+
+    def test_turn_is_not_mixed_into_the_flop(self):
+        board = Board('2c3d4hAs')
+        assert Board('Ks9s4d2h').class_id != Board('2h4dKs9s').class_id
+        assert board.canonical_board == Board('4c3d2hAs')
+        assert board.canonical_board.turn == Card('As')
+        assert board.canonical_board.high_rank == board.high_rank == Rank('4')
+        assert board.canonical_board.texture == board.texture
+
+    def test_river_classes(self):
+        board = Board('AhKh7d7h2c')
+        assert board.canonical_board == Board('AcKc7d7c2h')
+        assert get_class_weights(5).sum() == 22100 * 49 * 48
+        assert board.class_weight == 24
+
+    def test_weights_of_the_monotone_and_rainbow_flops(self):
+        assert Board('AsKsQs').class_weight == 4
+        assert Board('AsKhQd').class_weight == 24
+
+    def test_to_canonical(self):
+        board = Board('7h8h2d')
+        assert board.to_canonical(board) == Board('7c8c2d')
+        assert board.to_canonical(Card('Ah')) == Card('Ac')
+        assert board.to_canonical('AhKh') == Combo('AcKc')
+        assert board.to_canonical(Range('AhKh QQ')) == Range('AcKc QQ')
+
+    def test_from_canonical_is_the_inverse(self):
+        board = Board('Td9s3c')
+        range = Range('AKs 72o QQ AsJh')
+        assert board.from_canonical(board.to_canonical(range)) == range
+        assert board.from_canonical(board.canonical_board).cards == \
+            tuple(sorted(board.cards, reverse=True))
+
+    def test_weighted_range(self):
+        board = Board('7h8h2d')
+        assert board.to_canonical(WeightedRange('AhKh:0.5')) == WeightedRange('AcKc:0.5')
+
+    def test_invalid_item_raises_TypeError(self):
+        with pytest.raises(TypeError):
+            Board('7h8h2d').to_canonical(1)
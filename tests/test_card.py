@@ -148,3 +148,36 @@ def test_putting_them_in_set_doesnt_raise_Exception():
 
 def test_pickable():
     assert pickle.loads(pickle.dumps(Card('2s'))) == Card('2s')
+
+
+def test_same_card_is_the_same_instance():
+    assert Card('As') is Card('As')
+    assert Card('as') is Card('A♠')
+    assert Card('Tc') is Card('tC')
+    assert Card.make_random() in set(Card)
+
+
+def test_index():
+    assert Card('2c').index == 0
+    assert Card('2s').index == 3
+    assert Card('3c').index == 4
+    assert Card('As').index == 51
+    assert [card.index for card in Card] == list(range(52))
+
+
+def test_from_int():
+    assert Card.from_int(0) is Card('2c')
+    assert Card.from_int(51) is Card('As')
+    assert all(Card.from_int(card.index) is card for card in Card)
+
+
+def test_from_int_invalid_index_raises_ValueError():
+    with pytest.raises(ValueError):
+        Card.from_int(52)
+    with pytest.raises(ValueError):
+        Card.from_int(-1)
+
+
+def test_unpickled_card_is_the_same_instance():
+    assert pickle.loads(pickle.dumps(Card('Kh'))) is Card('Kh')
+    assert pickle.loads(pickle.dumps(Card('Kh'), 2)) is Card('Kh')
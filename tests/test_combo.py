@@ -178,3 +178,51 @@ def test_pairs_are_not_offsuits():
 
 def test_pickable():
     assert pickle.loads(pickle.dumps(Combo('AsKc'))) == Combo('AsKc')
+
+
+def test_same_combo_is_the_same_instance():
+    assert Combo('AsKc') is Combo('KcAs')
+    assert Combo('AsKc') is Combo('a♠k♣')
+    assert Combo.from_cards('Kc', 'As') is Combo('AsKc')
+
+
+def test_same_cards_raises_ValueError():
+    with pytest.raises(ValueError):
+        Combo('AsAS')
+    with pytest.raises(ValueError):
+        Combo.from_cards(Card('As'), Card('As'))
+
+
+def test_index():
+    assert Combo('2d2c').index == 0
+    assert Combo('AsAh').index == 1325
+    first, second = Card('Kh'), Card('7d')
+    assert Combo('Kh7d').index == first.index * (first.index - 1) // 2 + second.index
+    assert [combo.index for combo in Combo] == list(range(1326))
+
+
+def test_from_index():
+    assert Combo.from_index(0) is Combo('2d2c')
+    assert all(Combo.from_index(combo.index) is combo for combo in Combo)
+    with pytest.raises(ValueError):
+        Combo.from_index(1326)
+    with pytest.raises(ValueError):
+        Combo.from_index(-1)
+
+
+def test_sorting_is_a_total_order():
+    combos = sorted(Combo)
+    assert all(first < second for first, second in zip(combos, combos[1:]))
+    assert combos[0] == Combo('3c2d')
+    assert combos[-1] == Combo('AsAh')
+
+
+def test_hand_combos_are_in_the_hand():
+    for hand in Hand:
+        assert all(combo.to_hand() == hand for combo in hand.to_combos())
+    assert sum(len(hand.to_combos()) for hand in Hand) == 1326
+
+
+def test_unpickled_combo_is_the_same_instance():
+    assert pickle.loads(pickle.dumps(Combo('AsKc'))) is Combo('AsKc')
+    assert pickle.loads(pickle.dumps(Combo('AsKc'), protocol=2)) is Combo('AsKc')
@@ -14,3 +14,16 @@ def test_first_values_are_represeantional():
 
     assert str(PokerRoom.PKR) == 'PKR'
     assert unicode(PokerRoom.PKR) == 'PKR'
+
+
+def test_positions_are_ordered_by_definition_order():
+    assert Position.UTG < Position.UTG1 < Position.CO < Position.BTN < Position.SB < Position.BB
+    assert Position.BB > Position.UTG
+    assert Position.BTN <= Position.BTN and Position.BTN >= Position.BTN
+    assert sorted(Position, reverse=True) == list(reversed(list(Position)))
+
+
+def test_different_enums_are_not_equal():
+    assert PokerRoom.STARS != Currency.USD
+    assert (Position.UTG == Action.BET) is False
+    assert len({Position.UTG, Action.BET, Position('under the gun')}) == 2
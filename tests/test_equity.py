@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, absolute_import, division, print_function
+
+import time
+import pytest
+import numpy as np
+from poker.hand import Combo, Range
+from poker.card import Card
+from poker.equity import (monte_carlo_equity, exact_equity, hero_equities, hero_equity_grid,
+                          _prepare, _get_combo_tuples, _get_symmetries, _get_matchup_classes)
+
+
+def test_equities_add_up_to_one():
+    results = monte_carlo_equity([Range('AA'), Range('KK'), Range('XX')],
+                                 iterations=5000, workers=1, seed=1)
+    assert len(results) == 3
+    assert sum(result.equity for result in results) == pytest.approx(1)
+    for result in results:
+        assert 0 <= result.win <= result.equity <= result.win + result.tie
+
+
+def test_aces_vs_kings_preflop():
+    aces, kings = monte_carlo_equity([Range('AA'), Range('KK')],
+                                     iterations=20000, workers=1, seed=1)
+    assert aces.equity == pytest.approx(0.82, abs=0.01)
+    assert kings.equity == pytest.approx(0.18, abs=0.01)
+
+
+def test_with_complete_board():
+    board = ['Qh', 'Jh', 'Th', '2c', '3d']
+    nuts, second = monte_carlo_equity([Range('AhKh'), Range('QQ')], board=board,
+                                      iterations=100, workers=1, seed=1)
+    assert (nuts.win, nuts.tie, nuts.equity) == (1, 0, 1)
+    assert (second.win, second.tie, second.equity) == (0, 0, 0)
+
+
+def test_card_removal():
+    # only AhAs is left for the first range, so the second range can only have KK
+    first, second = monte_carlo_equity([Range('AA'), Range('AA KK')], board=['Ac', 'Ad', '2c'],
+                                       iterations=1000, workers=1, seed=1)
+    assert first.equity == pytest.approx(1)
+
+
+def test_same_seed_gives_the_same_result_with_any_number_of_workers():
+    args = [Range('22+ AK'), Range('T9s')], ['2h', '7d', '8c']
+    single = monte_carlo_equity(*args, iterations=25000, workers=1, seed=42)
+    multiple = monte_carlo_equity(*args, iterations=25000, workers=2, seed=42)
+    assert single == multiple
+
+
+def test_needs_at_least_two_ranges():
+    with pytest.raises(ValueError):
+        monte_carlo_equity([Range('AA')], iterations=100, workers=1)
+
+
+def test_range_without_combos_raises_ValueError():
+    with pytest.raises(ValueError):
+        monte_carlo_equity([Range('AsKs'), Range('QQ')], dead=['As'], iterations=100, workers=1)
+
+
+def test_always_colliding_ranges_raises_ValueError():
+    with pytest.raises(ValueError):
+        monte_carlo_equity([Range('AsAh'), Range('AsAh')], iterations=100, workers=1)
+
+
+@pytest.mark.parametrize('iterations', [0, -1])
+def test_no_iterations_raises_ValueError(iterations):
+    with pytest.raises(ValueError):
+        monte_carlo_equity([Range('AA'), Range('KK')], iterations=iterations, workers=1)
+
+
+class TestExactEquity:
+    def test_on_the_river_only_the_combos_count(self):
+        aces, others = exact_equity([Range('AA'), Range('KK 72o')], ['2c', '7d', '9h', 'Js', 'Qd'],
+                                    dead=['Ks'])
+        # 6 AA combos beat 3 KK combos, but lose against 7 72o combos
+        assert aces.win == pytest.approx(3 / 10)
+        assert others.win == pytest.approx(7 / 10)
+        assert aces.tie == others.tie == 0
+
+    def test_one_card_to_come(self):
+        aces, kings = exact_equity([Range('AA'), Range('KK')], ['2c', '7d', '9h', 'Js'])
+        # only the 2 remaining kings out of 44 cards win for KK
+        assert kings.equity == pytest.approx(2 / 44)
+        assert aces.equity == pytest.approx(42 / 44)
+
+    def test_identical_ranges_have_equal_equity(self):
+        first, second = exact_equity([Range('XX'), Range('XX')], ['2c', '7c', '9c', 'Jc'])
+        assert first.equity == second.equity == pytest.approx(0.5)
+        assert first.win + first.tie + second.win == pytest.approx(1)
+
+    def test_close_to_monte_carlo(self):
+        args = [Range('AhKh'), Range('QQ'), Range('JJ+ AQs+')], ['Qh', '2h', '7c']
+        exact = exact_equity(*args)
+        simulated = monte_carlo_equity(*args, iterations=30000, workers=1, seed=1)
+        for exact_result, simulated_result in zip(exact, simulated):
+            assert exact_result.equity == pytest.approx(simulated_result.equity, abs=0.01)
+
+    def test_ranges_always_colliding_raises_ValueError(self):
+        with pytest.raises(ValueError):
+            exact_equity([Range('AsAh'), Range('AsAh')], ['2c', '7d', '9h'])
+
+    def test_heads_up_close_to_monte_carlo(self):
+        args = [Range('22+ A2s+ KTo+'), Range('XX')], ['As', 'Kd', '7h', '2c']
+        exact = exact_equity(*args)
+        simulated = monte_carlo_equity(*args, iterations=30000, workers=1, seed=1)
+        for exact_result, simulated_result in zip(exact, simulated):
+            assert exact_result.equity == pytest.approx(simulated_result.equity, abs=0.01)
+        assert exact[0].win + exact[0].tie + exact[1].win == pytest.approx(1)
+
+    def test_full_ranges_on_a_rainbow_turn_are_fast(self):
+        start = time.time()
+        first, second = exact_equity([Range('XX'), Range('XX')], ['2c', '7d', '9h', 'Js'])
+        assert first.equity == second.equity == pytest.approx(0.5)
+        # enumerating every combination of combos took seconds
+        assert time.time() - start < 2
+
+
+def test_matchup_classes_cover_every_matchup():
+    # on a two-tone flop, clubs and hearts can be swapped
+    combos, board_indexes, known_indexes = _prepare([Range('AKs'), Range('QQ'), Range('JJ')],
+                                                    ['As', 'Ks', '7d'], ())
+    combo_tuples, __ = _get_combo_tuples(combos)
+    symmetries = _get_symmetries(board_indexes, known_indexes[3:])
+    assert len(symmetries) == 2
+    representatives, weights = _get_matchup_classes(combos, combo_tuples, symmetries)
+    assert weights.sum() == len(combo_tuples) == 3 * 6 * 6
+    assert len(representatives) < len(combo_tuples)
+    assert set(weights) == {1, 2}
+
+
+def test_rainbow_board_has_no_suit_symmetry():
+    board_indexes = np.array([Card(card).index for card in ('2c', '7d', '9h')])
+    assert len(_get_symmetries(board_indexes, board_indexes[:0])) == 1
+
+
+class TestHeroEquities:
+    def test_same_as_exact_equity(self):
+        board = ['As', 'Kd', '7h']
+        equities = hero_equities('QQ+ AKs AJo', board)
+        for hero in ('AhAd', '7c7d', 'QsJs', 'AcKc'):
+            hero_equity = exact_equity([Range(hero), Range('QQ+ AKs AJo')], board)[0].equity
+            assert equities[Combo(hero).index] == pytest.approx(hero_equity)
+
+    def test_on_the_river(self):
+        equities = hero_equities('KK 72o', ['2c', '7d', '9h', 'Js', 'Qd'], dead=['Ks'])
+        # AA beats the 3 KK combos, loses against the 7 72o combos
+        assert equities[Combo('AhAd').index] == pytest.approx(3 / 10)
+        # every KK combo shares a card with KhKd, only the 72o combos are left
+        assert equities[Combo('KhKd').index] == 0
+
+    def test_impossible_combos_are_nan(self):
+        equities = hero_equities('AsAh', ['2c', '7d', '9h'])
+        assert equities.shape == (1326,)
+        assert np.isnan(equities[Combo('2c3c').index])
+        assert np.isnan(equities[Combo('AsKs').index])
+        assert not np.isnan(equities[Combo('KsKh').index])
+        # 150 combos with a board card, 101 with As or Ah, 6 with both
+        assert np.isnan(equities).sum() == 150 + 101 - 6
+
+    def test_grid(self):
+        board = ['2c', '7d', '9h', 'Js']
+        grid = hero_equity_grid('AA', board)
+        assert grid.shape == (13, 13)
+        kings_equity = exact_equity([Range('KK'), Range('AA')], board)[0].equity
+        assert grid[1, 1] == pytest.approx(kings_equity)
+        assert grid[0, 0] == pytest.approx(0.5)
+
+    def test_needs_a_flop(self):
+        with pytest.raises(ValueError):
+            hero_equities('AA', ['2c', '7d'])
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, absolute_import, division, print_function
+
+import random
+import itertools
+import pytest
+import numpy as np
+from poker.card import Card, Rank
+from poker.combination import CombinationGroup, Combination
+from poker.evaluator import (evaluate, evaluate_many, to_combination,
+                             WORST_STRENGTH, BEST_STRENGTH)
+
+
+def _evaluate(cards):
+    return evaluate([Card(card) for card in cards.split()])
+
+
+def test_hands_from_worst_to_best():
+    hands = (
+        '7c 5d 4h 3s 2c',
+        'Ac Kd Qh Js 9c',
+        '2c 2d 7h 4s 3c',
+        'Ac Ad Kh Qs Jc',
+        '3c 3d 2h 2s Ac',
+        'Ac Ad Kh Ks Qc',
+        '2c 2d 2h 4s 3c',
+        'Ac 2d 3h 4s 5c',
+        'Tc Jd Qh Ks Ac',
+        '2h 3h 4h 5h 7h',
+        'Ah Kh Qh Jh 9h',
+        '2c 2d 2h 3s 3c',
+        '2c 2d 2h 2s 3c',
+        'Ah 2h 3h 4h 5h',
+        'Ah Kh Qh Jh Th',
+    )
+    strengths = [_evaluate(hand) for hand in hands]
+    assert strengths == sorted(strengths)
+    assert len(set(strengths)) == len(strengths)
+    assert strengths[0] == WORST_STRENGTH
+    assert strengths[-1] == BEST_STRENGTH == 7461
+
+
+def test_suits_dont_matter_without_flush():
+    assert _evaluate('Ac Kd Qh Js 9c') == _evaluate('As Kh Qd Jc 9s')
+    assert _evaluate('Ac Ad 5h 5s 9c 2d 3c') == _evaluate('Ah As 5c 5d 9h 2h 3s')
+
+
+def test_best_five_cards_are_used():
+    assert _evaluate('Ac Ad Kh Ks Qc 2d 3h') == _evaluate('Ac Ad Kh Ks Qc')
+    assert _evaluate('Ac Ad Kh Ks Qc Qd 3h') == _evaluate('Ac Ad Kh Ks Qc')
+    assert _evaluate('2h 3h 4h 5h 7h Ah 6h') == _evaluate('3h 4h 5h 6h 7h')
+    assert _evaluate('2c 2d 2h 3s 3c 4d 4h') == _evaluate('2c 2d 2h 4s 4c')
+
+
+def test_six_and_seven_cards_are_the_best_five_card_subset():
+    random.seed(42)
+    deck = list(Card)
+    for __ in range(500):
+        cards = random.sample(deck, random.choice((6, 7)))
+        best = max(evaluate(five) for five in itertools.combinations(cards, 5))
+        assert evaluate(cards) == best
+
+
+def test_to_combination():
+    assert to_combination(_evaluate('Ah Kh Qh Jh Th')) == Combination(
+        CombinationGroup.STRAIGHT_FLUSH, Rank('A'), None)
+    assert to_combination(_evaluate('Ac 2d 3h 4s 5c 5d 8h')) == Combination(
+        CombinationGroup.STRAIGHT, Rank('5'), None)
+    assert to_combination(_evaluate('3c 3d 2h 2s Ac')) == Combination(
+        CombinationGroup.TWO_PAIR, Rank('3'), Rank('2'))
+    assert to_combination(_evaluate('2c 2d 2h Ks Kc Kd 7h')) == Combination(
+        CombinationGroup.FULL_HOUSE, Rank('K'), Rank('2'))
+    assert to_combination(_evaluate('7c 5d 4h 3s 2c')).to_string() == 'high card Seven'
+
+
+def test_invalid_number_of_cards_raises_ValueError():
+    with pytest.raises(ValueError):
+        _evaluate('Ac Kd Qh Js')
+    with pytest.raises(ValueError):
+        _evaluate('Ac Kd Qh Js Tc 9c 8c 7c')
+
+
+def test_duplicate_cards_raises_ValueError():
+    with pytest.raises(ValueError):
+        _evaluate('Ac Ac Qh Js Tc')
+
+
+def test_evaluate_many_gives_the_same_strengths_as_evaluate():
+    random.seed(7)
+    deck = list(Card)
+    hands = [random.sample(deck, 7) for __ in range(2000)]
+    indexes = [[card.index for card in hand] for hand in hands]
+
+    strengths, groups = evaluate_many(indexes)
+
+    assert strengths.shape == groups.shape == (2000,)
+    assert strengths.tolist() == [evaluate(hand) for hand in hands]
+    assert ([list(CombinationGroup)[group] for group in groups] ==
+            [to_combination(evaluate(hand)).group for hand in hands])
+
+
+def test_evaluate_many_flushes_and_five_cards():
+    hands = [[Card(card).index for card in cards.split()] for cards in (
+        'Ah Kh Qh Jh Th', '2h 3h 4h 5h 7h', '7c 5d 4h 3s 2c', '2c 2d 2h 2s 3c')]
+    strengths, groups = evaluate_many(hands)
+    assert strengths.tolist() == [BEST_STRENGTH, _evaluate('2h 3h 4h 5h 7h'), WORST_STRENGTH,
+                                  _evaluate('2c 2d 2h 2s 3c')]
+    assert [list(CombinationGroup)[group] for group in groups] == [
+        CombinationGroup.STRAIGHT_FLUSH, CombinationGroup.FLUSH,
+        CombinationGroup.HIGH_CARD, CombinationGroup.FOUR_OF_A_KIND]
+
+
+def test_evaluate_many_invalid_shape_or_index_raises_ValueError():
+    with pytest.raises(ValueError):
+        evaluate_many(np.zeros((3, 4), dtype=int))
+    with pytest.raises(ValueError):
+        evaluate_many([[0, 1, 2, 3, 52]])
@@ -193,3 +193,36 @@ def test_suited_hand_to_combos():
 
 def test_pickable():
     assert pickle.loads(pickle.dumps(Hand('Ako'))) == Hand('AKo')
+
+
+def test_same_hand_is_the_same_instance():
+    assert Hand('AKs') is Hand('KAs')
+    assert Hand('AKs') is Hand('aks')
+    assert Hand('22') is Hand('22')
+
+
+def test_index():
+    assert Hand('32o').index == 0
+    assert Hand('32s').index == 1
+    assert Hand('AA').index == 168
+    assert [hand.index for hand in Hand] == list(range(169))
+
+
+def test_from_index():
+    assert Hand.from_index(168) is Hand('AA')
+    assert all(Hand.from_index(hand.index) is hand for hand in Hand)
+    with pytest.raises(ValueError):
+        Hand.from_index(169)
+
+
+def test_hashes_are_unique():
+    assert len({hash(hand) for hand in Hand}) == 169
+
+
+def test_to_combos_returns_the_same_tuple():
+    assert Hand('AKo').to_combos() is Hand('AKo').to_combos()
+
+
+def test_unpickled_hand_is_the_same_instance():
+    assert pickle.loads(pickle.dumps(Hand('AKo'))) is Hand('AKo')
+    assert pickle.loads(pickle.dumps(Hand('22'), protocol=2)) is Hand('22')
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, absolute_import, division, print_function
+
+import pytest
+from poker.card import Card
+from poker.hand import Range
+from poker.board import Board
+from poker.combination import CombinationGroup
+from poker.evaluator import evaluate, to_combination
+from poker.hits import Draw, hit_distribution
+
+
+def test_made_hands_are_the_evaluated_groups():
+    board = [Card('As'), Card('Kd'), Card('7h'), Card('7c')]
+    range = Range('22+ A2s+ KTo+ 65s')
+    hits = hit_distribution(range, board)
+    expected = {}
+    for combo in range.without_cards(board).combos:
+        group = to_combination(evaluate(board + [combo.first, combo.second])).group
+        expected[group] = expected.get(group, 0) + 1
+    assert {group: count for group, count in hits.made_hands.items() if count} == expected
+    assert hits.combo_count == len(range.without_cards(board))
+
+
+def test_board_cards_are_removed():
+    hits = hit_distribution('AA', 'AsKd7h')
+    assert hits.combo_count == 3
+    assert hits[CombinationGroup.THREE_OF_A_KIND] == 3
+
+
+def test_whole_range_on_a_rainbow_flop():
+    hits = hit_distribution('XX', 'AsKd7h')
+    assert hits.combo_count == 1176
+    assert hits[CombinationGroup.HIGH_CARD] == 720
+    assert hits[CombinationGroup.PAIR] == 420
+    assert hits[CombinationGroup.TWO_PAIR] == 27
+    assert hits[CombinationGroup.THREE_OF_A_KIND] == 9
+    # QJ, QT and JT
+    assert hits[Draw.GUTSHOT] == 48
+    assert hits[Draw.OESD] == hits[Draw.FLUSH_DRAW] == hits[Draw.OVERCARDS] == 0
+    assert hits.percent(CombinationGroup.PAIR) == 35.71
+
+
+@pytest.mark.parametrize('range, board, draw, expected', [
+    ('KQo', 'JhTd2c', Draw.OESD, 12),
+    ('KQo', 'JhTd2c', Draw.OVERCARDS, 12),
+    ('J2o', 'AhKdQc', Draw.GUTSHOT, 12),
+    ('AhKh', 'QhTh2c', Draw.FLUSH_DRAW, 1),
+    ('AhKh', 'QhTh2c', Draw.GUTSHOT, 1),
+    ('AhKh', 'QhTh2c', Draw.OVERCARDS, 1),
+    # the board has 4 hearts, but the hole cards don't
+    ('AsKs', 'QhTh2h3h', Draw.FLUSH_DRAW, 0),
+    # the straight can be made from the board alone
+    ('2s2c', '9h8d7c6s', Draw.OESD, 0),
+    # double gutshot
+    ('9s7c', 'Jh5d8s', Draw.OESD, 1),
+    ('AhKh', 'QhTh2c5s9d', Draw.FLUSH_DRAW, 0),
+])
+def test_draws(range, board, draw, expected):
+    assert hit_distribution(range, board)[draw] == expected
+
+
+def test_made_flush_is_not_a_flush_draw():
+    assert hit_distribution('AhKh', 'QhTh2h')[Draw.FLUSH_DRAW] == 0
+
+
+def test_suit_isomorphic_spots_share_the_result():
+    first = hit_distribution('AhKh QQ', 'Qh8h2d')
+    assert hit_distribution('AsKs QQ', Board('Qs8s2c')) is first
+    assert hit_distribution('AhKh QQ', 'Qh8h2d') is first
+
+
+def test_empty_range():
+    hits = hit_distribution('', 'AsKd7h')
+    assert hits.combo_count == 0
+    assert hits.percent(Draw.GUTSHOT) == 0
+
+
+def test_invalid_category_raises_TypeError():
+    with pytest.raises(TypeError):
+        hit_distribution('AA', 'AsKd7h')['pair']
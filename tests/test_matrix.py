@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, absolute_import, division, print_function
+
+import pytest
+import numpy as np
+from poker.hand import Combo, Range
+from poker.matrix import RangeMatrix
+
+
+@pytest.fixture
+def matrix():
+    return RangeMatrix([Range('22+'), 'AKs 33', None])
+
+
+def test_array_rows_are_ranges(matrix):
+    assert matrix.array.shape == (3, 1326)
+    assert matrix.array[1, Combo('AsKs').index]
+    assert not matrix.array[2].any()
+    with pytest.raises(ValueError):
+        matrix.array[0, 0] = False
+
+
+def test_conversion_to_ranges(matrix):
+    assert matrix.to_ranges() == [Range('22+'), Range('AKs 33'), Range()]
+    assert list(matrix) == matrix.to_ranges()
+    assert matrix[1] == Range('AKs 33')
+    assert matrix[1:] == RangeMatrix(['AKs 33', ''])
+    assert len(matrix) == 3
+
+
+def test_from_array(matrix):
+    assert RangeMatrix.from_array(matrix.array) == matrix
+    with pytest.raises(ValueError):
+        RangeMatrix.from_array(np.zeros((2, 100)))
+
+
+def test_empty():
+    matrix = RangeMatrix()
+    assert matrix.array.shape == (0, 1326)
+    assert matrix.union() == Range()
+    assert matrix.intersection() == Range()
+
+
+def test_union_and_intersection(matrix):
+    assert matrix.union() == Range('22+ AKs')
+    assert matrix[:2].intersection() == Range('33')
+    assert matrix.intersection() == Range()
+
+
+def test_row_by_row_operators(matrix):
+    assert (matrix | Range('AKo')).to_ranges() == [Range('22+ AKo'), Range('AK 33'), Range('AKo')]
+    assert (matrix & Range('33-44')).to_ranges() == [Range('33-44'), Range('33'), Range()]
+    assert (matrix - matrix).to_ranges() == [Range()] * 3
+    assert (matrix ^ RangeMatrix(['22', '22', '22']))[1] == Range('22 33 AKs')
+
+    with pytest.raises(ValueError):
+        matrix | RangeMatrix(['22'])
+    with pytest.raises(TypeError):
+        matrix | 'AKs'
+
+
+def test_counts_and_percents(matrix):
+    assert matrix.combo_counts().tolist() == [78, 10, 0]
+    assert matrix.percents().tolist() == [range.percent for range in matrix]
+
+
+def test_without_cards(matrix):
+    assert matrix.without_cards(['As', 'Kd']).to_ranges() == \
+        [range.without_cards(['As', 'Kd']) for range in matrix]
+
+
+def test_overlap(matrix):
+    assert matrix.overlap().tolist() == [[78, 6, 0], [6, 10, 0], [0, 0, 0]]
+    assert matrix.overlap(RangeMatrix(['XX'])).tolist() == [[78], [10], [0]]
+
+
+def test_jaccard(matrix):
+    similarity = matrix.jaccard()
+    assert similarity.shape == (3, 3)
+    assert similarity[0, 1] == pytest.approx(6 / 82)
+    assert similarity[0, 0] == similarity[2, 2] == 1
+    assert similarity[0, 2] == 0
+
+
+def test_rendering_is_the_same_as_for_ranges(matrix):
+    assert matrix.to_html() == [range.to_html() for range in matrix]
+    assert matrix.to_ascii(border=True) == [range.to_ascii(border=True) for range in matrix]
+    assert np.array_equal(matrix.to_grids(), [range.to_grid() for range in matrix])
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, absolute_import, division, print_function
+
+import pytest
+from poker.card import Card
+from poker.hand import Combo, Range
+from poker.combination import CombinationGroup
+from poker.evaluator import evaluate, to_combination
+from poker.outs import get_outs, get_range_outs
+
+
+def test_straight_flush_draw():
+    outs = get_outs('Jh9h', ['Th', '8h', '2c'])
+    assert outs[CombinationGroup.FLUSH] == tuple(Card(card) for card in
+                                                 ('2h', '3h', '4h', '5h', '6h', 'Kh', 'Ah'))
+    assert set(outs[CombinationGroup.STRAIGHT]) == {Card(card) for card in
+                                                    ('7s', '7d', '7c', 'Qs', 'Qd', 'Qc')}
+    assert set(outs[CombinationGroup.STRAIGHT_FLUSH]) == {Card('7h'), Card('Qh')}
+    # the other J and 9 cards
+    assert len(outs[CombinationGroup.PAIR]) == 6
+    assert len(outs) == 21
+    assert outs.percent() == pytest.approx(21 / 47 * 100, abs=0.01)
+
+
+def test_cards_pairing_the_board_are_not_outs():
+    outs = get_outs('AhKd', ['7s', '5c', '2d', '9h'])
+    assert len(outs) == 6
+    assert set(outs.groups) == {CombinationGroup.PAIR}
+    assert outs[CombinationGroup.TWO_PAIR] == ()
+
+
+def test_cards_pairing_the_board_are_not_outs_with_a_made_pair():
+    outs = get_outs('AsKd', ['Kc', '7h', '2d', '5s'])
+    assert set(outs[CombinationGroup.TWO_PAIR]) == {Card('Ac'), Card('Ah'), Card('Ad')}
+    assert set(outs[CombinationGroup.THREE_OF_A_KIND]) == {Card('Kh'), Card('Ks')}
+    assert len(outs) == 5
+
+    flop_outs = get_outs('AsKd', ['Kc', '7h', '2d'])
+    assert flop_outs.groups == outs.groups
+    assert not {card.rank for card in flop_outs.cards} & {Card('2c').rank, Card('7c').rank}
+
+
+def test_cards_pairing_the_board_are_outs_of_a_set():
+    outs = get_outs('7s7h', ['Kc', '7d', '2h'])
+    assert outs[CombinationGroup.FOUR_OF_A_KIND] == (Card('7c'),)
+    assert set(outs[CombinationGroup.FULL_HOUSE]) == {Card(card) for card in
+                                                      ('Kh', 'Kd', 'Ks', '2c', '2d', '2s')}
+    assert len(outs) == 7
+
+
+def test_two_pair_to_full_house_on_a_paired_board():
+    outs = get_outs('7s7h', ['Kc', 'Kd', '2h'])
+    assert set(outs[CombinationGroup.FULL_HOUSE]) == {Card(card) for card in
+                                                      ('7c', '7d', 'Kh', 'Ks')}
+    assert len(outs) == 4
+
+
+def test_outs_improve_the_evaluated_group():
+    board = [Card('Js'), Card('Ts'), Card('4d'), Card('4c')]
+    combo = Combo('QsQd')
+    group = to_combination(evaluate(board + [combo.first, combo.second])).group
+    outs = get_outs(combo, board)
+    for card in outs.cards:
+        assert to_combination(evaluate(board + [combo.first, combo.second, card])).group > group
+
+
+def test_opponent_ranges_remove_the_beaten_outs():
+    board = ['Th', '8h', '2c']
+    outs = get_outs('Jh9h', board, 'TT')
+    # a pair doesn't beat a set, the board pairing gives a full house to TT
+    assert outs[CombinationGroup.PAIR] == ()
+    assert Card('2h') not in outs.cards
+    assert Card('8s') not in get_outs('Jh9h', board).cards
+    assert len(outs) == 21 - 6 - 1
+    assert get_outs('Jh9h', board, ['TT', Range()]).groups == outs.groups
+
+
+def test_range_outs_are_the_same_as_combo_outs():
+    board = ['As', 'Kd', '7h', '7c']
+    range_outs = get_range_outs('22+ A2s+ KTo+', board, ['QQ+', 'AKs'])
+    assert len(range_outs) == len(Range('22+ A2s+ KTo+').without_cards(board))
+    for combo, outs in list(range_outs.items())[::10]:
+        assert outs.groups == get_outs(combo, board, ['QQ+', 'AKs']).groups
+
+
+def test_no_outs_on_the_river():
+    with pytest.raises(ValueError):
+        get_outs('AhKd', ['7s', '5c', '2d', '9h', 'Tc'])
+
+
+def test_combo_on_the_board():
+    with pytest.raises(ValueError):
+        get_outs('AhKd', ['Ah', '5c', '2d'])
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, absolute_import, division, print_function
+
+import pytest
+from poker.card import Card
+from poker.hand import Combo, Range
+from poker.predicates import (Predicate, pair, suited, offsuit, connector, one_gapper, two_gapper,
+                              suited_connector, broadway, rank_difference, has_rank, has_card)
+
+
+@pytest.mark.parametrize('predicate, attribute', [
+    (pair, 'is_pair'),
+    (suited, 'is_suited'),
+    (offsuit, 'is_offsuit'),
+    (connector, 'is_connector'),
+    (one_gapper, 'is_one_gapper'),
+    (two_gapper, 'is_two_gapper'),
+    (suited_connector, 'is_suited_connector'),
+    (broadway, 'is_broadway'),
+])
+def test_predicates_match_the_combo_properties(predicate, attribute):
+    assert all(predicate(combo) == getattr(combo, attribute) for combo in Combo)
+
+
+def test_filter():
+    assert Range('XX').filter(suited & connector & ~broadway) == \
+        Range('T9s 98s 87s 76s 65s 54s 43s 32s')
+    assert Range('22+ A2s+ KTo+').filter(has_rank('A') - pair) == Range('A2s+')
+    assert Range('AKo 22').filter(offsuit | pair) == Range('AKo 22')
+    assert Range('AKs').filter(pair) == Range()
+
+
+def test_combined_predicates():
+    assert suited_connector == suited & connector
+    assert (suited ^ offsuit) == ~pair
+    assert ~~broadway == broadway
+    assert (pair | suited | offsuit) == ~Predicate('nothing', lambda combo: False)
+
+
+def test_rank_difference():
+    assert rank_difference(0) == pair
+    assert rank_difference(1) == connector
+    assert rank_difference(12)('Ac2d')
+    with pytest.raises(ValueError):
+        rank_difference(13)
+
+
+def test_has_card():
+    assert Range('XX').filter(has_card('As')) == Range.from_objects(
+        combo for combo in Combo if Card('As') in (combo.first, combo.second))
+    assert len(Range('XX').filter(has_card('As'))) == 51
+
+
+def test_call_with_str():
+    assert suited('AsKs')
+    assert not suited('AsKh')
+
+
+def test_repr():
+    assert repr(suited & connector & ~broadway) == \
+        '<Predicate: ((suited & connector) & ~broadway)>'
+    assert repr(has_rank('a')) == "<Predicate: has_rank('A')>"
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, absolute_import, division, print_function
+
+import pytest
+import numpy as np
+from poker.hand import Hand, Combo
+from pathlib import Path
+import poker
+from poker.preflop import PreflopEquity, generate_table, DEFAULT_TABLE
+
+
+@pytest.fixture(scope='module')
+def table(tmpdir_factory):
+    filename = unicode(tmpdir_factory.mktemp('preflop').join('preflop.bin'))
+    # few samples to be fast, only the structure is tested, not the precision
+    generate_table(filename, samples=20, workers=1)
+    return PreflopEquity(filename)
+
+
+def test_combo_equities_add_up_to_one(table):
+    assert table.combo_equity('AsKs', 'QdJc') + table.combo_equity('QdJc', 'AsKs') == 1
+
+
+def test_suit_isomorphic_combos_have_the_same_equity(table):
+    assert table.combo_equity('AsKs', 'QdJc') == table.combo_equity('AhKh', 'QcJd')
+    assert table.combo_equity('7c2d', '8h8s') == table.combo_equity('7s2h', '8c8d')
+
+
+def test_colliding_combos_raises_ValueError(table):
+    with pytest.raises(ValueError):
+        table.combo_equity('AsKs', 'AsQd')
+
+
+def test_hand_equity_is_average_of_combos(table):
+    equities = [table.combo_equity(aces, kings) for aces in Hand('AA').to_combos()
+                for kings in Hand('KK').to_combos()]
+    assert table.hand_equity('AA', 'KK') == pytest.approx(sum(equities) / len(equities))
+    assert table.hand_equity('AA', 'KK') == pytest.approx(0.82, abs=0.1)
+
+
+def test_hand_table(table):
+    hands = list(Hand)
+    hand_table = table.hand_table()
+    assert hand_table.shape == (169, 169)
+    assert (hand_table[hands.index(Hand('AKs')), hands.index(Hand('QQ'))] ==
+            pytest.approx(table.hand_equity('AKs', 'QQ')))
+    assert np.allclose(hand_table + hand_table.T, 1)
+
+
+def test_range_equity(table):
+    assert table.range_equity('XX', 'XX') == pytest.approx(0.5)
+    assert table.range_equity('AsAh', 'KK') == pytest.approx(
+        sum(table.combo_equity(Combo('AsAh'), kings) for kings in Hand('KK').to_combos()) / 6)
+
+
+def test_missing_table_raises_IOError(tmpdir):
+    with pytest.raises(IOError):
+        PreflopEquity(unicode(tmpdir.join('missing.bin')))
+
+
+def test_invalid_table_raises_ValueError(tmpdir):
+    filename = tmpdir.join('invalid.bin')
+    filename.write(b'INVALID FILE')
+    with pytest.raises(ValueError):
+        PreflopEquity(unicode(filename))
+
+
+def test_default_table_is_not_in_the_package():
+    assert Path(poker.__file__).parent not in DEFAULT_TABLE.parents
+
+
+def test_generate_table_makes_missing_directories(tmpdir):
+    filename = tmpdir.join('cache', 'poker', 'preflop.bin')
+    generate_table(unicode(filename), samples=1, workers=1)
+    assert PreflopEquity(unicode(filename)).range_equity('XX', 'XX') == pytest.approx(0.5)
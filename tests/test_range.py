@@ -279,6 +279,11 @@ class TestValueChecks:
         with pytest.raises(ValueError):
             Range('AsKq')
 
+    @pytest.mark.parametrize('range', ['K6-KK', 'Q7o-QQo', 'J9s-JJs'])
+    def test_dash_ending_with_a_pair(self, range):
+        with pytest.raises(ValueError):
+            Range(range)
+
 class TestComparisons:
     def test_ranges_with_lesser_hands_are_smaller(self):
         assert Range('33+') < Range('22+')
@@ -368,6 +373,14 @@ class TestNormalization:
     def test_rep_pieces(self):
         assert Range('KX').rep_pieces == ['K2s+', 'K2o+']
 
+    def test_rep_pieces_can_be_changed_without_changing_the_range(self):
+        range = Range('KX')
+        range.rep_pieces.append('AA')
+        assert range.rep_pieces == ['K2s+', 'K2o+']
+
+    def test_missing_hands_break_runs(self):
+        assert unicode(Range('A2s+ 22+') - Range('ATs 88')) == '99+, 77-, AJs+, A9s-'
+
     def test_both_suits_with_plus_or_minus(self):
         assert unicode(Range('A5-')) == 'A5s-, A5o-'
         assert unicode(Range('A5+')) == 'A5s+, A5o+'
@@ -450,6 +463,194 @@ class TestContains:
         with pytest.raises(ValueError):
             assert 'AKl' in Range('AQo+')
 
+    def test_partial_hand_in_range(self):
+        assert Hand('AKs') in Range('AsKs')
+        assert Hand('AKo') not in Range('AsKs')
+        assert 'AcKc' not in Range('AsKs')
+
+
+class TestSetOperations:
+    def test_union(self):
+        assert Range('22 AKs') | Range('33 AKo') == Range('22-33 AK')
+        assert Range('22') | Range() == Range('22')
+
+    def test_intersection(self):
+        assert Range('22-55 AK') & Range('44+ AKo') == Range('44-55 AKo')
+        assert Range('22') & Range('AKs') == Range()
+
+    def test_difference(self):
+        assert Range('22+') - Range('33+') == Range('22')
+        assert Range('AK') - Range('AhKc') == Range.from_objects(
+            combo for combo in Hand('AKo').to_combos() if combo != Combo('AhKc')) | Range('AKs')
+
+    def test_symmetric_difference(self):
+        assert Range('22-44') ^ Range('33-55') == Range('22 55')
+
+    def test_result_is_a_new_range(self):
+        first, second = Range('22'), Range('33')
+        assert (first | second) is not first
+        assert first == Range('22')
+
+    def test_other_types_raise_TypeError(self):
+        with pytest.raises(TypeError):
+            Range('22') | 'AKs'
+
+    def test_counts_and_strings_of_results(self):
+        range = Range('XX') - Range('22+')
+        assert len(range) == 1326 - 78
+        assert unicode(range) == 'A2s+, K2s+, Q2s+, J2s+, T2s+, 92s+, 82s+, 72s+, 62s+, 52s+, ' \
+                                 '42s+, 32s, A2o+, K2o+, Q2o+, J2o+, T2o+, 92o+, 82o+, 72o+, ' \
+                                 '62o+, 52o+, 42o+, 32o'
+
+
+class TestCache:
+    def setup_method(self, method):
+        Range.cache_clear()
+
+    def test_same_instance_is_returned(self):
+        assert Range.from_cache('22+ AKs') is Range.from_cache('22+ AKs')
+        assert Range.from_cache('22+ AKs') == Range('22+ AKs')
+
+    def test_normalized_text_is_the_key(self):
+        assert Range.from_cache('22+ AKs') is Range.from_cache('22+,  aks')
+
+    def test_hits_and_misses_are_counted(self):
+        Range.from_cache('22+')
+        Range.from_cache('22+')
+        Range.from_cache('AKo')
+        info = Range.cache_info()
+        assert (info.hits, info.misses, info.currsize) == (1, 2, 2)
+
+    def test_least_recently_used_is_dropped(self, monkeypatch):
+        monkeypatch.setattr(Range._cache, 'maxsize', 2)
+        first = Range.from_cache('22')
+        Range.from_cache('33')
+        Range.from_cache('22')
+        Range.from_cache('44')
+        assert Range.cache_info().currsize == 2
+        assert Range.from_cache('22') is first
+        assert Range.cache_info().misses == 3
+
+    def test_invalid_range_is_not_cached(self):
+        with pytest.raises(ValueError):
+            Range.from_cache('HH')
+        assert Range.cache_info().currsize == 0
+
+    def test_changing_a_cached_range_does_not_change_the_cache(self):
+        range = Range.from_cache('22+ AKs')
+        with pytest.raises(AttributeError):
+            range._mask = 0
+        with pytest.raises(AttributeError):
+            range.__setstate__(Range('AA').to_bytes())
+        with pytest.raises(AttributeError):
+            range.combos = ()
+        with pytest.raises(AttributeError):
+            del range._mask
+        range |= Range('KQo')
+        assert Range.from_cache('22+ AKs') == Range('22+ AKs')
+        assert len(Range.from_cache('22+ AKs').combos) == 78 + 4
+
+
+def test_equal_ranges_have_the_same_hash():
+    assert hash(Range('AKo 22+')) == hash(Range('22+ AkO'))
+    assert (Range('AKo 22+') != Range('22+ AKo')) is False
+
 
 def test_pickable():
     assert pickle.loads(pickle.dumps(Range('Ako 22+'))) == Range('AKo 22+')
+
+
+def test_pickle_uses_the_binary_format():
+    range = Range('XX')
+    assert range.to_bytes() in pickle.dumps(range, protocol=2)
+    assert pickle.loads(pickle.dumps(range, protocol=2)) == range
+
+
+@pytest.mark.parametrize('protocol', [0, 2])
+def test_unpickle_version_0_22(testdir, protocol):
+    # pickled with version 0.22.3: [Card('As'), Hand('AKs'), Combo('AsKd'), Range('AKs 2d2c')]
+    with (testdir / 'objects-0.22.3-protocol{}.pickle'.format(protocol)).open('rb') as file:
+        card, hand, combo, range = pickle.load(file)
+    assert card == Card('As') and card.index == Card('As').index
+    assert hand == Hand('AKs') and hand.is_suited
+    assert combo == Combo('AsKd') and combo.to_hand() == Hand('AKo')
+    assert range == Range('AKs 2d2c')
+
+
+class TestBytes:
+    @pytest.mark.parametrize('range', ['', 'XX', '22+ AKs KQo', 'AsKs 2d2c'])
+    def test_round_trip(self, range):
+        assert Range.from_bytes(Range(range).to_bytes()) == Range(range)
+
+    def test_size(self):
+        assert len(Range().to_bytes()) == 168
+        assert len(Range('XX').to_bytes()) == 168
+
+    def test_lowest_combo_is_the_first_bit(self):
+        assert Range('2d2c').to_bytes()[2:] == b'\x01' + b'\x00' * 165
+
+    @pytest.mark.parametrize('data', [
+        b'', b'R', b'R\x02' + b'\x00' * 166, b'X\x01' + b'\x00' * 166,
+        b'R\x01' + b'\x00' * 167, b'R\x01' + b'\xff' * 166,
+    ])
+    def test_invalid_data_raises_ValueError(self, data):
+        with pytest.raises(ValueError):
+            Range.from_bytes(data)
+
+
+class TestRendering:
+    def test_ascii(self):
+        table = Range('AA AKs KQo').to_ascii().split('\n')
+        assert len(table) == 13
+        assert table[0] == 'AA  AKs ' + ' ' * 44
+        assert table[1] == ' ' * 52
+        assert table[2] == '    KQo ' + ' ' * 44
+
+    def test_ascii_with_border(self):
+        table = Range('AA').to_ascii(border=True).split('\n')
+        assert len(table) == 27
+        assert table[0] == '┌' + '─────┬' * 12 + '─────┐'
+        assert table[1] == '│ AA  ' + '│     ' * 12 + '│ '
+        assert table[-1] == '└' + '─────┴' * 12 + '─────┘'
+
+    def test_html(self):
+        html = Range('AA AKs KQo').to_html()
+        assert html.startswith('<table class="range"><tr><td class="pair">AA</td>'
+                               '<td class="suited">AKs</td><td class="suited"></td>')
+        assert '<tr><td class="offsuit"></td><td class="pair"></td><td class="suited"></td>' \
+            in html
+        assert '<td class="offsuit">KQo</td>' in html
+        assert html.count('<td') == 169
+        assert html.endswith('<td class="pair"></td></tr></table>')
+
+    def test_grid_counts_combos(self):
+        grid = Range('AA AsKs KQo 22').to_grid()
+        assert grid.shape == (13, 13)
+        assert grid[0, 0] == 6
+        assert grid[0, 1] == 1
+        assert grid[2, 1] == 12
+        assert grid[12, 12] == 6
+        assert grid.sum() == 25
+
+
+class TestCardRemoval:
+    def test_without_cards(self):
+        range = Range('AA KK AKs').without_cards([Card('As'), 'Kh'])
+        assert len(range) == 3 + 3 + 2
+        assert Combo('AsAh') not in range
+        assert Combo('AdKd') in range
+        assert Combo('AsKs') not in range
+
+    def test_original_range_does_not_change(self):
+        range = Range('AA')
+        range.without_cards(['As'])
+        assert len(range) == 6
+
+    def test_count_combos(self):
+        assert Range('AA KK AKs').count_combos(['As', 'Kh']) == 8
+        assert Range('AA KK AKs').count_combos() == 16
+        assert Range('XX').count_combos(['2c', '3c', '4c']) == 1176
+
+    def test_invalid_card_raises_ValueError(self):
+        with pytest.raises(ValueError):
+            Range('AA').without_cards(['Ax'])
@@ -43,3 +43,21 @@ def test_both_suited_and_offsuit():
 def test_both_suited_and_offsuit_plus():
     lexer = _RegexRangeLexer('KJ+')
     assert list(lexer) == [('BOTH_PLUS', ('J', 'K'))]
+
+
+@pytest.mark.parametrize('token, expected', [
+    ('XXyz', ('ALL', 'XXyz')),
+    ('Aa', ('PAIR', 'A')),
+    ('xas+', ('X_SUITED_PLUS', 'a')),
+    ('A5-A6', ('BOTH_DASH', ('A', '5', '6'))),
+    ('K2o-K5o', ('OFFSUIT_DASH', ('K', '2', '5'))),
+    ('5s5s', ('COMBO', '5s5s')),
+])
+def test_tokens_match_the_first_matching_rule(token, expected):
+    assert list(_RegexRangeLexer(token)) == [expected]
+
+
+@pytest.mark.parametrize('token', ['A5-A5', 'AKs-AQo', 'AKx', 'A', '22+-'])
+def test_invalid_tokens_raise_ValueError(token):
+    with pytest.raises(ValueError):
+        list(_RegexRangeLexer(token))
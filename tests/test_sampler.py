@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, absolute_import, division, print_function
+
+import pytest
+import numpy as np
+from poker.card import Card
+from poker.hand import Combo, Range, WeightedRange
+from poker.sampler import ComboSampler
+
+
+def test_probabilities_follow_the_weights():
+    sampler = ComboSampler(WeightedRange('AKs:0.5, QQ'))
+    assert sampler.probabilities[Combo('AsKs').index] == pytest.approx(0.5 / 8)
+    assert sampler.probabilities[Combo('QsQh').index] == pytest.approx(1 / 8)
+    assert sampler.probabilities.sum() == pytest.approx(1)
+    with pytest.raises(ValueError):
+        sampler.probabilities[0] = 1
+
+
+def test_draws_follow_the_probabilities():
+    sampler = ComboSampler(WeightedRange('AKs:0.5, QQ, 72o:0.1'), seed=0)
+    frequencies = np.bincount(sampler.sample(200000), minlength=1326) / 200000
+    assert np.abs(frequencies - sampler.probabilities).max() < 0.005
+
+
+def test_range_and_string_have_the_same_probabilities():
+    assert np.array_equal(ComboSampler(Range('22+ AKo')).probabilities,
+                          ComboSampler('22+ AKo').probabilities)
+
+
+def test_dead_cards_are_removed_and_renormalized():
+    sampler = ComboSampler('AA KK', dead_cards=['As', Card('Kh')])
+    assert np.count_nonzero(sampler.probabilities) == 6
+    assert set(sampler.sample_combos(1000)) == {Combo(combo) for combo in
+                                                ('AhAd', 'AhAc', 'AdAc', 'KsKd', 'KsKc', 'KdKc')}
+
+
+def test_without_cards():
+    sampler = ComboSampler(WeightedRange('AA, KK:0.5'))
+    smaller = sampler.without_cards(['As', 'Ah', 'Ad'])
+    assert smaller.probabilities[Combo('KsKh').index] == pytest.approx(1 / 6)
+    assert sampler.probabilities[Combo('KsKh').index] == pytest.approx(0.5 / 9)
+
+
+def test_no_combos_left_raises_ValueError():
+    with pytest.raises(ValueError):
+        ComboSampler('')
+    with pytest.raises(ValueError):
+        ComboSampler('AA', dead_cards=['As', 'Ah', 'Ad'])
+
+
+def test_same_seed_gives_the_same_draws():
+    first, second = ComboSampler('22+ AJs+', seed=1), ComboSampler('22+ AJs+', seed=1)
+    assert np.array_equal(first.sample(1000), second.sample(1000))
+
+
+def test_single_draw():
+    sampler = ComboSampler('AsKs')
+    assert sampler.sample() == Combo('AsKs').index
+    assert sampler.sample_cards().tolist() == [Card('As').index, Card('Ks').index]
+
+
+def test_colliding_combos_are_redrawn_per_row():
+    sampler = ComboSampler('AA', seed=0)
+    dead = np.array([[Card('As').index, Card('Ah').index],
+                     [Card('Ad').index, Card('Ac').index]] * 500)
+    cards = sampler.sample_cards(1000, dead)
+    assert cards.shape == (1000, 2)
+    assert not (cards[:, :, np.newaxis] == dead[:, np.newaxis]).any()
+
+
+def test_always_colliding_raises_ValueError():
+    sampler = ComboSampler('AsKs')
+    with pytest.raises(ValueError):
+        sampler.sample(10, [[Card('As').index]] * 10)
+
+
+def test_wrong_number_of_dead_rows_raises_ValueError():
+    with pytest.raises(ValueError):
+        ComboSampler('AA').sample(10, [[0, 1]] * 5)
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, absolute_import, division, print_function
+
+import pickle
+import pytest
+import numpy as np
+from poker.hand import Hand, Combo, Range, WeightedRange
+
+
+def test_tokens_without_weight_are_full_weight():
+    range = WeightedRange('22+ AKs')
+    assert range.to_range() == Range('22+ AKs')
+    assert set(range.weights[range.weights > 0]) == {1}
+
+
+def test_pio_syntax():
+    range = WeightedRange('AKs:0.5,QQ:0.25,AsKh:1')
+    assert range['AKs'] == 0.5
+    assert range['QQ'] == 0.25
+    assert range['AsKh'] == 1
+    assert range['AKo'] == pytest.approx(1 / 12)
+    assert range['JJ'] == 0
+
+
+def test_bracket_syntax():
+    range = WeightedRange('[50]AKs, QQ[/50] JJ [12.5]AA[/12.5]')
+    assert range['AKs'] == range['QQ'] == 0.5
+    assert range['JJ'] == 1
+    assert range['AA'] == 0.125
+
+
+def test_later_tokens_override_weights():
+    assert WeightedRange('22+:0.5 AA:0.25')['AA'] == 0.25
+    assert WeightedRange('AA:0.25 22+:0.5')['AA'] == 0.5
+
+
+@pytest.mark.parametrize('range', ['AKs:1.5', '[150]AKs[/150]', 'AKs:', 'AKs:abc', '[50]AKs'])
+def test_invalid_weights_raise_ValueError(range):
+    with pytest.raises(ValueError):
+        WeightedRange(range)
+
+
+def test_weighted_counts():
+    range = WeightedRange('AKs:0.5 QQ:0.25 AKo')
+    assert len(range) == 4 + 6 + 12
+    assert range.combo_count == 2 + 1.5 + 12
+    assert range.percent == round(15.5 / 1326 * 100, 2)
+
+
+def test_weights_are_in_combo_index_order_and_read_only():
+    range = WeightedRange('AsKs:0.5')
+    assert range.weights.shape == (1326,)
+    assert range.weights[Combo('AsKs').index] == 0.5
+    with pytest.raises(ValueError):
+        range.weights[0] = 1
+
+
+def test_hand_weights():
+    range = WeightedRange('AsKs:0.5 AhKh')
+    assert range.hand_weights[Hand('AKs').index] == 0.375
+    assert range.hands == (Hand('AKs'),)
+    assert range.combos == (Combo('AhKh'), Combo('AsKs'))
+
+
+def test_from_weights():
+    weights = np.zeros(1326)
+    weights[Combo('AsKs').index] = 0.5
+    assert WeightedRange.from_weights(weights) == WeightedRange('AsKs:0.5')
+
+    with pytest.raises(ValueError):
+        WeightedRange.from_weights(np.zeros(10))
+    with pytest.raises(ValueError):
+        WeightedRange.from_weights(weights * 3)
+
+
+def test_representation_can_be_parsed_back():
+    range = WeightedRange('AKs:0.5, QQ+:0.25, 76s, 22:0.1')
+    assert unicode(range) == '76s, AKs:0.5, QQ+:0.25, 22:0.1'
+    assert WeightedRange(unicode(range)) == range
+    assert unicode(WeightedRange('XX:0.5')) == 'XX:0.5'
+
+
+def test_ascii_shows_frequencies():
+    table = WeightedRange('AKs:0.5 AA').to_ascii().split('\n')
+    assert table[0].startswith('AA       AKs:0.50')
+
+
+def test_html_shows_frequencies():
+    html = WeightedRange('AKs:0.5 AA').to_html()
+    assert html.startswith('<table class="range"><tr><td class="pair">AA</td>'
+                           '<td class="suited">AKs:0.50</td><td class="suited"></td>')
+
+
+def test_grid_has_hand_weights():
+    grid = WeightedRange('AKs:0.5 AA, AsKs:1').to_grid()
+    assert grid[0, 0] == 1
+    assert grid[0, 1] == 0.625
+    assert grid.sum() == 1.625
+
+
+def test_equality_and_hash():
+    assert WeightedRange('AKs:0.5') == WeightedRange('[50]AKs[/50]')
+    assert hash(WeightedRange('AKs:0.5')) == hash(WeightedRange('[50]AKs[/50]'))
+    assert WeightedRange('AKs:0.5') != WeightedRange('AKs')
+
+
+def test_pickable():
+    range = WeightedRange('AKs:0.5 22+')
+    unpickled = pickle.loads(pickle.dumps(range))
+    assert unpickled == range
+    assert unpickled.weights.flags.writeable is False
+
+
+def test_bytes_round_trip():
+    range = WeightedRange('AKs:0.123456789, 22+, QJo:0.25')
+    assert WeightedRange.from_bytes(range.to_bytes()) == range
+    assert WeightedRange.from_bytes(WeightedRange().to_bytes()) == WeightedRange()
+
+
+def test_bytes_have_weights_only_for_weighted_combos():
+    assert len(WeightedRange('AKs:0.5').to_bytes()) == 168 + 4 * 8
+
+
+def test_range_bytes_are_not_weighted_range_bytes():
+    with pytest.raises(ValueError):
+        WeightedRange.from_bytes(Range('AKs').to_bytes())
+    with pytest.raises(ValueError):
+        WeightedRange.from_bytes(WeightedRange('AKs').to_bytes()[:-1])